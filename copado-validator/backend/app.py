@@ -7,27 +7,21 @@ Endpoints:
 """
 from config_loader import ConfigLoader
 from datetime import datetime
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
 import tempfile
-from csv_parser import CopadoCSVParser
 from conflict_detector import ConflictDetector
 from models import ConflictSeverity
-from pdf_generator import generate_pdf_report
 from flask import send_file
-from production_analyzer import parse_production_state, check_regression
 from git_client import BitBucketClient 
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import get_config
 from typing import Optional, Tuple,Dict,List
-import copy
 from sf_adapter import sf_records_to_rows
 import csv
 from tempfile import NamedTemporaryFile
 from salesforce_client import (
-    sf_login_from_config,
     fetch_user_story_metadata_by_release,
     fetch_user_story_metadata_by_story_names,
     fetch_story_commits,fetch_deployment_tasks
@@ -39,11 +33,9 @@ import requests
 logging.basicConfig(level=logging.DEBUG)  # put once (e.g., in app.py main)
 logger = logging.getLogger(__name__)
 import json
-import re
 import logging
 import os
 from io import BytesIO, StringIO
-import pandas as pd
 from flask import send_file, Response
 
 ###########
@@ -85,6 +77,32 @@ app = Flask(__name__)
 CORS(app)  # Allow frontend to call this API
 
 
+# ============================================================================
+# STARTUP TIMING
+# ============================================================================
+# Each init stage records how long it took; see GET /api/startup-report.
+# Salesforce login is no longer a stage: it happens on first use (sf_session.py).
+import time
+from contextlib import contextmanager
+
+_STARTUP_BEGAN = time.time()
+STARTUP_STAGES: List[Dict] = []
+
+@contextmanager
+def startup_stage(name: str):
+    began = time.time()
+    status = 'ok'
+    try:
+        yield
+    except Exception:
+        status = 'failed'
+        raise
+    finally:
+        elapsed_ms = int((time.time() - began) * 1000)
+        STARTUP_STAGES.append({'stage': name, 'ms': elapsed_ms, 'status': status})
+        logging.getLogger(__name__).info(f"[STARTUP] {name}: {elapsed_ms}ms ({status})")
+
+
 
 
 
@@ -102,18 +120,14 @@ CORS(app)  # Allow frontend to call this API
 # 4. Routes to external script OR YAML config
 # 5. Returns results
 from smart_validator_auto_detect import register_smart_auto_validator
-from salesforce_client import sf_login_from_config
+from sf_session import get_salesforce
 
-try:
-    logger.info("Connecting to Salesforce...")
-    sf_client = sf_login_from_config()
-    logger.info("✓ Salesforce connected")
-except Exception as e:
-    logger.error(f"✗ Salesforce connection failed: {e}")
-    sf_client = None
+# Shared, lazily logged-in Salesforce client (logs in on first query)
+sf_client = get_salesforce()
 
 try:
-    register_smart_auto_validator(app, sf_client)
+    with startup_stage("register smart validator"):
+        register_smart_auto_validator(app, sf_client)
     logger.info("[STARTUP] ✓ Smart validator registered at /api/validate-product")
 except Exception as e:
     logger.error(f"[STARTUP] ✗ Failed to register smart validator: {e}")
@@ -136,14 +150,8 @@ import os
 import json
 import logging
 import yaml
-import pandas as pd
 
 from flask import Flask, request, jsonify
-from salesforce_client import sf_login_from_config
-from validate_product_api import (
-    validate_product_by_name,
-    sf_fetch_product_by_name
-)
 
 # =========================
 # Configuration
@@ -168,6 +176,8 @@ def convert_yaml_to_dataframe(yaml_data):
     if not yaml_data:
         return None
     
+    import pandas as pd  # heavy; only the device validator needs it
+    
     rows = []
     products = yaml_data.get("products", {})
     
@@ -195,25 +205,28 @@ def convert_yaml_to_dataframe(yaml_data):
     return df
 
 
-matrix_yaml = None
+import queue
+import threading
+
+_matrix_yaml = None
 _matrix_df = None
-_sf_client = None
+_matrix_lock = threading.Lock()
+# Same shared session as sf_client; the login happens on first query
+_sf_client = sf_client
 
 def init_globals():
-    """Initialize Salesforce client and matrix data at startup"""
-    global _sf_client, _matrix_yaml, _matrix_df
+    """Load matrix data (once). The Salesforce session is shared and lazy."""
+    with _matrix_lock:
+        if _matrix_yaml is not None:
+            return
+        with startup_stage("load matrix yaml"):
+            _load_matrix()
+
+def _load_matrix():
+    global _matrix_yaml, _matrix_df
     
     logger.info("[INIT] Loading configuration...")
     
-    # Initialize Salesforce
-    try:
-        logger.info("[INIT] Connecting to Salesforce...")
-        _sf_client = sf_login_from_config()
-        logger.info("[INIT] ✅ Salesforce connected")
-    except Exception as e:
-        logger.error(f"[INIT] ✗ Salesforce connection failed: {e}")
-        raise
-    
     # Load matrix YAML and convert to DataFrame
     try:
         if not os.path.exists(MATRIX_YAML_PATH):
@@ -244,16 +257,12 @@ def init_globals():
 
 # Make globals available to other modules
 def get_matrix_df():
+    init_globals()
     return _matrix_df
 
 def get_sf_client():
     return _sf_client
 
-# =========================
-# Initialize globals at module load time
-# =========================
-init_globals()
-
 # =========================
 # API Endpoints
 # =========================
@@ -276,6 +285,9 @@ def validate_device_product_endpoint():
       }
     """
     try:
+        # Matrix is loaded on the first request that needs it
+        init_globals()
+        
         # Debug request
         logger.info("[API] ========== Request Received ==========")
         logger.info(f"[API] SF Client initialized: {_sf_client is not None}")
@@ -294,14 +306,6 @@ def validate_device_product_endpoint():
             logger.error("[API] ❌ Missing product_name field")
             return jsonify({"status": "FAILED", "error": "Missing required field: product_name"}), 400
         
-        # Check SF client
-        if _sf_client is None:
-            logger.error("[API] ❌ CRITICAL: SF Client is None!")
-            return jsonify({
-                "status": "FAILED",
-                "error": "Salesforce client not initialized"
-            }), 500
-        
         # Convert YAML to DataFrame for validation
         logger.info("[API] Converting YAML matrix to DataFrame...")
         matrix_df = convert_yaml_to_dataframe(_matrix_yaml)
@@ -316,6 +320,7 @@ def validate_device_product_endpoint():
         logger.info(f"[API] Matrix DataFrame shape: {matrix_df.shape}")
         
         # Validate
+        from validate_product_api import validate_product_by_name  # pulls in pandas
         logger.info("[API] Calling validate_product_by_name()...")
         result = validate_product_by_name(
             sf=_sf_client,
@@ -339,6 +344,7 @@ def validate_device_product_endpoint():
 def list_catalogs():
     """List available catalogs"""
     catalogs_info = {}
+    init_globals()
     if _matrix_yaml:
         for cat, products in _matrix_yaml.get("catalogs", {}).items():
             catalogs_info[cat] = len(products)
@@ -353,6 +359,7 @@ def list_catalogs():
 # =========================
 
 def get_matrix_yaml():
+    init_globals()
     return _matrix_yaml
 
 def get_sf_client():
@@ -495,7 +502,6 @@ def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-from pdf_generator import generate_pdf_report
 from flask import send_file
 
 
@@ -507,570 +513,7 @@ from flask import send_file
 logger = logging.getLogger(__name__)
 
 
-class StoryAnalyzerTransformer:
-    """
-    Transform raw SF Copado records into structured response with:
-    - Blocked stories (old commits + conflicts)
-    - Conflicting stories (same component, current commits)
-    - Safe stories (no conflicts, all current)
-    """
-    
-    def __init__(self):
-        self.stories = {}  # story_id -> story data
-        self.components = {}  # component_id -> component data
-        self.component_to_stories = {}  # api_name -> [story_ids]
-        self.conflicts_map = {}  # api_name -> list of story_ids
-        
-        logger.info("[INIT] StoryAnalyzerTransformer initialized")
-    
-    def parse_commit_url_from_json(self, json_blob: str) -> Optional[str]:
-        """Extract commit URL from copado__JsonInformation__c"""
-        try:
-            if not json_blob:
-                return None
-            
-            data = json.loads(json_blob) if isinstance(json_blob, str) else json_blob
-            
-            # Look for common patterns
-            if isinstance(data, dict):
-                # Direct URL field
-                for key in ["commit_url", "commitUrl", "url", "link", "href"]:
-                    if key in data and data[key]:
-                        return data[key]
-                
-                # Look in nested structures (commits, changes)
-                for key in ["commits", "changes", "commit", "change"]:
-                    if key in data:
-                        item = data[key]
-                        if isinstance(item, dict):
-                            for url_key in ["url", "link", "href"]:
-                                if url_key in item and item[url_key]:
-                                    return item[url_key]
-                        elif isinstance(item, list) and len(item) > 0:
-                            first = item[0]
-                            if isinstance(first, dict):
-                                for url_key in ["url", "link", "href"]:
-                                    if url_key in first and first[url_key]:
-                                        return first[url_key]
-            
-            # If JSON has HTML anchors, parse them
-            if isinstance(data, str):
-                match = re.search(r'href=["\']([^"\']+)["\']', data)
-                if match:
-                    return match.group(1)
-            
-            return None
-        except Exception as e:
-            logger.debug(f"[PARSE_URL] Error parsing JSON blob: {e}")
-            return None
-    
-    def parse_commit_hash_from_json(self, json_blob: str) -> Optional[str]:
-        """Extract commit hash/SHA from copado__JsonInformation__c"""
-        try:
-            if not json_blob:
-                return None
-            
-            data = json.loads(json_blob) if isinstance(json_blob, str) else json_blob
-            
-            # Look for common SHA patterns in dict
-            if isinstance(data, dict):
-                # Direct hash fields
-                for key in ["commit_hash", "commitHash", "hash", "sha", "commit_sha", "commitSha"]:
-                    if key in data and data[key]:
-                        val = str(data[key]).strip()
-                        if val and len(val) >= 7:  # Valid SHA should be at least 7 chars
-                            return val
-                
-                # Look in nested structures
-                for key in ["commits", "changes", "commit", "change"]:
-                    if key in data:
-                        item = data[key]
-                        if isinstance(item, dict):
-                            for hash_key in ["hash", "sha", "id", "commit_hash"]:
-                                if hash_key in item and item[hash_key]:
-                                    val = str(item[hash_key]).strip()
-                                    if val and len(val) >= 7:
-                                        return val
-                        elif isinstance(item, list) and len(item) > 0:
-                            first = item[0]
-                            if isinstance(first, dict):
-                                for hash_key in ["hash", "sha", "id", "commit_hash"]:
-                                    if hash_key in first and first[hash_key]:
-                                        val = str(first[hash_key]).strip()
-                                        if val and len(val) >= 7:
-                                            return val
-            
-            # If JSON is string with HTML, extract SHA from URL
-            if isinstance(data, str):
-                # Look for SHA patterns in URLs: /commits/abc123def456
-                match = re.search(r'/commits/([a-f0-9]{7,40})', data)
-                if match:
-                    return match.group(1)
-                
-                # Look for standalone SHA patterns
-                match = re.search(r'\b([a-f0-9]{7,40})\b', data)
-                if match:
-                    return match.group(1)
-            
-            return None
-        except Exception as e:
-            logger.debug(f"[PARSE_HASH] Error parsing JSON blob: {e}")
-            return None
-    
-    def transform(self, sf_records: List[Dict]) -> Dict:
-        """
-        Main transformation pipeline with detailed logging
-        
-        Args:
-            sf_records: Raw records from SF (from sf_records_to_rows or similar)
-        
-        Returns:
-            Structured response with blocked/conflicts/safe stories
-        """
-        
-        logger.info(f"[TRANSFORM] Starting with {len(sf_records)} SF records")
-        
-        # Step 1: Group records by story
-        stories_data = self._group_by_story(sf_records)
-        logger.info(f"[TRANSFORM] Step 1 complete: {len(stories_data)} unique stories")
-        
-        # Step 2: Extract and normalize component data
-        self._extract_components(stories_data, sf_records)
-        logger.info(f"[TRANSFORM] Step 2 complete: {len(self.components)} unique components extracted")
-        
-        # Step 3: Detect conflicts (same component in multiple stories)
-        self._detect_conflicts()
-        logger.info(f"[TRANSFORM] Step 3 complete: {len(self.conflicts_map)} components with conflicts")
-        
-        # Step 4: Classify stories
-        blocked, conflicts, safe = self._classify_stories()
-        logger.info(f"[TRANSFORM] Step 4 complete: blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
-        
-        # Step 5: Enrich with conflicting story details
-        blocked = self._enrich_with_conflicts(blocked, sf_records)
-        conflicts = self._enrich_with_conflicts(conflicts, sf_records)
-        safe = self._enrich_with_conflicts(safe, sf_records)
-        logger.info(f"[TRANSFORM] Step 5 complete: enriched all story groups")
-        
-        # Step 6: Calculate summary and validate counts
-        summary = self._build_summary(blocked, conflicts, safe)
-        logger.info(f"[TRANSFORM] Step 6 complete: summary={summary}")
-        
-        # Step 7: Validate counts match
-        self._validate_counts(summary, blocked, conflicts, safe)
-        
-        return {
-            "success": True,
-            "summary": summary,
-            "blocked": blocked,
-            "conflicts": conflicts,
-            "safe": safe
-        }
-    
-    def _group_by_story(self, sf_records: List[Dict]) -> Dict:
-        """Step 1: Group records by story ID"""
-        logger.info("[STEP1] Grouping records by story...")
-        
-        stories_data = {}
-        for i, record in enumerate(sf_records):
-            story_id = record.get("copado__User_Story__r.Name")
-            
-            if not story_id:
-                logger.warning(f"[STEP1] Record {i} has no story ID, skipping")
-                continue
-            
-            if story_id not in stories_data:
-                stories_data[story_id] = {
-                    "story_id": story_id,
-                    "title": record.get("copado__User_Story__r.copado__User_Story_Title__c"),
-                    "jira_key": record.get("jira_key"),
-                    "developer": record.get("developer"),
-                    "records": []
-                }
-            
-            stories_data[story_id]["records"].append(record)
-            logger.debug(f"[STEP1] Added record to story {story_id}, total records: {len(stories_data[story_id]['records'])}")
-        
-        logger.info(f"[STEP1] Complete: {len(stories_data)} unique stories found")
-        for sid, sdata in stories_data.items():
-            logger.debug(f"  {sid}: {len(sdata['records'])} records, dev={sdata['developer']}, jira={sdata['jira_key']}")
-        
-        return stories_data
-    
-    def _extract_components(self, stories_data: Dict, sf_records: List[Dict]):
-        """Step 2: Extract and normalize component data"""
-        logger.info("[STEP2] Extracting components...")
-        
-        comp_id = 0
-        for story_id, sdata in stories_data.items():
-            logger.debug(f"[STEP2] Processing story {story_id}...")
-            
-            for record in sdata["records"]:
-                api_name = record.get("copado__Metadata_API_Name__c")
-                comp_type = record.get("copado__Type__c")
-                
-                if not api_name or not comp_type:
-                    logger.warning(f"[STEP2] Skipping record - missing api_name or type")
-                    continue
-                
-                # Create unique component ID
-                comp_id += 1
-                cid = f"comp-{comp_id}"
-                
-                # Extract commit hash (may be null)
-                commit_hash = record.get("commit_hash")
-                if not commit_hash and record.get("copado__JsonInformation__c"):
-                    # Try to extract from JSON
-                    commit_hash = self.parse_commit_hash_from_json(record.get("copado__JsonInformation__c"))
-                    logger.debug(f"[STEP2] Extracted commit_hash from JSON for {api_name}: {commit_hash}")
-                
-                # Extract commit URL
-                commit_url = self.parse_commit_url_from_json(record.get("copado__JsonInformation__c"))
-                if commit_url:
-                    logger.debug(f"[STEP2] Extracted commit_url from JSON for {api_name}: {commit_url}")
-                
-                story_commit_date_str = record.get("copado__Last_Commit_Date__c")
-                prod_commit_date_str = record.get("production_commit_date")  # If available
-
-                
-                story_commit_date = self._parse_date(story_commit_date_str)
-                prod_commit_date = self._parse_date(prod_commit_date_str) if prod_commit_date_str else story_commit_date
-                
-                # Determine if component is old (story commit < production commit)
-                has_old_commit = False
-                if story_commit_date and prod_commit_date:
-                    has_old_commit = story_commit_date < prod_commit_date
-                    logger.debug(f"[STEP2] {api_name}: story_date={story_commit_date}, prod_date={prod_commit_date}, old={has_old_commit}")
-                
-                component = {
-                    "id": cid,
-                    "api_name": api_name,
-                    "type": comp_type,
-                    "status": record.get("copado__Status__c"),
-                    "action": record.get("copado__Action__c"),
-                    "story_id": story_id,
-                    "commit_hash": commit_hash,
-                    "commit_url": commit_url,
-                    "story_commit_date": story_commit_date_str,
-                    "production_commit_date": prod_commit_date_str,
-                    "production_story_id": record.get("production_story_id"),
-                    "production_story_title": record.get("production_story_title"),
-                    "has_old_commit": has_old_commit
-                }
-                
-                self.components[cid] = component
-                
-                # Track api_name -> stories mapping for conflict detection
-                if api_name not in self.component_to_stories:
-                    self.component_to_stories[api_name] = []
-                if story_id not in self.component_to_stories[api_name]:
-                    self.component_to_stories[api_name].append(story_id)
-                
-                logger.debug(f"[STEP2] Added component {cid}: {api_name} to story {story_id}")
-        
-        logger.info(f"[STEP2] Complete: {len(self.components)} components extracted")
-        logger.info(f"[STEP2] Unique api_names: {len(self.component_to_stories)}")
-    
-    def _classify_stories(self) -> Tuple[List[str], List[str], List[str]]:
-        """Step 4: Classify stories into blocked/conflicts/safe with tags"""
-        logger.info("[STEP4] Classifying stories...")
-        
-        blocked = []
-        conflicts = []
-        safe = []
-        
-        for story_id in self.stories.keys():
-            logger.debug(f"[STEP4] Classifying story {story_id}...")
-            
-            # Get all components for this story
-            story_components = [c for c in self.components.values() if c["story_id"] == story_id]
-            
-            # Check if any component has old commit (story < production)
-            has_old_component = any(c["has_old_commit"] for c in story_components)
-            
-            # Check if any component is in conflict (same api_name in multiple stories)
-            has_conflict_component = any(
-                c["api_name"] in self.conflicts_map 
-                for c in story_components
-            )
-            
-            logger.debug(f"[STEP4] {story_id}: has_old={has_old_component}, has_conflict={has_conflict_component}")
-            
-            # Classification logic with tags
-            if has_old_component and has_conflict_component:
-                blocked.append(story_id)
-                self.stories[story_id]["classification_tag"] = "Blocked"  # 🆕 ADD TAG
-                logger.info(f"[STEP4] {story_id} → BLOCKED (old components + conflicts)")
-            
-            # CONFLICTING: has conflicts but components are all current/ahead
-            elif has_conflict_component and not has_old_component:
-                conflicts.append(story_id)
-                self.stories[story_id]["classification_tag"] = "Conflict"  # 🆕 ADD TAG
-                logger.info(f"[STEP4] {story_id} → CONFLICTS (conflicts but all components current)")
-            
-            # BLOCKED (no conflicts but has old components): Story behind production
-            elif has_old_component and not has_conflict_component:
-                blocked.append(story_id)
-                self.stories[story_id]["classification_tag"] = "Blocked"  # 🆕 ADD TAG
-                logger.info(f"[STEP4] {story_id} → BLOCKED (components behind production)")
-            
-            # SAFE: No conflicts AND all components are current or ahead
-            else:
-                safe.append(story_id)
-                # 🆕 ADD TAG - differentiate between safe with commits vs deployment tasks
-                if story_components:  # Has components (commits)
-                    self.stories[story_id]["classification_tag"] = "Safe with commit"
-                else:
-                    self.stories[story_id]["classification_tag"] = "Safe"  # Deployment tasks
-                logger.info(f"[STEP4] {story_id} → SAFE (no conflicts, all components current/ahead)")
-        
-        logger.info(f"[STEP4] Complete: blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
-        
-        return blocked, conflicts, safe
-    
-    def _detect_conflicts(self):
-        """Step 3: Detect conflicts (same api_name in multiple stories)"""
-        logger.info("[STEP3] Detecting conflicts...")
-        
-        for api_name, story_ids in self.component_to_stories.items():
-            if len(story_ids) > 1:
-                self.conflicts_map[api_name] = story_ids
-                logger.info(f"[STEP3] CONFLICT: {api_name} found in stories: {story_ids}")
-            else:
-                logger.debug(f"[STEP3] {api_name} unique to story {story_ids[0]}")
-        
-        logger.info(f"[STEP3] Complete: {len(self.conflicts_map)} components have conflicts")
-    
-    def _enrich_with_conflicts(self, story_ids: List[str], sf_records: List[Dict]) -> List[Dict]:
-        """Step 5: Build full story objects with component and conflict details"""
-        logger.info(f"[STEP5] Enriching {len(story_ids)} stories with conflict details...")
-        
-        enriched_stories = []
-        
-        for story_id in story_ids:
-            logger.debug(f"[STEP5] Building story object for {story_id}...")
-            
-            # Get story data
-            story_info = self.stories[story_id]
-            
-            # Get components for this story
-            story_components_data = [c for c in self.components.values() if c["story_id"] == story_id]
-            
-            # Build component list with conflicts
-            components_list = []
-            for comp in story_components_data:
-                comp_copy = copy.deepcopy(comp)
-                
-                # Find conflicting stories for this component
-                if comp["api_name"] in self.conflicts_map:
-                    conflicting_story_ids = [
-                        sid for sid in self.conflicts_map[comp["api_name"]] 
-                        if sid != story_id
-                    ]
-                    
-                    # Get details of conflicting stories
-                    conflicting_details = []
-                    for conf_story_id in conflicting_story_ids:
-                        if conf_story_id in self.stories:
-                            conf_story = self.stories[conf_story_id]
-                            conflicting_details.append({
-                                "story_id": conf_story_id,
-                                "jira_key": conf_story.get("jira_key"),
-                                "developer": conf_story.get("developer"),
-                                "commit_date": conf_story.get("story_commit_date")
-                            })
-                            logger.debug(f"[STEP5] {story_id} component {comp['api_name']} conflicts with {conf_story_id}")
-                    
-                    comp_copy["conflicting_stories"] = conflicting_details
-                else:
-                    comp_copy["conflicting_stories"] = []
-                
-                components_list.append(comp_copy)
-            
-            story_obj = {
-                "story_id": story_id,
-                "jira_key": story_info.get("jira_key"),
-                "title": story_info.get("title"),
-                "developer": story_info.get("developer"),
-                "component_count": len(components_list),
-                "components": components_list,
-                "classification_tag": story_info.get("classification_tag", "Safe")  # 🆕 INCLUDE TAG IN RESPONSE
-            }
-            
-            enriched_stories.append(story_obj)
-            logger.debug(f"[STEP5] Completed story {story_id} with {len(components_list)} components")
-        
-        logger.info(f"[STEP5] Complete: {len(enriched_stories)} stories enriched")
-        
-        return enriched_stories
-    
-    def _classify_storiesbackup(self) -> Tuple[List[str], List[str], List[str]]:
-        """Step 4: Classify stories into blocked/conflicts/safe"""
-        logger.info("[STEP4] Classifying stories...")
-        
-        blocked = []
-        conflicts = []
-        safe = []
-        
-        for story_id in self.stories.keys():
-            logger.debug(f"[STEP4] Classifying story {story_id}...")
-            
-            # Get all components for this story
-            story_components = [c for c in self.components.values() if c["story_id"] == story_id]
-            
-            # Check if any component has old commit (story < production)
-            has_old_component = any(c["has_old_commit"] for c in story_components)
-            
-            # Check if any component is in conflict (same api_name in multiple stories)
-            has_conflict_component = any(
-                c["api_name"] in self.conflicts_map 
-                for c in story_components
-            )
-            
-            logger.debug(f"[STEP4] {story_id}: has_old={has_old_component}, has_conflict={has_conflict_component}")
-            
-            # Classification logic
-            # BLOCKED: has old components AND has conflicts (worst case)
-            if has_old_component and has_conflict_component:
-                blocked.append(story_id)
-                logger.info(f"[STEP4] {story_id} → BLOCKED (old components + conflicts)")
-            
-            # CONFLICTING: has conflicts but components are all current/ahead
-            elif has_conflict_component and not has_old_component:
-                conflicts.append(story_id)
-                logger.info(f"[STEP4] {story_id} → CONFLICTS (conflicts but all components current)")
-            
-            # BLOCKED (no conflicts but has old components): Story behind production
-            elif has_old_component and not has_conflict_component:
-                blocked.append(story_id)
-                logger.info(f"[STEP4] {story_id} → BLOCKED (components behind production)")
-            
-            # SAFE: No conflicts AND all components are current or ahead
-            else:
-                safe.append(story_id)
-                logger.info(f"[STEP4] {story_id} → SAFE (no conflicts, all components current/ahead)")
-        
-        logger.info(f"[STEP4] Complete: blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
-        
-        return blocked, conflicts, safe
-    
-    def _enrich_with_conflictsbackup(self, story_ids: List[str], sf_records: List[Dict]) -> List[Dict]:
-        """Step 5: Build full story objects with component and conflict details"""
-        logger.info(f"[STEP5] Enriching {len(story_ids)} stories with conflict details...")
-        
-        enriched_stories = []
-        
-        for story_id in story_ids:
-            logger.debug(f"[STEP5] Building story object for {story_id}...")
-            
-            # Get story data
-            story_info = self.stories[story_id]
-            
-            # Get components for this story
-            story_components_data = [c for c in self.components.values() if c["story_id"] == story_id]
-            
-            # Build component list with conflicts
-            components_list = []
-            for comp in story_components_data:
-                comp_copy = copy.deepcopy(comp)
-                
-                # Find conflicting stories for this component
-                if comp["api_name"] in self.conflicts_map:
-                    conflicting_story_ids = [
-                        sid for sid in self.conflicts_map[comp["api_name"]] 
-                        if sid != story_id
-                    ]
-                    
-                    # Get details of conflicting stories
-                    conflicting_details = []
-                    for conf_story_id in conflicting_story_ids:
-                        if conf_story_id in self.stories:
-                            conf_story = self.stories[conf_story_id]
-                            conflicting_details.append({
-                                "story_id": conf_story_id,
-                                "jira_key": conf_story.get("jira_key"),
-                                "developer": conf_story.get("developer"),
-                                "commit_date": conf_story.get("story_commit_date")
-                            })
-                            logger.debug(f"[STEP5] {story_id} component {comp['api_name']} conflicts with {conf_story_id}")
-                    
-                    comp_copy["conflicting_stories"] = conflicting_details
-                else:
-                    comp_copy["conflicting_stories"] = []
-                
-                components_list.append(comp_copy)
-            
-            story_obj = {
-                "story_id": story_id,
-                "jira_key": story_info.get("jira_key"),
-                "title": story_info.get("title"),
-                "developer": story_info.get("developer"),
-                "component_count": len(components_list),
-                "components": components_list
-            }
-            
-            enriched_stories.append(story_obj)
-            logger.debug(f"[STEP5] Completed story {story_id} with {len(components_list)} components")
-        
-        logger.info(f"[STEP5] Complete: {len(enriched_stories)} stories enriched")
-        
-        return enriched_stories
-    
-    def _build_summary(self, blocked: List[Dict], conflicts: List[Dict], safe: List[Dict]) -> Dict:
-        """Step 6: Build summary with counts"""
-        logger.info("[STEP6] Building summary...")
-        
-        total_stories = len(blocked) + len(conflicts) + len(safe)
-        total_components = len(self.components)
-        components_in_conflict = len(self.conflicts_map)
-        
-        summary = {
-            "total_stories": total_stories,
-            "total_unique_components": total_components,
-            "stories_blocked": len(blocked),
-            "stories_with_conflicts": len(conflicts),
-            "stories_safe": len(safe),
-            "components_with_conflicts": components_in_conflict,
-            "analyzed_at": datetime.now().isoformat()
-        }
-        
-        logger.info(f"[STEP6] Summary: total_stories={total_stories}, components={total_components}, " +
-                   f"blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
-        
-        return summary
-    
-    def _validate_counts(self, summary: Dict, blocked: List[Dict], conflicts: List[Dict], safe: List[Dict]):
-        """Step 7: Validate that counts match"""
-        logger.info("[STEP7] Validating counts...")
-        
-        total_from_summary = summary["total_stories"]
-        total_from_lists = len(blocked) + len(conflicts) + len(safe)
-        
-        if total_from_summary == total_from_lists:
-            logger.info(f"[STEP7] ✓ COUNT VALID: {total_from_summary} = {total_from_lists}")
-        else:
-            logger.error(f"[STEP7] ✗ COUNT MISMATCH: summary={total_from_summary}, lists={total_from_lists}")
-        
-        logger.info(f"[STEP7] Breakdown: blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
-        logger.info(f"[STEP7] Unique components: {summary['total_unique_components']}")
-        logger.info(f"[STEP7] Components with conflicts: {summary['components_with_conflicts']}")
-    
-    def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse date string to datetime"""
-        if not date_str:
-            return None
-        
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except Exception as e:
-            logger.debug(f"[PARSE_DATE] Error parsing '{date_str}': {e}")
-            return None
-
-
-
-
-
-
+from story_analyzer import StoryAnalyzerTransformer
 
 
 @app.route('/api/analyze-stories', methods=['POST'])
@@ -1272,7 +715,6 @@ def analyze_stories():
         # Fetch metadata, commits, AND production state from SF
         try:
             from salesforce_client import (
-                sf_login_from_config,
                 fetch_user_story_metadata_by_story_names,
                 fetch_story_commits,
                 fetch_production_component_state,
@@ -1280,7 +722,7 @@ def analyze_stories():
             )
             from sf_adapter import sf_records_to_rows
             
-            sf = sf_login_from_config(payload.get("configJsonPath"))
+            sf = get_salesforce(payload.get("configJsonPath"))
             
             # Fetch 1: Component metadata per story
             logger.info(f"[ROUTE] Fetching story metadata for: {story_names}")
@@ -1628,6 +1070,7 @@ from git_client import BitBucketClient
 
 from enum import Enum
 from datetime import datetime, date
+from dataclasses import is_dataclass, fields
 
 
 # ---------------- Helpers ----------------
@@ -1659,6 +1102,9 @@ def json_safe(obj):
     # Model-like objects → try to_dict(), else __dict__
     if hasattr(obj, "to_dict") and callable(getattr(obj, "to_dict")):
         return json_safe(obj.to_dict())
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # Slotted models (models.py) have no __dict__
+        return {f.name: json_safe(getattr(obj, f.name)) for f in fields(obj) if not f.name.startswith("_")}
     if hasattr(obj, "__dict__"):
         # filter out private attrs
         return {k: json_safe(v) for k, v in obj.__dict__.items() if not k.startswith("_")}
@@ -1674,65 +1120,6 @@ def json_safe(obj):
     return obj
 
 
-def _strip_type_prefix(ctype: str, cname: str) -> str:
-    """Normalize 'Type.Name' → 'Name' when prefix matches the type."""
-    if not ctype or not cname:
-        return cname
-    prefix = f"{ctype}."
-
-    return cname[len(prefix):] if cname.startswith(prefix) else cname
-
-
-def _pick_primary_file_for_bundle(gclient: BitBucketClient, branch: str, folder: str, ctype: str, cname: str) -> str | None:
-    """
-    Pick a representative file from a bundle folder:
-      1) If registry defines primary_glob (e.g. '{name}/{name}_DataPack.json'), use '<folder>/<tail>'
-      2) Else prefer '*_DataPack.json' in the folder
-      3) Else prefer any '.json'
-      4) Else first file
-    """
-    ti = cr.get_type_info(ctype) or {}
-    primary_glob = ti.get("primary_glob")
-    if primary_glob:
-        # Glob may contain a subfolder "{name}/..."; keep only filename tail to safely join.
-        tail = primary_glob.replace("{name}", cname).split("/", 1)[-1]
-        return f"{folder.rstrip('/')}/{tail}"
-
-    files = gclient.list_folder_files(folder, branch=branch) or []
-    if not files:
-        return None
-    # Prefer datapacks
-    for p in files:
-        if isinstance(p, str) and p.lower().endswith("_datapack.json"):
-            return p
-    # Then any json
-    for p in files:
-        if isinstance(p, str) and p.lower().endswith(".json"):
-            return p
-    # Fallback: first string path
-    for p in files:
-        if isinstance(p, str):
-            return p
-    return None
-
-
-
-def _call_internal_endpoint(path: str, payload: dict) -> dict:
-    """
-    Reuse existing Flask endpoints without an HTTP roundtrip.
-    """
-    with app.test_client() as c:
-        resp = c.post(path, json=payload)
-        try:
-            data = resp.get_json() or {}
-        except Exception:
-            data = {"success": False, "error": f"Invalid JSON from {path}"}
-        if "success" not in data:
-            data["success"] = (200 <= resp.status_code < 300)
-        data["_status_code"] = resp.status_code
-        return data
-
-
 def _normalize_name(ctype: str, cname: str) -> str:
     """
     Strip 'Type.' prefix from the component name if it matches the type.
@@ -2144,7 +1531,6 @@ def enrich_conflicts_with_story_details(conflicts, stories, *args, **kwargs):
 
 # Add these imports to your existing app.py
 from deployment_prover import DeploymentProver
-from salesforce_client import sf_login_from_config
 from git_client import BitBucketClient
 import logging
 
@@ -2155,11 +1541,10 @@ deployment_log = logging.getLogger('deployment_prover')
 def initialize_deployment_prover():
     """Initialize DeploymentProver with real clients"""
     try:
-        # Try to use real clients
-        sf_client = sf_login_from_config()
+        # Real clients; Salesforce logs in on the first proof that needs it
         git_client = BitBucketClient()
         prover = DeploymentProver(
-            sf_client=sf_client,
+            sf_client=get_salesforce(),
             git_client=git_client, 
             mock_mode=False
         )
@@ -2171,7 +1556,8 @@ def initialize_deployment_prover():
         return DeploymentProver(mock_mode=True)
 
 # Initialize the prover
-prover = initialize_deployment_prover()
+with startup_stage("deployment prover"):
+    prover = initialize_deployment_prover()
 
 # Add these routes to your existing app.py
 
@@ -2207,6 +1593,41 @@ def prove_story_deployment():
 # OPTION 2: Per-Story Parameters (Different Settings Per Story)
 # =============================================================================
 
+def _positive_option(options: Dict, key: str, cast):
+    """options[key] converted with cast, or None if absent; ValueError unless it is a positive number"""
+    value = options.get(key)
+    if value is None:
+        return None
+    try:
+        number = None if isinstance(value, bool) else cast(value)
+    except (TypeError, ValueError, OverflowError):
+        number = None
+    if number is None or number != number or number <= 0 or number == float('inf'):
+        raise ValueError(f'options.{key} must be a positive number, got {value!r}')
+    return number
+
+
+def _bulk_execution_options(data: Dict) -> Tuple[Optional[int], Optional[float]]:
+    """
+    Read optional "options" from a bulk proof body.
+    
+    Returns (max_workers, story_timeout); None means use the prover's configured default.
+    "parallel": false runs stories one at a time.
+    Raises ValueError for values that aren't positive numbers.
+    """
+    options = data.get('options') or {}
+    if not isinstance(options, dict):
+        raise ValueError('options must be an object')
+    
+    if options.get('parallel') is False:
+        max_workers = 1
+    else:
+        max_workers = _positive_option(options, 'max_workers', int)
+    
+    story_timeout = _positive_option(options, 'timeout_per_story', float)
+    return max_workers, story_timeout
+
+
 @app.route('/api/deployment/prove/bulk/advanced', methods=['POST'])
 def prove_deployment_bulk_advanced():
     """
@@ -2250,39 +1671,36 @@ def prove_deployment_bulk_advanced():
         if not stories:
             return jsonify({'error': 'No stories provided'}), 400
         
+        try:
+            max_workers, story_timeout = _bulk_execution_options(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         logger.info(f"🚀 Advanced bulk proof for {len(stories)} stories")
         
         start_time = datetime.now()
-        results = []
         
-        for story_config in stories:
-            story_name = story_config.get('story_name')
-            
-            # Merge with defaults
-            target_env = story_config.get('target_env', defaults.get('target_env', 'production'))
-            target_branch = story_config.get('target_branch', defaults.get('target_branch', 'master'))
-            validation_level = story_config.get('validation_level', defaults.get('validation_level', 'standard'))
-            validate_story_env = story_config.get('validate_story_env', defaults.get('validate_story_env', True))
-            
-            try:
-                result = prover.prove_deployment(
-                    story_names=[story_name],
-                    target_env=target_env,
-                    target_branch=target_branch,
-                    validate_story_env=validate_story_env,
-                    validation_level=validation_level
-                )
-                
-                # Add the custom metadata to the result
-                result['custom_metadata'] = story_config.get('story_metadata', {})
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"Error processing {story_name}: {e}")
-                results.append({
-                    'stories': {'requested': [story_name], 'valid': [], 'invalid': [story_name]},
-                    'error': str(e)
-                })
+        # Merge each story with defaults
+        story_requests = [
+            {
+                'story_name': story_config.get('story_name'),
+                'target_env': story_config.get('target_env', defaults.get('target_env', 'production')),
+                'target_branch': story_config.get('target_branch', defaults.get('target_branch', 'master')),
+                'validation_level': story_config.get('validation_level', defaults.get('validation_level', 'standard')),
+                'validate_story_env': story_config.get('validate_story_env', defaults.get('validate_story_env', True))
+            }
+            for story_config in stories
+        ]
+        
+        results = prover.prove_stories_parallel(
+            story_requests,
+            max_workers=max_workers,
+            story_timeout=story_timeout
+        )
+        
+        # Add the custom metadata to each result
+        for story_config, result in zip(stories, results):
+            result['custom_metadata'] = story_config.get('story_metadata', {})
         
         # Format response
         if response_format == 'ui':
@@ -2571,19 +1989,79 @@ Result:
 @app.route('/api/deployment/prove/bulk', methods=['GET'])
 def prove_deployment_bulk_paginated():
     """
-    Paginated bulk proof results
+    Paginated bulk proof results from a background job (POST /bulk with "async": true)
     
     Query params:
+    - job_id: Job to read (default: the most recent job)
     - page: Page number (default 1)
-    - page_size: Items per page (default 50)
-    - status: Filter by status (proven|unproven|partial)
+    - page_size: Items per page (default 50, max 500)
+    - status: Filter by status (proven|unproven|partial, comma-separated)
     - author: Filter by author
     - date_from: Filter by date (ISO format)
     - date_to: Filter by date (ISO format)
+    - sort: index|story|status|author|date|score (default index)
+    - order: asc|desc (default asc)
+    
+    Stories appear as they finish, so a running job can be paged while it runs.
     """
-    # Implementation would retrieve from database/cache
-    # This is a placeholder showing the structure
-    pass
+    try:
+        from proof_jobs import get_job_queue
+        store = get_job_queue().store
+        
+        job_id = request.args.get('job_id')
+        job = store.get(job_id) if job_id else store.latest()
+        if not job:
+            return jsonify({'error': f'Job not found: {job_id}' if job_id else 'No proof jobs yet'}), 404
+        
+        try:
+            page = max(1, int(request.args.get('page', 1)))
+            page_size = min(500, max(1, int(request.args.get('page_size', 50))))
+        except ValueError:
+            return jsonify({'error': 'page and page_size must be integers'}), 400
+        
+        stories, total = store.stories(
+            job['job_id'],
+            status=request.args.get('status'),
+            author=request.args.get('author'),
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            sort=request.args.get('sort', 'index'),
+            descending=request.args.get('order', 'asc').lower() == 'desc',
+            page=page,
+            page_size=page_size
+        )
+        
+        response = job.pop('response') or {}
+        job.pop('params', None)
+        return jsonify({
+            'job': job,
+            'overview': response.get('overview'),
+            'release': response.get('release'),
+            'stories': stories,
+            'pagination': {
+                'page': page,
+                'page_size': page_size,
+                'total': total,
+                'total_pages': (total + page_size - 1) // page_size
+            },
+            'filters': store.facets(job['job_id'])
+        })
+        
+    except Exception as e:
+        logger.error(f"Paginated bulk results error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/deployment/prove/jobs/<job_id>', methods=['GET'])
+def get_proof_job(job_id):
+    """Status and progress of a background proof job"""
+    from proof_jobs import get_job_queue
+    job = get_job_queue().store.get(job_id)
+    if not job:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+    response = job.pop('response') or {}
+    job['overview'] = response.get('overview')
+    return jsonify(job)
 
 
 # =============================================================================
@@ -2621,32 +2099,232 @@ def get_story_details(story_id):
 # EXPORT ENDPOINT (For downloading results)
 # =============================================================================
 
+def _resolve_bulk_stories(data: Dict) -> List[str]:
+    """
+    story_names plus the stories of release_name (deduplicated, request order).
+    Raises LookupError when the release has no stories.
+    """
+    story_names = data.get('story_names', [])
+    release_name = data.get('release_name')
+    if not release_name:
+        return story_names
+    
+    logger.info(f"🔍 Getting stories from release: {release_name}")
+    release_stories = prover.get_stories_from_release(release_name)
+    logger.info(f"   ✅ Got {len(release_stories)} stories from release")
+    if not release_stories:
+        raise LookupError(f'No user stories found in release: {release_name}')
+    
+    all_stories = list(dict.fromkeys(story_names + release_stories))
+    logger.info(f"   📋 Total unique stories: {len(all_stories)}")
+    return all_stories
+
+
+def _bulk_proof_kwargs(data: Dict) -> Dict:
+    """prove_release_bulk keyword arguments from a bulk proof body"""
+    story_metadata = data.get('story_metadata', {})
+    max_workers, story_timeout = _bulk_execution_options(data)
+    return {
+        'target_env': data.get('target_env', 'production'),
+        'target_branch': data.get('target_branch', 'master'),
+        'validate_story_env': data.get('validate_story_env', True),
+        'validation_level': story_metadata.get('validation_level') or data.get('validation_level', 'standard'),
+        'max_workers': max_workers,
+        'story_timeout': story_timeout,
+    }
+
+
+def _release_info(release_name: str, all_stories: List[str]) -> Dict:
+    return {
+        'name': release_name,
+        'story_count': len(all_stories),
+        'stories': sorted(all_stories)
+    }
+
+
+def _wants_async(data: Dict) -> bool:
+    """Opt-in background execution: {"async": true} or ?async=true"""
+    flag = data.get('async', request.args.get('async', False))
+    if isinstance(flag, str):
+        return flag.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(flag)
+
+
+def _story_recorder(job, story_names: List[str]):
+    """on_result callback storing each finished story's summary in the job"""
+    def record(index: int, result: Dict) -> None:
+        story_id = story_names[index]
+        try:
+            summary = prover.summarize_story(result)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not summarize {story_id}: {e}")
+            summary = {'story_id': story_id, 'status': 'unproven', 'error': str(e)}
+        job.story_done(index, story_id, summary)
+    return record
+
+
+def _job_accepted(job_id: str):
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/deployment/prove/jobs/{job_id}',
+        'results_url': f'/api/deployment/prove/bulk?job_id={job_id}'
+    }), 202
+
+
+def _submit_bulk_job(data: Dict):
+    """Queue a /bulk proof; stories are stored as they finish and served by GET /bulk"""
+    from proof_jobs import get_job_queue
+    
+    if not data.get('story_names') and not data.get('release_name'):
+        return jsonify({'error': 'No story names or release name provided'}), 400
+    
+    def run(job) -> Dict:
+        job.phase('loading stories')
+        all_stories = _resolve_bulk_stories(data)
+        if not all_stories:
+            raise ValueError('No story names or release name provided')
+        job.set_total(len(all_stories))
+        
+        job.phase('proving')
+        start_time = datetime.now()
+        results = prover.prove_release_bulk(
+            story_names=all_stories,
+            on_result=_story_recorder(job, all_stories),
+            **_bulk_proof_kwargs(data)
+        )
+        
+        job.phase('summarizing')
+        response = prover.format_bulk_response(results, start_time)
+        if data.get('release_name'):
+            response['release'] = _release_info(data['release_name'], all_stories)
+        return response
+    
+    return _job_accepted(get_job_queue().submit('bulk', data, run))
+
+
+STREAM_FORMATS = ('stream', 'ndjson', 'sse')
+STREAM_HEARTBEAT_SECONDS = 15
+
+
+def _stream_bulk_proof(data: Dict, all_stories: List[str], release_name: Optional[str], response_format: str):
+    """
+    format=stream|ndjson|sse: one record per story as it finishes, then the aggregate.
+    
+    Records are {"type": "start" | "story" | "heartbeat" | "error" | "summary", ...}.
+    "stream" picks SSE when the client accepts text/event-stream, NDJSON otherwise.
+    Results are folded into a BulkResponseBuilder as they arrive, so full
+    per-story results are not kept; the summary record is format_bulk_response
+    without "stories". The proof runs on its own thread and finishes even if
+    the client disconnects.
+    """
+    from deployment_prover import BulkResponseBuilder
+    
+    sse = response_format == 'sse' or (
+        response_format == 'stream' and
+        request.accept_mimetypes.best_match(['application/x-ndjson', 'text/event-stream']) == 'text/event-stream'
+    )
+    proof_kwargs = _bulk_proof_kwargs(data)
+    total = len(all_stories)
+    events: "queue.Queue" = queue.Queue()
+    finished = object()
+    
+    def run() -> None:
+        try:
+            prover.prove_release_bulk(
+                story_names=all_stories,
+                on_result=lambda index, result: events.put((index, result)),
+                keep_results=False,
+                **proof_kwargs
+            )
+        except Exception as e:
+            logger.error(f"❌ Streamed bulk proof failed: {e}")
+            events.put(e)
+        finally:
+            events.put(finished)
+    
+    def encode(record: Dict) -> str:
+        body = json.dumps(json_safe(record))
+        return f"event: {record['type']}\ndata: {body}\n\n" if sse else body + "\n"
+    
+    def generate():
+        start_time = datetime.now()
+        builder = BulkResponseBuilder(prover, keep_stories=False)
+        yield encode({
+            'type': 'start',
+            'total': total,
+            'release': _release_info(release_name, all_stories) if release_name else None
+        })
+        threading.Thread(target=run, name='bulk-stream', daemon=True).start()
+        
+        done = 0
+        while True:
+            try:
+                item = events.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keepalive\n\n" if sse else encode({'type': 'heartbeat', 'done': done, 'total': total})
+                continue
+            if item is finished:
+                break
+            if isinstance(item, Exception):
+                yield encode({'type': 'error', 'error': str(item)})
+                continue
+            
+            index, result = item
+            done += 1
+            summary = builder.add(result)
+            yield encode({
+                'type': 'story',
+                'index': index,
+                'story_id': all_stories[index],
+                'done': done,
+                'total': total,
+                'story': summary
+            })
+        
+        response = builder.build(start_time)
+        response.pop('stories')
+        if release_name:
+            response['release'] = _release_info(release_name, all_stories)
+        yield encode({'type': 'summary', **response})
+        logger.info(f"✅ Streamed {done}/{total} stories in {datetime.now() - start_time}")
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream' if sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/deployment/prove/bulk', methods=['POST'])
 def prove_deployment_bulk():
+    """
+    Bulk proof for story_names and/or a release_name.
+    
+    Runs synchronously by default. With "async": true (or ?async=true) the proof
+    is queued and 202 returns a job_id; poll /api/deployment/prove/jobs/<job_id>
+    and page through results with GET /api/deployment/prove/bulk?job_id=...
+    
+    "format": "stream" (or "ndjson" / "sse") streams each story's summary as
+    it finishes, followed by the aggregate; see _stream_bulk_proof.
+    """
     try:
         data = request.get_json()
         
-        story_names = data.get('story_names', [])
-        release_name = data.get('release_name')
+        # Reject bad options up front, before a job is queued or a stream opened
+        try:
+            _bulk_execution_options(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # ========== FIX: Properly merge release and story names ==========
-        if release_name:
-            logger.info(f"🔍 Getting stories from release: {release_name}")
-            
-            release_stories = prover.get_stories_from_release(release_name)
-            logger.info(f"   ✅ Got {len(release_stories)} stories from release")
-            
-            if not release_stories:
-                return jsonify({
-                    'error': f'No user stories found in release: {release_name}'
-                }), 404
-            
-            # Merge and deduplicate
-            all_stories = list(set(story_names + release_stories))
-            logger.info(f"   📋 Total unique stories: {len(all_stories)}")
-        else:
-            all_stories = story_names
-        # =================================================================
+        if _wants_async(data):
+            return _submit_bulk_job(data)
+        
+        release_name = data.get('release_name')
+        try:
+            all_stories = _resolve_bulk_stories(data)
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
         
         # Check we have stories
         if not all_stories:
@@ -2654,42 +2332,21 @@ def prove_deployment_bulk():
                 'error': 'No story names or release name provided'
             }), 400
         
-        # Get other parameters
-        target_env = data.get('target_env', 'production')
-        target_branch = data.get('target_branch', 'master')
-        story_metadata = data.get('story_metadata', {})
-        validation_level = story_metadata.get('validation_level') or \
-                          data.get('validation_level', 'standard')
-        validate_story_env = data.get('validate_story_env', True)
         response_format = data.get('format', 'ui')
         
         logger.info(f"🚀 Bulk proof request for {len(all_stories)} stories")
         
+        if response_format in STREAM_FORMATS:
+            return _stream_bulk_proof(data, all_stories, release_name, response_format)
+        
         start_time = datetime.now()
         
-        # Process ALL stories (not just story_names!)
-        results = []
-        for i, story_name in enumerate(all_stories, 1):
-            try:
-                logger.info(f"   [{i}/{len(all_stories)}] Processing {story_name}...")
-                
-                result = prover.prove_deployment(
-                    story_names=[story_name],
-                    target_env=target_env,
-                    target_branch=target_branch,
-                    validate_story_env=validate_story_env,
-                    validation_level=validation_level
-                )
-                results.append(result)
-                
-            except Exception as e:
-                logger.error(f"   Error processing {story_name}: {e}")
-                results.append({
-                    'stories': {'requested': [story_name], 'valid': [], 'invalid': [story_name]},
-                    'overall_proof': {'verdict': 'UNPROVEN', 'confidence': 'very low', 'score': 0.0},
-                    'summary': {'total_components': 0, 'proven_components': 0},
-                    'error': str(e)
-                })
+        # Process ALL stories (not just story_names!) as one release so story data,
+        # production state and per-commit git lookups are shared across stories
+        results = prover.prove_release_bulk(
+            story_names=all_stories,
+            **_bulk_proof_kwargs(data)
+        )
         
         # Format response
         if response_format == 'ui':
@@ -2697,11 +2354,7 @@ def prove_deployment_bulk():
             
             # Add release info
             if release_name:
-                response['release'] = {
-                    'name': release_name,
-                    'story_count': len(all_stories),
-                    'stories': sorted(all_stories)
-                }
+                response['release'] = _release_info(release_name, all_stories)
         else:
             response = {
                 'total_stories': len(all_stories),
@@ -2887,7 +2540,7 @@ def analyze_salesforce_stub():
 
     # --- Salesforce fetch ---
     try:
-        sf = sf_login_from_config(payload.get("configJsonPath"))
+        sf = get_salesforce(payload.get("configJsonPath"))
         if release_names:
             records = fetch_user_story_metadata_by_release(sf, release_names)
         else:
@@ -2923,6 +2576,7 @@ def analyze_salesforce_stub():
         tmp_path = tmp.name  # keep this file for inspection
 
     # --- Reuse your existing CSV pipeline ---
+    from csv_parser import CopadoCSVParser  # pulls in pandas
     parser = CopadoCSVParser()
     parsed = parser.parse_file(tmp_path)  # your parser's method
 
@@ -3081,9 +2735,10 @@ def analyze_salesforce_stub():
 @app.route('/api/compare-orgs', methods=['POST'])
 def compare_orgs():
     """
-    Compare latest commits of components between two orgs/branches by reusing:
-      - /api/production-state
-      - /api/get-code-diff   (only when include_diffs=true for changed items)
+    Compare latest commits of components between two orgs/branches using the
+    component_state services behind:
+      - /api/production-state   (both branches concurrently, one shared client)
+      - /api/get-code-diff      (only when include_diffs=true for changed items)
 
     Request JSON:
     {
@@ -3094,11 +2749,17 @@ def compare_orgs():
       "components": [ {"type":"DataRaptor","name":"PRDRFetchAssets"}, ... ],
       "include_diffs": false,
       "changed_only": false,
+      "full_state": false,
       "limit": null
     }
+
+    Components the branch diffstat doesn't touch are reported SAME with null
+    commits and are not looked up (so they are never NOT_FOUND); pass
+    "full_state": true to resolve every component on both branches.
     """
+    from component_state import bundle_diff, compare_branch_states, map_components, production_states
+
     data = request.get_json(silent=True) or {}
-    base_url = get_config().SELF_BASE_URL
 
 
     orgA = (data.get("orgA") or "uat").strip()
@@ -3109,6 +2770,7 @@ def compare_orgs():
     components = data.get("components") or []
     include_diffs = bool(data.get("include_diffs", False))
     changed_only = bool(data.get("changed_only", False))
+    full_state = bool(data.get("full_state", False))
     limit = data.get("limit", None)
     try:
         limit = int(limit) if limit is not None else None
@@ -3137,21 +2799,21 @@ def compare_orgs():
         seen.add(key)
         norm_components.append(comp)
 
-    # Reuse production-state for both sides
-    payloadA = {"branch": branchA, "components": norm_components}
-    payloadB = {"branch": branchB, "components": norm_components}
-
-    stateA = _call_internal_endpoint("/api/production-state", payloadA)
-    stateB = _call_internal_endpoint("/api/production-state", payloadB)
-
-    if not stateA.get("success"):
-        return jsonify({"success": False,
-                        "error": f"/api/production-state failed for orgA ({branchA})",
-                        "details": stateA}), 502
-    if not stateB.get("success"):
+    # Production state for both sides at once, on one client so lookups share its caches.
+    # By default one branch diffstat skips components the two branches can't differ on.
+    gclient = BitBucketClient(app.logger)
+    try:
+        if full_state:
+            stateA, stateB = production_states([branchA, branchB], norm_components, gclient=gclient)
+            unchanged, compare_mode = [], "full"
+        else:
+            stateA, stateB, unchanged, compare_mode = compare_branch_states(
+                branchA, branchB, norm_components, gclient=gclient)
+    except Exception as e:
+        app.logger.error(f"[compare-orgs] production state failed ({branchA}, {branchB}): {e}")
         return jsonify({"success": False,
-                        "error": f"/api/production-state failed for orgB ({branchB})",
-                        "details": stateB}), 502
+                        "error": f"production state failed for {branchA}/{branchB}",
+                        "details": {"error": str(e)}}), 502
 
     listA = stateA.get("production_state", []) or []
     listB = stateB.get("production_state", []) or []
@@ -3177,6 +2839,8 @@ def compare_orgs():
 
     idxA = _index_by_key(listA)
     idxB = _index_by_key(listB)
+    # Untouched by the diffstat: identical on both sides, not looked up (no commit ids)
+    unchanged_keys = {(c["type"], c["name"]) for c in unchanged}
 
     # Compare
     changes_all = []
@@ -3187,7 +2851,10 @@ def compare_orgs():
         a = idxA.get((ctype, cname), {"commit": None, "exists": False})
         b = idxB.get((ctype, cname), {"commit": None, "exists": False})
 
-        if not a["exists"] and not b["exists"]:
+        if (ctype, cname) in unchanged_keys:
+            status = "SAME"
+            counts["SAME"] += 1
+        elif not a["exists"] and not b["exists"]:
             status = "NOT_FOUND"
             counts["NOT_FOUND"] += 1
         elif a["exists"] and not b["exists"]:
@@ -3215,7 +2882,9 @@ def compare_orgs():
         "total": len(norm_components),
         "changed": counts["DIFF"] + counts["NEW_IN_A"] + counts["NEW_IN_B"],
         "same": counts["SAME"],
-        "not_found": counts["NOT_FOUND"]
+        "not_found": counts["NOT_FOUND"],
+        "unchanged_skipped": len(unchanged),
+        "mode": compare_mode
     }
 
     # Optionally attach diffs (lazy & limited)
@@ -3225,20 +2894,19 @@ def compare_orgs():
             changed_rows = changed_rows[:limit]
         keys_for_diff = {(r["component_type"], r["component_name"]) for r in changed_rows}
 
-        detailed = []
-        for row in changes:
-            if (row["component_type"], row["component_name"]) in keys_for_diff:
-                diff_payload = {
-                    "component_type": row["component_type"],
-                    "component_name": row["component_name"],
-                    "uat_branch": branchA,   # orgA
-                    "prod_branch": branchB   # orgB
-                }
-                diff_res = _call_internal_endpoint("/api/get-code-diff", diff_payload)
-                detailed.append({**row, "diff": diff_res})
-            else:
-                detailed.append(row)
-        changes = detailed
+        def _diff(row):
+            data = bundle_diff(row["component_type"], row["component_name"],
+                               prod_branch=branchB,   # orgB
+                               uat_branch=branchA,    # orgA
+                               gclient=gclient)
+            return {"success": True, "data": data}
+
+        # Bounded and per-component timed, so one slow bundle diff can't hold up the request
+        diff_rows = [row for row in changes if (row["component_type"], row["component_name"]) in keys_for_diff]
+        diffs = iter(map_components(_diff, diff_rows, fallback=lambda row, e: {"success": False, "error": str(e)}))
+        changes = [{**row, "diff": next(diffs)}
+                   if (row["component_type"], row["component_name"]) in keys_for_diff else row
+                   for row in changes]
 
     return jsonify({
         "success": True,
@@ -3304,6 +2972,8 @@ def component_history():
         seen.add(key)
         norm_components.append(c)
 
+    from component_state import map_components
+
     client = BitBucketClient(app.logger)
 
     def _compact(commits):
@@ -3317,8 +2987,7 @@ def component_history():
             })
         return compact
 
-    out_rows = []
-    for comp in norm_components:
+    def _history(comp):
         ctype, cname = comp["type"], comp["name"]
 
         pathA = _resolve_primary_file_for_component(client, branchA, ctype, cname)
@@ -3327,7 +2996,7 @@ def component_history():
         commitsA = client.get_file_commits(pathA, branch=branchA, limit=limit) if pathA else []
         commitsB = client.get_file_commits(pathB, branch=branchB, limit=limit) if pathB else []
 
-        out_rows.append({
+        return {
             "component_type": ctype,
             "component_name": cname,
             "orgA": {
@@ -3340,7 +3009,20 @@ def component_history():
                 "file_path": pathB,
                 "commits": _compact(commitsB)
             }
-        })
+        }
+
+    def _history_error(comp, error):
+        missing = {"exists": False, "file_path": None, "commits": []}
+        return {
+            "component_type": comp["type"],
+            "component_name": comp["name"],
+            "orgA": dict(missing),
+            "orgB": dict(missing),
+            "error": str(error)
+        }
+
+    # Components in parallel (input order kept), sharing the client's caches
+    out_rows = map_components(_history, norm_components, fallback=_history_error)
 
     return jsonify({
         "success": True,
@@ -3395,9 +3077,33 @@ def get_component_diff_details():
 def check_commit_relationship():
     """
     Check if one commit includes another's changes
+
+    Batch forms (one shared commit-graph walk for all pairs):
+      {"pairs": [{"commit1": older, "commit2": newer}, ...]}
+      {"commits": [c1, c2, ...]}  -> every ordered pair (ci, cj), i < j
     """
     try:
         data = request.json
+        
+        if data.get('pairs') or data.get('commits'):
+            if data.get('pairs'):
+                pairs = [(p.get('commit1', ''), p.get('commit2', '')) for p in data['pairs']]
+            else:
+                commits = [c for c in data['commits'] if c]
+                pairs = [(a, b) for i, a in enumerate(commits) for b in commits[i + 1:]]
+            if not pairs or not all(a and b for a, b in pairs):
+                return jsonify({
+                    'success': False,
+                    'error': 'Both commits required for every pair'
+                }), 400
+            
+            git_client = BitBucketClient()
+            results = git_client.check_commit_ancestry_many(pairs)
+            return jsonify({
+                'success': True,
+                'results': [dict(r, commit1=a, commit2=b) for (a, b), r in zip(pairs, results)]
+            })
+        
         commit1 = data.get('commit1', '')  # Older
         commit2 = data.get('commit2', '')  # Newer
         
@@ -3427,18 +3133,8 @@ def get_code_diff():
         prod_branch = data.get('prod_branch', 'master')
         uat_branch = data.get('uat_branch', 'uatsfdc')
         
-        if '.' in component_name:
-            component_name = component_name.split('.', 1)[1]
-        
-        git_client = BitBucketClient()
-        
-        # Use bundle diff for multi-file components
-        diff_result = git_client.get_bundle_diff(
-            component_name=component_name,
-            component_type=component_type,
-            prod_branch=prod_branch,
-            uat_branch=uat_branch
-        )
+        from component_state import bundle_diff
+        diff_result = bundle_diff(component_type, component_name, prod_branch, uat_branch)
         
         return jsonify({
             'success': True,
@@ -3459,7 +3155,8 @@ def export_pdf():
         data = request.get_json()
         group_by_dev = data.get('group_by_developer', False)
         
-        # Generate PDF
+        # Generate PDF (reportlab is only loaded here)
+        from pdf_generator import generate_pdf_report
         pdf_file = generate_pdf_report(data, group_by_developer=group_by_dev)
         
         # Return PDF file
@@ -3490,10 +3187,22 @@ def health_check():
     })
 
 
+@app.route('/api/startup-report', methods=['GET'])
+def startup_report():
+    """
+    How long each init stage took, plus the shared Salesforce session state
+    (the login itself happens on first use, so it shows up here once done)
+    """
+    return jsonify({
+        'stages': STARTUP_STAGES,
+        'total_ms': sum(s['ms'] for s in STARTUP_STAGES),
+        'import_ms': _IMPORT_MS,
+        'salesforce': sf_client.session_manager.stats(),
+    })
+
+
 @app.route('/api/production-state', methods=['POST'])
 def get_production_state():
-    cfg = get_config()
-    max_workers = int(cfg.API_MAX_WORKERS)
     """
     Request JSON:
     {
@@ -3525,6 +3234,8 @@ def get_production_state():
       ]
     }
     """
+    from component_state import production_state
+
     body = request.get_json(silent=True) or {}
     branch = (body.get('branch') or body.get('prod_branch') or 'master').strip()
     components = body.get('components') or []
@@ -3539,153 +3250,7 @@ def get_production_state():
             "production_state": []
         }), 400
 
-    # Concurrency knob (safe default 8)
-    max_workers = int(os.getenv("API_MAX_WORKERS", "8"))
-
-    # Use existing global client if present, else make a local one
-    gclient = globals().get("git_client")
-    if gclient is None or not isinstance(gclient, BitBucketClient):
-        gclient = BitBucketClient(app.logger)
-
-    # Identify bundle types from registry (any type with kind == 'bundle')
-    bundle_types = set()
-    try:
-        for tname, tinfo in (cr.TYPE_MAP if hasattr(cr, "TYPE_MAP") else cr.types()).items():
-            if isinstance(tinfo, dict) and tinfo.get("kind") == "bundle":
-                bundle_types.add(tname)
-    except Exception:
-        # fallback to a conservative, common set
-        bundle_types = {
-            "OmniScript", "IntegrationProcedure", "DataRaptor",
-            "CalculationMatrix", "CalculationMatrixVersion", "Catalog",
-            "PriceList", "AttributeCategory", "Product2",
-            "OrchestrationItemDefinition", "OrchestrationDependencyDefinition"
-        }
-
-    def _process(component: dict) -> dict:
-        """
-        Process a single component, returning the per-row dict with the exact keys you expect.
-        Never raises; returns a soft-error row on exceptions.
-        """
-        try:
-            ctype = (component.get('type') or component.get('component_type') or '').strip()
-            cname_raw = (component.get('name') or component.get('component_name') or '').strip()
-            if not ctype or not cname_raw:
-                raise ValueError(f"bad component entry: {component!r}")
-
-            # Keep original name in response; normalize for lookup
-            cname_norm = _strip_type_prefix(ctype, cname_raw)
-
-            # --- Bundle path resolution ---
-            if ctype in bundle_types:
-                folder_any = gclient.resolve_vlocity_bundle(
-                    branch=branch,
-                    component_type=ctype,
-                    component_name=cname_norm
-                )
-                # normalize folder to string (resolver may return str/tuple/dict)
-                folder = None
-                if isinstance(folder_any, str):
-                    folder = folder_any
-                elif isinstance(folder_any, (list, tuple)):
-                    folder = next((v for v in folder_any if isinstance(v, str)), None)
-                elif isinstance(folder_any, dict):
-                    folder = folder_any.get("folder") or folder_any.get("path") or folder_any.get("dir")
-
-                exists = bool(folder)
-                file_path = None
-                last_commit = None
-
-                if exists:
-                    primary = _pick_primary_file_for_bundle(gclient, branch, folder, ctype, cname_norm)
-                    file_path = primary or folder  # prefer file; fallback to folder string
-
-                    # Get last commit from primary file (fast)
-                    if primary:
-                        commits = gclient.get_file_commits(primary, branch=branch, limit=1) or []
-                        last_commit = commits[0] if commits else None
-
-                return {
-                    "component_name": cname_raw,                  # keep user's original naming
-                    "component_type": ctype,
-                    "exists_in_prod": exists,
-                    "file_path": file_path,
-                    "file_size": 0,                               # unknown for folder; 0 for file unless we fetch
-                    "last_author": (last_commit or {}).get("author"),
-                    "last_commit_date": (last_commit or {}).get("date"),
-                    "last_commit_hash": ((last_commit or {}).get("hash") or (last_commit or {}).get("short_hash") or None),
-                    "last_commit_message": (last_commit or {}).get("message")
-                }
-
-            # --- Single-file types ---
-            content, actual_path = gclient.get_file_content_smart(
-                component_name=cname_norm,
-                component_type=ctype,
-                branch=branch
-            )
-            exists = content is not None
-            file_path = actual_path
-            last_commit = None
-
-            if file_path:
-                commits = gclient.get_file_commits(file_path, branch=branch, limit=1) or []
-                last_commit = commits[0] if commits else None
-
-            return {
-                "component_name": cname_raw,
-                "component_type": ctype,
-                "exists_in_prod": exists,
-                "file_path": file_path,
-                "file_size": len(content) if content else 0,
-                "last_author": (last_commit or {}).get("author"),
-                "last_commit_date": (last_commit or {}).get("date"),
-                "last_commit_hash": ((last_commit or {}).get("hash") or (last_commit or {}).get("short_hash") or None),
-                "last_commit_message": (last_commit or {}).get("message")
-            }
-
-        except Exception as e:
-            # Soft-fail row; never break the whole request
-            return {
-                "component_name": (component.get('name') or component.get('component_name') or ''),
-                "component_type": (component.get('type') or component.get('component_type') or ''),
-                "exists_in_prod": False,
-                "file_path": None,
-                "file_size": 0,
-                "last_author": None,
-                "last_commit_date": None,
-                "last_commit_hash": None,
-                "last_commit_message": f"error: {e}"
-            }
-
-    # --- Run components in parallel ---
-    rows = []
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        futures = {pool.submit(_process, comp): comp for comp in components}
-        for fut in as_completed(futures):
-            rows.append(fut.result())
-
-    # Preserve input order if you prefer (optional). Otherwise parallel completion order is fine.
-    # Reorder by first appearance of (type,name) in input:
-    order_map = { ( (c.get('type') or c.get('component_type')),
-                    (c.get('name') or c.get('component_name')) ): i
-                  for i, c in enumerate(components) }
-    rows.sort(key=lambda r: order_map.get((r.get('component_type'), r.get('component_name')), 1_000_000))
-
-    # --- Summaries ---
-    existing = sum(1 for r in rows if r.get("exists_in_prod"))
-    missing = len(rows) - existing
-
-    resp = {
-        "success": True,
-        "branch": branch,
-        "checked_at": datetime.utcnow().isoformat(),
-        "total_components": len(rows),
-        "existing": existing,
-        "missing": missing,
-        "production_state": rows
-    }
-
-    return jsonify(resp), 200
+    return jsonify(production_state(branch, components, gclient=BitBucketClient(app.logger))), 200
 
 
 
@@ -3709,10 +3274,11 @@ def compare_deployment():
                 'error': 'No components provided'
             }), 400
         
+        from component_state import map_components
+        
         git_client = BitBucketClient()
-        comparison_results = []
         
-        for component in components:
+        def _compare(component):
             component_name = component.get('name', '')
             component_type = component.get('type', '')
             
@@ -3736,26 +3302,6 @@ def compare_deployment():
                 branch='uatsfdc'  # Change to 'uat' if you have UAT branch
             )
             
-            print(f"\n{'='*60}")
-            print(f"Component: {component_name}")
-            print(f"Type: {component_type}")
-            print(f"Prod exists: {prod_content is not None}")
-            print(f"UAT exists: {uat_content is not None}")
-            
-            if prod_content and uat_content:
-                print(f"Prod size: {len(prod_content)} chars")
-                print(f"UAT size: {len(uat_content)} chars")
-                print(f"Are identical: {prod_content == uat_content}")
-    
-            if prod_content != uat_content:
-                # Show first difference
-                for i, (c1, c2) in enumerate(zip(prod_content, uat_content)):
-                    if c1 != c2:
-                        print(f"First diff at position {i}: '{c1}' vs '{c2}'")
-                        print(f"Context: ...{prod_content[max(0,i-20):i+20]}...")
-                        break
-            print(f"{'='*60}\n")
-
             # Determine status
             if prod_content is None and uat_content is None:
                 status = 'NOT_FOUND'
@@ -3768,14 +3314,31 @@ def compare_deployment():
             else:
                 status = 'MODIFIED'
             
-            comparison_results.append({
+            logger.debug(f"compare-deployment {component_type}/{component_name}: {status} "
+                         f"(prod {len(prod_content or '')} chars, uat {len(uat_content or '')} chars)")
+            
+            return {
                 'component_name': component_name,
                 'component_type': component_type,
                 'status': status,
                 'in_production': prod_content is not None,
                 'in_uat': uat_content is not None,
                 'file_path': prod_path or uat_path
-            })
+            }
+        
+        def _compare_error(component, error):
+            return {
+                'component_name': component.get('name', ''),
+                'component_type': component.get('type', ''),
+                'status': 'ERROR',
+                'in_production': False,
+                'in_uat': False,
+                'file_path': None,
+                'error': str(error)
+            }
+        
+        # Components in parallel (input order kept), sharing the client's caches
+        comparison_results = map_components(_compare, components, fallback=_compare_error)
         
         # Calculate summary
         summary = {
@@ -3784,7 +3347,8 @@ def compare_deployment():
             'new': len([r for r in comparison_results if r['status'] == 'NEW']),
             'identical': len([r for r in comparison_results if r['status'] == 'IDENTICAL']),
             'removed': len([r for r in comparison_results if r['status'] == 'REMOVED']),
-            'not_found': len([r for r in comparison_results if r['status'] == 'NOT_FOUND'])
+            'not_found': len([r for r in comparison_results if r['status'] == 'NOT_FOUND']),
+            'errors': len([r for r in comparison_results if r['status'] == 'ERROR'])
         }
         
         return jsonify({
@@ -3869,6 +3433,10 @@ def analyze_csv():
     if deployment_file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
+    # pandas-backed parsers, loaded on first use
+    from csv_parser import CopadoCSVParser
+    from production_analyzer import parse_production_state, check_regression
+    
     try:
         # Save deployment file
         deploy_filename = secure_filename(deployment_file.filename)
@@ -4040,11 +3608,15 @@ def format_conflict(conflict):
     }
 
 
+_IMPORT_MS = int((time.time() - _STARTUP_BEGAN) * 1000)
+logging.getLogger(__name__).info(
+    "[STARTUP] app ready in %dms: %s", _IMPORT_MS,
+    ", ".join(f"{s['stage']} {s['ms']}ms" for s in STARTUP_STAGES))
+
 if __name__ == '__main__':
     print("=" * 60)
     print("🚀 Copado Deployment Validator API")
     loader = ConfigLoader('validation_config_conditional.yaml')
-    init_globals()
     print("=" * 60)
     print("Starting server on http://localhost:5000")
     print()
@@ -0,0 +1,105 @@
+# bench_csv_parser.py
+"""
+Benchmark: row-by-row vs vectorized CSV parsing.
+
+Generates a Copado-style metadata CSV, parses it with CopadoCSVParser and
+parse_production_state on both paths, checks the results are identical and
+prints the timings.
+
+Usage:
+    python bench_csv_parser.py              # 100k rows
+    python bench_csv_parser.py --rows 50000 --stories 2000
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from csv_parser import CopadoCSVParser, TYPE_MAP, STATUS_MAP
+from production_analyzer import parse_production_state
+
+HEADER = [
+    'copado__User_Story__r.Name',
+    'copado__User_Story__r.copado__User_Story_Title__c',
+    'copado__User_Story__r.copadoccmint__JIRA_key__c',
+    'copado__User_Story__r.copado__Project__r.Name',
+    'copado__User_Story__r.copado__Environment__r.Name',
+    'copado__User_Story__r.copado__Developer__r.Name',
+    'copado__Metadata_API_Name__c',
+    'copado__Type__c',
+    'copado__Status__c',
+    'copado__Unique_ID__c',
+    'copado__Last_Commit_Date__c',
+    'CreatedBy.Name',
+    'LastModifiedBy.Name',
+    'copado__User_Story_Commit__c',
+]
+
+
+def generate_csv(path: str, rows: int, stories: int, components: int, seed: int = 7) -> None:
+    rnd = random.Random(seed)
+    types = list(TYPE_MAP) + ['CustomObject', '']
+    statuses = list(STATUS_MAP) + ['', 'Other']
+    base = datetime(2024, 1, 1)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for _ in range(rows):
+            story = rnd.randrange(stories)
+            component = rnd.randrange(components)
+            ctype = rnd.choice(types)
+            when = base + timedelta(minutes=rnd.randrange(500_000))
+            writer.writerow([
+                f'US-{story:07d}',
+                f'Story {story}',
+                f'JIRA-{story}' if story % 3 else '',
+                f'Project {story % 5}',
+                rnd.choice(['UAT', 'QA', 'SIT']),
+                f'Dev {story % 40}' if story % 7 else '',
+                f'{ctype or "Unknown"}.Component{component}',
+                ctype,
+                rnd.choice(statuses),
+                f'{ctype};Component{component}',
+                when.strftime('%Y-%m-%dT%H:%M:%S.000+0000') if rnd.random() > 0.02 else '',
+                f'User {story % 25}',
+                f'User {component % 25}',
+                f'{rnd.getrandbits(160):040x}' if rnd.random() > 0.1 else '',
+            ])
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--stories', type=int, default=5_000)
+    parser.add_argument('--components', type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'metadata.csv')
+        generate_csv(path, args.rows, args.stories, args.components)
+        print(f"Generated {args.rows:,} rows ({args.stories:,} stories, {args.components:,} components)\n")
+
+        slow, slow_s = _timed(lambda: CopadoCSVParser(vectorized=False).parse_file(path))
+        fast, fast_s = _timed(lambda: CopadoCSVParser(vectorized=True).parse_file(path))
+        assert fast == slow, "CopadoCSVParser: vectorized result differs from row-by-row"
+        print(f"CopadoCSVParser         iterrows {slow_s:7.2f}s   vectorized {fast_s:7.2f}s   "
+              f"x{slow_s / fast_s:.1f}")
+
+        slow, slow_s = _timed(lambda: parse_production_state(path, vectorized=False))
+        fast, fast_s = _timed(lambda: parse_production_state(path, vectorized=True))
+        assert fast == slow, "parse_production_state: vectorized result differs from row-by-row"
+        print(f"parse_production_state  iterrows {slow_s:7.2f}s   vectorized {fast_s:7.2f}s   "
+              f"x{slow_s / fast_s:.1f}")
+
+
+if __name__ == '__main__':
+    main()
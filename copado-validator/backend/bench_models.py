@@ -0,0 +1,102 @@
+# bench_models.py
+"""
+Memory benchmark: bytes per Component / UserStory, before and after slots + interning.
+
+"Before" is a plain (dict-backed) dataclass with the same fields and no
+interning. Strings are built per row, as a CSV parser produces them, so
+repeated names are separate objects unless interned.
+
+Usage:
+    python bench_models.py                  # 200k components
+    python bench_models.py --components 500000 --stories 20000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import MISSING, field, fields, make_dataclass
+from datetime import datetime, timedelta
+
+import models
+from models import Component, UserStory, MetadataType, ConflictStatus
+
+
+def _plain(cls):
+    """Dict-backed, non-interning copy of a slotted model dataclass"""
+    spec = []
+    for f in fields(cls):
+        if f.default_factory is not MISSING:
+            spec.append((f.name, f.type, field(default_factory=f.default_factory)))
+        else:
+            spec.append((f.name, f.type, field(default=f.default)))
+    return make_dataclass(f"Plain{cls.__name__}", spec)
+
+
+PlainComponent = _plain(Component)
+PlainUserStory = _plain(UserStory)
+
+
+def build(component_cls, story_cls, n_components: int, n_stories: int, n_names: int, seed: int = 11):
+    rnd = random.Random(seed)
+    types = list(MetadataType)
+    base = datetime(2024, 1, 1)
+    stories = {}
+    for _ in range(n_components):
+        s = rnd.randrange(n_stories)
+        name = rnd.randrange(n_names)
+        # f-strings give a fresh str object per row, like parsed CSV cells
+        story_id = f"US-{s:07d}"
+        story = stories.get(story_id)
+        if story is None:
+            story = stories[story_id] = story_cls(
+                id=story_id, title=f"Story {s}", project=f"Project {s % 5}",
+                environment=f"Env {s % 3}", developer=f"Dev {s % 40}", components=[])
+        ctype = types[name % len(types)]
+        story.components.append(component_cls(
+            api_name=f"{ctype.value}.Component{name}",
+            type=ctype,
+            status=ConflictStatus.POTENTIAL_CONFLICT,
+            user_story_id=f"US-{s:07d}",
+            unique_id=f"{ctype.value};Component{name}",
+            last_commit_date=base + timedelta(minutes=name),
+            created_by=f"User {s % 25}",
+            commit_hash=None,
+        ))
+    return list(stories.values())
+
+
+def measure(component_cls, story_cls, args) -> int:
+    gc.collect()
+    tracemalloc.start()
+    stories = build(component_cls, story_cls, args.components, args.stories, args.names)
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del stories
+    return used
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--components', type=int, default=200_000)
+    parser.add_argument('--stories', type=int, default=5_000)
+    parser.add_argument('--names', type=int, default=20_000, help="distinct component names")
+    args = parser.parse_args()
+
+    before = measure(PlainComponent, PlainUserStory, args)
+
+    models._INTERN_STRINGS = False
+    slots_only = measure(Component, UserStory, args)
+    models._INTERN_STRINGS = True
+    after = measure(Component, UserStory, args)
+
+    n = args.components
+    print(f"{n:,} components in {args.stories:,} stories ({args.names:,} distinct names), incl. strings/dates\n")
+    print(f"  plain dataclass      {before / n:8.1f} bytes/component   ({before / 2**20:7.1f} MiB)")
+    print(f"  slots                {slots_only / n:8.1f} bytes/component   ({slots_only / 2**20:7.1f} MiB)")
+    print(f"  slots + interning    {after / n:8.1f} bytes/component   ({after / 2**20:7.1f} MiB)   "
+          f"-{100 * (1 - after / before):.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# bench_story_analyzer.py
+"""
+Benchmark: StoryAnalyzerTransformer with the story -> components index vs
+the old per-story scan over every component (plus deepcopy per component).
+
+Generates synthetic User_Story_Metadata rows, runs both transformers,
+checks the results match (ignoring the analyzed_at timestamp) and prints
+the timings.
+
+Usage:
+    python bench_story_analyzer.py                  # 5k stories
+    python bench_story_analyzer.py --stories 2000 --rows-per-story 8
+"""
+import argparse
+import copy
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from story_analyzer import StoryAnalyzerTransformer
+
+
+class LegacyStoryAnalyzerTransformer(StoryAnalyzerTransformer):
+    """Previous behaviour: O(S x C) scans and deep copies"""
+
+    def _story_components(self, story_id: str) -> List[Dict]:
+        return [c for c in self.components.values() if c["story_id"] == story_id]
+
+    @staticmethod
+    def _copy_component(comp: Dict) -> Dict:
+        return copy.deepcopy(comp)
+
+
+def generate_records(stories: int, rows_per_story: int, components: int, seed: int = 5) -> List[Dict]:
+    rnd = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    records = []
+    for s in range(stories):
+        for _ in range(rnd.randint(1, rows_per_story * 2 - 1)):
+            name = rnd.randrange(components)
+            story_date = base + timedelta(hours=rnd.randrange(10_000))
+            prod_date = story_date + timedelta(hours=rnd.randrange(-200, 50))
+            records.append({
+                "copado__User_Story__r.Name": f"US-{s:07d}",
+                "copado__User_Story__r.copado__User_Story_Title__c": f"Story {s}",
+                "jira_key": f"JIRA-{s}",
+                "developer": f"Dev {s % 40}",
+                "copado__Metadata_API_Name__c": f"Component{name}",
+                "copado__Type__c": rnd.choice(["ApexClass", "Flow", "DataRaptor"]),
+                "copado__Status__c": "Potential Conflict",
+                "copado__Action__c": "Add",
+                "commit_hash": f"{rnd.getrandbits(160):040x}",
+                "copado__Last_Commit_Date__c": story_date.isoformat(),
+                "production_commit_date": prod_date.isoformat() if rnd.random() < 0.3 else None,
+            })
+    return records
+
+
+def run(cls, records: List[Dict]):
+    transformer = cls()
+    start = time.perf_counter()
+    result = transformer.transform(records)
+    elapsed = time.perf_counter() - start
+    result["summary"].pop("analyzed_at", None)
+    return result, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stories', type=int, default=5_000)
+    parser.add_argument('--rows-per-story', type=int, default=4)
+    parser.add_argument('--components', type=int, default=15_000)
+    args = parser.parse_args()
+
+    # The transformer logs per story at INFO; keep that out of the timings
+    logging.disable(logging.INFO)
+
+    records = generate_records(args.stories, args.rows_per_story, args.components)
+    print(f"{len(records):,} metadata rows, {args.stories:,} stories\n")
+
+    fast, fast_s = run(StoryAnalyzerTransformer, records)
+    slow, slow_s = run(LegacyStoryAnalyzerTransformer, records)
+    assert fast["blocked"] and fast["conflicts"] and fast["safe"], "a story group came back empty"
+    assert fast == slow, "indexed result differs from the per-story scan"
+    print(f"blocked {len(fast['blocked']):,}, conflicts {len(fast['conflicts']):,}, safe {len(fast['safe']):,}\n")
+    print(f"StoryAnalyzerTransformer.transform   scan {slow_s:7.2f}s   indexed {fast_s:7.2f}s   "
+          f"x{slow_s / fast_s:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# bitbucket_http.py
+"""
+Shared HTTP plumbing for Bitbucket clients.
+
+- One pooled, retrying requests.Session per token for the whole process, so
+  the BitBucketClient built for each request reuses warm TCP/TLS connections.
+- BitbucketRateLimiter: caps in-flight requests and backs every caller off
+  together when Bitbucket signals pressure (429 / Retry-After,
+  X-RateLimit-NearLimit, X-RateLimit-Remaining + X-RateLimit-Reset).
+  429s are retried here, after the shared pause, not inside urllib3's Retry,
+  so the limiter sees every one of them.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import get_config
+
+log = logging.getLogger(__name__)
+
+# Pause applied when Bitbucket says we're close to the limit but gives no reset time
+_NEAR_LIMIT_PAUSE = 0.25
+# Pause on 429 without Retry-After
+_DEFAULT_RETRY_AFTER = 5.0
+# Times a 429'd request is re-sent (after the limiter's pause)
+_MAX_429_RETRIES = 3
+
+
+class BitbucketRateLimiter:
+    """Concurrency cap plus a shared 'don't send before' time driven by response headers"""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+
+    # ---- sync side ----
+
+    def acquire(self) -> None:
+        delay = self.delay()
+        if delay > 0:
+            time.sleep(delay)
+        self._slots.acquire()
+
+    def release(self) -> None:
+        self._slots.release()
+
+    # ---- backoff ----
+
+    def delay(self) -> float:
+        """Seconds to wait before sending the next request"""
+        return max(0.0, self._pause_until - time.time())
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update the shared backoff from a response"""
+        pause = 0.0
+        if status_code == 429:
+            pause = _parse_float(headers.get("Retry-After"), _DEFAULT_RETRY_AFTER)
+            log.warning(f"⏳ Bitbucket rate limited (429); pausing {pause:.1f}s")
+        else:
+            remaining = _parse_float(headers.get("X-RateLimit-Remaining"), None)
+            reset = _parse_float(headers.get("X-RateLimit-Reset"), None)
+            if remaining is not None and reset is not None and remaining < self.max_concurrency * 2:
+                # Spread what's left of the window across the remaining budget
+                window = reset - time.time() if reset > 1e9 else reset
+                pause = max(0.0, window) / max(remaining, 1.0)
+            elif str(headers.get("X-RateLimit-NearLimit", "")).lower() == "true":
+                pause = _NEAR_LIMIT_PAUSE
+
+        if pause > 0:
+            with self._lock:
+                self._pause_until = max(self._pause_until, time.time() + pause)
+
+
+def _parse_float(value: Optional[str], default: Optional[float]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimitedSession(requests.Session):
+    """requests.Session whose every request goes through a BitbucketRateLimiter"""
+
+    def __init__(self, limiter: BitbucketRateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def request(self, method, url, *args, **kwargs):
+        for attempt in range(_MAX_429_RETRIES + 1):
+            # acquire() waits out any pause a previous 429 set for everyone
+            self.limiter.acquire()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            finally:
+                self.limiter.release()
+            self.limiter.observe(response.status_code, response.headers)
+            if response.status_code != 429 or attempt == _MAX_429_RETRIES:
+                return response
+            response.close()
+        return response
+
+
+_limiter: Optional[BitbucketRateLimiter] = None
+_sessions: Dict[Optional[str], RateLimitedSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_rate_limiter() -> BitbucketRateLimiter:
+    global _limiter
+    if _limiter is None:
+        with _sessions_lock:
+            if _limiter is None:
+                _limiter = BitbucketRateLimiter(get_config().BITBUCKET_MAX_CONCURRENCY)
+    return _limiter
+
+
+def get_shared_session(token: Optional[str]) -> RateLimitedSession:
+    """Process-wide pooled session for a token (created on first use)"""
+    session = _sessions.get(token)
+    if session is not None:
+        return session
+
+    limiter = get_rate_limiter()
+    with _sessions_lock:
+        session = _sessions.get(token)
+        if session is None:
+            cfg = get_config()
+            pool_max = int(cfg.BITBUCKET_POOL_MAXSIZE)
+            session = RateLimitedSession(limiter)
+            retry = Retry(
+                total=3, connect=3, read=3,
+                backoff_factor=0.3,
+                # 429 is left to RateLimitedSession so the shared limiter backs off
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "POST"}),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=pool_max, pool_maxsize=pool_max, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            headers = {"Accept": "application/json"}
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+            session.headers.update(headers)
+            _sessions[token] = session
+    return session
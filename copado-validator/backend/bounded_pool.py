@@ -0,0 +1,86 @@
+# bounded_pool.py
+"""
+Bounded, ordered fan-out shared by the bulk proof and the component endpoints.
+
+map_bounded runs fn over items on a fixed-size thread pool and returns the
+results in input order. Items that raise or overrun their timeout get a
+fallback result instead, so one bad item never fails the whole batch.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+def map_bounded(fn: Callable[[Any], Any], items: List[Any],
+                fallback: Callable[[Any, Exception], Any],
+                max_workers: int,
+                timeout: Optional[float] = None,
+                on_result: Optional[Callable[[int, Any], None]] = None,
+                keep_results: bool = True,
+                describe: Callable[[Any], str] = repr,
+                thread_name_prefix: str = "bounded") -> List[Any]:
+    """
+    fn(item) for every item on at most max_workers threads, results in input order.
+
+    An item that raises, or runs longer than timeout seconds (counted from
+    when it starts, not when it is queued; None/0 = no limit), gets
+    fallback(item, error) instead. An overrunning worker can't be
+    interrupted; it finishes in the background and its result is discarded.
+    on_result(index, result) is called on this thread as each item settles.
+    keep_results=False drops each result once on_result has seen it and
+    returns [].
+    """
+    if not items:
+        return []
+
+    workers = max(1, min(int(max_workers), len(items)))
+    results: List[Any] = [None] * len(items)
+    started: Dict[int, float] = {}
+
+    def settle(index: int, result: Any) -> None:
+        if keep_results:
+            results[index] = result
+        if on_result:
+            try:
+                on_result(index, result)
+            except Exception as e:
+                log.warning(f"⚠️ on_result callback failed for {describe(items[index])}: {e}")
+
+    def run(index: int) -> Any:
+        started[index] = time.monotonic()
+        return fn(items[index])
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix)
+    try:
+        futures = {executor.submit(run, i): i for i in range(len(items))}
+        pending = set(futures)
+
+        while pending:
+            done, pending = wait(pending, timeout=0.5 if timeout else None,
+                                 return_when=FIRST_COMPLETED)
+
+            for future in done:
+                i = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    log.warning(f"⚠️ {describe(items[i])} failed: {e}")
+                    result = fallback(items[i], e)
+                settle(i, result)
+
+            if timeout:
+                now = time.monotonic()
+                for future in list(pending):
+                    i = futures[future]
+                    if i in started and now - started[i] > timeout:
+                        pending.discard(future)
+                        log.error(f"⏱️ {describe(items[i])} timed out after {timeout}s")
+                        settle(i, fallback(items[i], TimeoutError(f"timed out after {timeout}s")))
+    finally:
+        # Don't block the caller on timed-out items still running
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results if keep_results else []
@@ -0,0 +1,86 @@
+# check_import_time.py
+"""
+Import-time budget for app.py.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter and fails
+(exit code 1) if:
+  - a heavy module that should only load inside its endpoint was imported
+    (pandas, numpy, reportlab, simple_salesforce), or
+  - importing app took longer than the budget.
+
+Usage:
+    python check_import_time.py                 # default budget
+    IMPORT_BUDGET_MS=800 python check_import_time.py
+    python check_import_time.py --top 25        # show the 25 slowest imports
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Must not be imported by `import app`; they load lazily in the endpoints
+LAZY_MODULES = ('pandas', 'numpy', 'reportlab', 'simple_salesforce')
+DEFAULT_BUDGET_MS = 1500
+
+
+def profile_import(module: str = 'app') -> List[Tuple[str, int, int]]:
+    """[(module, self_us, cumulative_us)] as reported by -X importtime"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=here, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        tail = '\n'.join(proc.stderr.strip().splitlines()[-15:])
+        raise RuntimeError(f"`import {module}` failed:\n{tail}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def check(rows: List[Tuple[str, int, int]], module: str, budget_ms: int) -> List[str]:
+    """Budget violations (empty = pass)"""
+    problems = []
+    cumulative: Dict[str, int] = {name: cum for name, _, cum in rows}
+
+    for name in LAZY_MODULES:
+        if name in cumulative:
+            problems.append(f"{name} is imported at startup (should load inside its endpoint)")
+
+    total_ms = cumulative.get(module, 0) // 1000
+    if total_ms > budget_ms:
+        problems.append(f"import {module} took {total_ms}ms (budget {budget_ms}ms)")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--budget-ms', type=int,
+                        default=int(os.getenv('IMPORT_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    rows = profile_import(args.module)
+    print(f"Slowest imports (cumulative) for `import {args.module}`:")
+    for name, _, cum in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cum / 1000:8.1f}ms  {name}")
+
+    problems = check(rows, args.module, args.budget_ms)
+    if problems:
+        print("\n❌ Import-time budget exceeded:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print(f"\n✅ Within budget ({args.budget_ms}ms, no eager {', '.join(LAZY_MODULES)})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
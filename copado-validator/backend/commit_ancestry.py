@@ -0,0 +1,165 @@
+# commit_ancestry.py
+"""
+Commit ancestry answered from a cached commit graph.
+
+BitBucketClient._is_commit_ancestor used to walk parents breadth-first with
+one GET /commit/{sha} per node and gave up after 50 nodes, so long histories
+came back as "SEPARATE". Here commit -> parents edges are pulled 100 at a time
+from /commits/{revision} (which lists a revision and its history), kept in
+memory and in the shared SQLite cache (edges never change), and each
+descendant is walked once for all the ancestors asked about it.
+
+Walks are not pruned by commit date: Bitbucket's date is the author date,
+which rebases and cherry-picks carry over, so an "old" commit can sit above
+a newer target. MAX_HISTORY_PAGES bounds the cost instead.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+# Safety cap on history pages fetched per query
+MAX_HISTORY_PAGES = 200
+_PAGE_FIELDS = "values.hash,values.date,values.parents.hash,next"
+
+
+class CommitAncestryOracle:
+    """Is-ancestor queries over one repository, shared graph cache per client"""
+
+    def __init__(self, client):
+        self.client = client
+        self.cache = getattr(client, "file_cache", None)
+        self.repo = getattr(client, "repo_key", f"{client.workspace}/{client.repo}")
+        self._graph: Dict[str, Tuple[List[str], Optional[str]]] = {}
+        self._full: Dict[str, str] = {}   # short/ref -> full hash
+        self._pages_fetched = 0
+
+    # ------------------------------------------------------------------
+    # Graph loading
+    # ------------------------------------------------------------------
+
+    def _remember(self, commits: Dict[str, Tuple[List[str], Optional[str]]]) -> None:
+        new = {sha: v for sha, v in commits.items() if sha not in self._graph}
+        self._graph.update(new)
+        if new and self.cache:
+            self.cache.put_commits(self.repo, new)
+
+    def _load_cached(self, shas: Iterable[str]) -> None:
+        missing = [s for s in shas if s not in self._graph]
+        if missing and self.cache:
+            self._graph.update(self.cache.get_commits(self.repo, missing))
+
+    def _fetch_history(self, revision: str, max_pages: int = 1) -> Optional[str]:
+        """
+        Pull up to max_pages of /commits/{revision} into the graph.
+        Returns the full hash of revision itself (first entry), or None on failure.
+        """
+        url = f"{self.client.base_url}/commits/{revision}"
+        params = {"pagelen": 100, "fields": _PAGE_FIELDS}
+        first_hash = None
+        pages = 0
+        try:
+            while url and pages < max_pages:
+                resp = self.client.session.get(url, params=params, timeout=self.client.timeout)
+                if resp.status_code != 200:
+                    log.warning(f"commit history {revision} -> {resp.status_code}")
+                    break
+                data = resp.json() or {}
+                page = {}
+                for c in data.get("values", []) or []:
+                    sha = c.get("hash")
+                    if not sha:
+                        continue
+                    first_hash = first_hash or sha
+                    page[sha] = ([p.get("hash") for p in c.get("parents", []) or [] if p.get("hash")], c.get("date"))
+                self._remember(page)
+                pages += 1
+                self._pages_fetched += 1
+                url = data.get("next")
+                params = None  # 'next' already includes query params
+        except Exception as e:
+            log.error(f"commit history error for {revision}: {e}")
+        return first_hash
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """Full hash for a full/short SHA (or ref), loading its node into the graph"""
+        if ref in self._full:
+            return self._full[ref]
+        if len(ref) == 40:
+            self._load_cached([ref])
+        full = ref if ref in self._graph else self._fetch_history(ref, max_pages=1)
+        if full:
+            self._full[ref] = full
+        return full
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        return self.is_ancestor_many([(ancestor, descendant)])[(ancestor, descendant)]
+
+    def is_ancestor_many(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], bool]:
+        """{(ancestor, descendant): bool} for every pair; one walk per distinct descendant"""
+        pairs = list(dict.fromkeys(pairs))
+        results: Dict[Tuple[str, str], bool] = {}
+
+        mirror = getattr(self.client, "mirror", None)
+        by_descendant: Dict[str, List[str]] = defaultdict(list)
+        for ancestor, descendant in pairs:
+            if ancestor == descendant:
+                results[(ancestor, descendant)] = True
+                continue
+            if mirror:
+                answer = self.client._from_mirror(mirror.is_ancestor, ancestor, descendant)
+                if answer is not None:
+                    results[(ancestor, descendant)] = answer
+                    continue
+            by_descendant[descendant].append(ancestor)
+
+        for descendant, ancestors in by_descendant.items():
+            found = self._walk(descendant, ancestors)
+            for ancestor in ancestors:
+                results[(ancestor, descendant)] = ancestor in found
+
+        return {pair: results[pair] for pair in pairs}
+
+    def _walk(self, descendant: str, ancestors: List[str]) -> Set[str]:
+        """Which of ancestors (as given) are reachable from descendant"""
+        start = self.resolve(descendant)
+        if not start:
+            return set()
+
+        targets: Dict[str, str] = {}   # full hash -> ref as given
+        for ref in ancestors:
+            full = self.resolve(ref)
+            if full:
+                targets[full] = ref
+        if not targets:
+            return set()
+
+        found: Set[str] = set()
+        visited: Set[str] = set()
+        frontier = [start]
+        pages_at_start = self._pages_fetched
+
+        while frontier and len(found) < len(targets):
+            frontier = [sha for sha in frontier if sha not in visited]
+            visited.update(frontier)
+            self._load_cached(frontier)
+
+            next_frontier = []
+            for sha in frontier:
+                if sha in targets:
+                    found.add(targets[sha])
+                if sha not in self._graph:
+                    if self._pages_fetched - pages_at_start >= MAX_HISTORY_PAGES:
+                        log.warning(f"⚠️ Ancestry walk from {descendant[:8]} hit {MAX_HISTORY_PAGES} pages; stopping")
+                        return found
+                    # Pulls this commit and ~99 of its ancestors in one request
+                    self._fetch_history(sha, max_pages=1)
+                next_frontier.extend(self._graph.get(sha, ([], None))[0])
+            frontier = next_frontier
+
+        return found
@@ -0,0 +1,179 @@
+# commit_metadata.py
+"""
+Per-commit Bitbucket payloads shared by the proof validators.
+
+commit_exists, component_timestamp and commit_contents all need
+GET /commit/{sha}; files_in_commit and commit_contents both need
+/diffstat/{sha}. CommitMetadataProvider fetches each payload once per SHA:
+
+- concurrent callers asking for the same payload wait on a single request
+  (single-flight), so parallel stories on one commit share it
+- successful payloads are memoized in-process (LRU) and, for full SHAs, in
+  the shared SQLite file cache - a commit's metadata never changes
+- non-200 responses are returned to the caller but not remembered
+
+Payload methods return (status_code, data) so validators keep their
+HTTP-status handling.
+"""
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from file_cache import get_file_cache
+
+log = logging.getLogger(__name__)
+
+# In-process entries kept per repository
+MEMO_SIZE = 1024
+
+
+class _CommitMemo:
+    """LRU of finished payloads plus the in-flight fetches, for one repository"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self.inflight: Dict[Hashable, Future] = {}
+        self.lock = threading.Lock()
+
+
+_memos: Dict[str, _CommitMemo] = {}
+_memos_lock = threading.Lock()
+
+
+def _memo_for(repo: str) -> _CommitMemo:
+    with _memos_lock:
+        memo = _memos.get(repo)
+        if memo is None:
+            memo = _memos[repo] = _CommitMemo(MEMO_SIZE)
+        return memo
+
+
+class CommitMetadataProvider:
+    """Memoized, single-flight commit/diffstat/diff lookups for one repository"""
+
+    def __init__(self, client, http_get: Optional[Callable] = None):
+        self.client = client
+        self.base_url = client.base_url
+        self.repo = getattr(client, "repo_key", f"{client.workspace}/{client.repo}")
+        self.cache = getattr(client, "file_cache", None) or get_file_cache()
+        # Lets the prover route requests through its Bitbucket concurrency slots
+        self._http_get = http_get or client.session.get
+        self._memo = _memo_for(self.repo)
+
+    # ------------------------------------------------------------------
+    # Payloads
+    # ------------------------------------------------------------------
+
+    def commit(self, commit_sha: str, timeout: float = 5) -> Tuple[int, Optional[Dict]]:
+        """GET /commit/{sha} -> (status_code, json)"""
+        return self._single_flight(
+            commit_sha, "commit",
+            lambda: self._fetch_json(f"{self.base_url}/commit/{commit_sha}", timeout),
+        )
+
+    def diffstat(self, commit_sha: str, timeout: float = 5) -> Tuple[int, Optional[Dict]]:
+        """GET /diffstat/{sha} -> (status_code, json with every page merged into 'values')"""
+        return self._single_flight(
+            commit_sha, "diffstat",
+            lambda: self._fetch_diffstat(commit_sha, timeout),
+        )
+
+    def diff(self, commit_sha: str, exclude_patterns: List[str], max_lines: int,
+             max_bytes: int, timeout: float = 10) -> Tuple[int, Optional[Dict[str, Dict]]]:
+        """Parsed /diff/{sha} (see diff_stream) for one set of display limits"""
+        options = json.dumps([sorted(exclude_patterns), max_lines, max_bytes])
+        return self._single_flight(
+            commit_sha, f"diff:{options}",
+            lambda: self._fetch_diff(commit_sha, exclude_patterns, max_lines, max_bytes, timeout),
+        )
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def _fetch_json(self, url: str, timeout: float) -> Tuple[int, Optional[Dict]]:
+        response = self._http_get(url, timeout=timeout)
+        if response.status_code != 200:
+            return response.status_code, None
+        return 200, response.json()
+
+    def _fetch_diffstat(self, commit_sha: str, timeout: float) -> Tuple[int, Optional[Dict]]:
+        url = f"{self.base_url}/diffstat/{commit_sha}"
+        values: List[Dict] = []
+        first: Optional[Dict] = None
+        while url:
+            status, data = self._fetch_json(url, timeout)
+            if status != 200:
+                if first is None:
+                    return status, None
+                log.warning(f"      diffstat {commit_sha[:8]} stopped at a later page (HTTP {status})")
+                break
+            first = first or data
+            values.extend(data.get('values', []) or [])
+            url = data.get('next')
+        merged = {k: v for k, v in (first or {}).items() if k not in ('next', 'page')}
+        merged['values'] = values
+        merged['size'] = len(values)
+        return 200, merged
+
+    def _fetch_diff(self, commit_sha: str, exclude_patterns: List[str], max_lines: int,
+                    max_bytes: int, timeout: float) -> Tuple[int, Optional[Dict[str, Dict]]]:
+        from diff_stream import parse_diff_response
+
+        response = self._http_get(f"{self.base_url}/diff/{commit_sha}", timeout=timeout, stream=True)
+        if response.status_code != 200:
+            response.close()
+            return response.status_code, None
+        return 200, parse_diff_response(response, exclude_patterns, max_lines, max_bytes=max_bytes)
+
+    def _single_flight(self, commit_sha: str, kind: str,
+                       fetch: Callable[[], Tuple[int, Any]]) -> Tuple[int, Any]:
+        key = (commit_sha, kind)
+        memo = self._memo
+        with memo.lock:
+            if key in memo.entries:
+                memo.entries.move_to_end(key)
+                return memo.entries[key]
+            pending = memo.inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = memo.inflight[key] = Future()
+
+        if not leader:
+            return pending.result()
+
+        try:
+            result = self._load_persisted(commit_sha, kind)
+            if result is None:
+                result = fetch()
+                if result[0] == 200:
+                    self._persist(commit_sha, kind, result[1])
+            if result[0] == 200:
+                with memo.lock:
+                    memo.entries[key] = result
+                    while len(memo.entries) > memo.size:
+                        memo.entries.popitem(last=False)
+            pending.set_result(result)
+            return result
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with memo.lock:
+                memo.inflight.pop(key, None)
+
+    # Short SHAs could become ambiguous later, so only full ones are persisted
+
+    def _load_persisted(self, commit_sha: str, kind: str) -> Optional[Tuple[int, Any]]:
+        if not self.cache or len(commit_sha) != 40:
+            return None
+        payload = self.cache.get_commit_payload(self.repo, commit_sha, kind)
+        return (200, payload) if payload is not None else None
+
+    def _persist(self, commit_sha: str, kind: str, payload: Any) -> None:
+        if self.cache and len(commit_sha) == 40:
+            self.cache.put_commit_payload(self.repo, commit_sha, kind, payload)
@@ -0,0 +1,355 @@
+# component_state.py
+"""
+Component state services behind /api/production-state, /api/get-code-diff
+and /api/compare-orgs.
+
+Plain functions returning Python objects; the Flask routes in app.py are thin
+wrappers. Callers doing several lookups pass one BitBucketClient so its
+per-instance caches (folders, file contents, commits) are shared.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import component_registry as cr
+from bounded_pool import map_bounded
+from config import get_config
+from git_client import BitBucketClient
+
+log = logging.getLogger(__name__)
+
+# Used when the registry can't be read
+DEFAULT_BUNDLE_TYPES = frozenset({
+    "OmniScript", "IntegrationProcedure", "DataRaptor",
+    "CalculationMatrix", "CalculationMatrixVersion", "Catalog",
+    "PriceList", "AttributeCategory", "Product2",
+    "OrchestrationItemDefinition", "OrchestrationDependencyDefinition"
+})
+
+
+def strip_type_prefix(ctype: str, cname: str) -> str:
+    """Normalize 'Type.Name' → 'Name' when prefix matches the type."""
+    if not ctype or not cname:
+        return cname
+    prefix = f"{ctype}."
+
+    return cname[len(prefix):] if cname.startswith(prefix) else cname
+
+
+def bundle_types() -> frozenset:
+    """Types the registry marks as bundles (kind == 'bundle')"""
+    try:
+        types = set()
+        for tname, tinfo in (cr.TYPE_MAP if hasattr(cr, "TYPE_MAP") else cr.types()).items():
+            if isinstance(tinfo, dict) and tinfo.get("kind") == "bundle":
+                types.add(tname)
+        return frozenset(types)
+    except Exception:
+        return DEFAULT_BUNDLE_TYPES
+
+
+def pick_primary_file_for_bundle(gclient: BitBucketClient, branch: str, folder: str, ctype: str, cname: str) -> Optional[str]:
+    """
+    Pick a representative file from a bundle folder:
+      1) If registry defines primary_glob (e.g. '{name}/{name}_DataPack.json'), use '<folder>/<tail>'
+      2) Else prefer '*_DataPack.json' in the folder
+      3) Else prefer any '.json'
+      4) Else first file
+    """
+    ti = cr.get_type_info(ctype) or {}
+    primary_glob = ti.get("primary_glob")
+    if primary_glob:
+        # Glob may contain a subfolder "{name}/..."; keep only filename tail to safely join.
+        tail = primary_glob.replace("{name}", cname).split("/", 1)[-1]
+        return f"{folder.rstrip('/')}/{tail}"
+
+    files = gclient.list_folder_files(folder, branch=branch) or []
+    if not files:
+        return None
+    # Prefer datapacks
+    for p in files:
+        if isinstance(p, str) and p.lower().endswith("_datapack.json"):
+            return p
+    # Then any json
+    for p in files:
+        if isinstance(p, str) and p.lower().endswith(".json"):
+            return p
+    # Fallback: first string path
+    for p in files:
+        if isinstance(p, str):
+            return p
+    return None
+
+
+def _as_folder(folder_any) -> Optional[str]:
+    """resolve_vlocity_bundle may return str/tuple/dict"""
+    if isinstance(folder_any, str):
+        return folder_any
+    if isinstance(folder_any, (list, tuple)):
+        return next((v for v in folder_any if isinstance(v, str)), None)
+    if isinstance(folder_any, dict):
+        return folder_any.get("folder") or folder_any.get("path") or folder_any.get("dir")
+    return None
+
+
+def _state_row(cname_raw: str, ctype: str, exists: bool, file_path: Optional[str],
+               file_size: int, last_commit: Optional[Dict]) -> Dict:
+    last_commit = last_commit or {}
+    return {
+        "component_name": cname_raw,                  # keep user's original naming
+        "component_type": ctype,
+        "exists_in_prod": exists,
+        "file_path": file_path,
+        "file_size": file_size,
+        "last_author": last_commit.get("author"),
+        "last_commit_date": last_commit.get("date"),
+        "last_commit_hash": last_commit.get("hash") or last_commit.get("short_hash") or None,
+        "last_commit_message": last_commit.get("message")
+    }
+
+
+def component_state(gclient: BitBucketClient, branch: str, component: Dict,
+                    bundles: frozenset = DEFAULT_BUNDLE_TYPES) -> Dict:
+    """
+    One production_state row for component on branch.
+    Never raises; returns a soft-error row on exceptions.
+    """
+    try:
+        ctype = (component.get('type') or component.get('component_type') or '').strip()
+        cname_raw = (component.get('name') or component.get('component_name') or '').strip()
+        if not ctype or not cname_raw:
+            raise ValueError(f"bad component entry: {component!r}")
+
+        # Keep original name in response; normalize for lookup
+        cname_norm = strip_type_prefix(ctype, cname_raw)
+
+        # --- Bundle path resolution ---
+        if ctype in bundles:
+            folder = _as_folder(gclient.resolve_vlocity_bundle(
+                branch=branch,
+                component_type=ctype,
+                component_name=cname_norm
+            ))
+            file_path = None
+            last_commit = None
+
+            if folder:
+                primary = pick_primary_file_for_bundle(gclient, branch, folder, ctype, cname_norm)
+                file_path = primary or folder  # prefer file; fallback to folder string
+
+                # Get last commit from primary file (fast)
+                if primary:
+                    commits = gclient.get_file_commits(primary, branch=branch, limit=1) or []
+                    last_commit = commits[0] if commits else None
+
+            # file_size unknown for folders; 0 unless we fetch
+            return _state_row(cname_raw, ctype, bool(folder), file_path, 0, last_commit)
+
+        # --- Single-file types ---
+        content, file_path = gclient.get_file_content_smart(
+            component_name=cname_norm,
+            component_type=ctype,
+            branch=branch
+        )
+        last_commit = None
+        if file_path:
+            commits = gclient.get_file_commits(file_path, branch=branch, limit=1) or []
+            last_commit = commits[0] if commits else None
+
+        return _state_row(cname_raw, ctype, content is not None, file_path,
+                          len(content) if content else 0, last_commit)
+
+    except Exception as e:
+        # Soft-fail row; never break the whole request
+        return _error_row(component, e)
+
+
+def _error_row(component: Dict, error: Exception) -> Dict:
+    row = _state_row(component.get('name') or component.get('component_name') or '',
+                     component.get('type') or component.get('component_type') or '',
+                     False, None, 0, None)
+    row["last_commit_message"] = f"error: {error}"
+    return row
+
+
+def map_components(fn: Callable[[Any], Any], items: List[Any],
+                   fallback: Callable[[Any, Exception], Any],
+                   max_workers: Optional[int] = None,
+                   timeout: Optional[float] = None) -> List[Any]:
+    """
+    map_bounded with the API defaults: API_MAX_WORKERS threads and an
+    API_COMPONENT_TIMEOUT per item (0 = no limit). Results are in input order;
+    items that raise or time out get fallback(item, error).
+    Callers share one BitBucketClient across items so its caches are shared.
+    """
+    cfg = get_config()
+    return map_bounded(
+        fn, items, fallback,
+        max_workers=max_workers or cfg.API_MAX_WORKERS,
+        timeout=cfg.API_COMPONENT_TIMEOUT if timeout is None else timeout,
+        describe=lambda item: f"Component {item!r}",
+        thread_name_prefix="component"
+    )
+
+
+def production_states(branches: List[str], components: List[Dict],
+                      gclient: Optional[BitBucketClient] = None,
+                      max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    production_state for several branches at once.
+
+    Every (branch, component) lookup runs on one bounded pool (map_components)
+    with one client, so branches are computed concurrently and share that
+    client's caches.
+    Returns one production_state dict per branch, in the order given.
+    """
+    if not isinstance(components, list) or not components:
+        raise ValueError("components list is required")
+
+    gclient = gclient or BitBucketClient(log)
+    bundles = bundle_types()
+
+    pairs = [(branch, comp) for branch in branches for comp in components]
+    rows = map_components(
+        lambda pair: component_state(gclient, pair[0], pair[1], bundles),
+        pairs,
+        fallback=lambda pair, e: _error_row(pair[1], e),
+        max_workers=max_workers
+    )
+    n = len(components)
+    all_rows = [rows[i * n:(i + 1) * n] for i in range(len(branches))]
+
+    states = []
+    for branch, branch_rows in zip(branches, all_rows):
+        existing = sum(1 for r in branch_rows if r.get("exists_in_prod"))
+        states.append({
+            "success": True,
+            "branch": branch,
+            "checked_at": datetime.utcnow().isoformat(),
+            "total_components": len(branch_rows),
+            "existing": existing,
+            "missing": len(branch_rows) - existing,
+            "production_state": branch_rows
+        })
+    return states
+
+
+def production_state(branch: str, components: List[Dict],
+                     gclient: Optional[BitBucketClient] = None,
+                     max_workers: Optional[int] = None) -> Dict:
+    """The /api/production-state response for one branch"""
+    return production_states([branch], components, gclient=gclient, max_workers=max_workers)[0]
+
+
+def component_paths(gclient: BitBucketClient, component: Dict,
+                    bundles: frozenset = DEFAULT_BUNDLE_TYPES) -> Tuple[List[str], List[str]]:
+    """
+    (file paths, folder prefixes) the component can live at, from the registry
+    and the client's path guesses, without touching the repo. Bundles are
+    folders; single-file types whose file sits in a per-component folder
+    (lwc/aura) also get that folder. Both empty when the type is unknown.
+    """
+    ctype = (component.get('type') or component.get('component_type') or '').strip()
+    cname = strip_type_prefix(ctype, (component.get('name') or component.get('component_name') or '').strip())
+    if not ctype or not cname:
+        return [], []
+
+    if ctype in bundles:
+        return [], [f"{f.rstrip('/')}/" for f in cr.vlocity_bundle_folder_candidates(ctype, cname)]
+
+    paths = list(gclient.get_possible_paths(cname, ctype) or [])
+    folders = []
+    for path in paths:
+        parent = path.rsplit('/', 1)[0] if '/' in path else ''
+        if parent and parent.rsplit('/', 1)[-1] == cname:
+            folders.append(f"{parent}/")
+    return paths, folders
+
+
+def _touched(paths: List[str], folders: List[str], changed: frozenset) -> bool:
+    if not paths and not folders:
+        return True  # unknown layout: resolve it
+    if any(p in changed for p in paths):
+        return True
+    return any(c.startswith(f) for f in folders for c in changed)
+
+
+def compare_branch_states(branch_a: str, branch_b: str, components: List[Dict],
+                          gclient: Optional[BitBucketClient] = None,
+                          max_workers: Optional[int] = None) -> Tuple[Dict, Dict, List[Dict], str]:
+    """
+    Production state on two branches, resolving only components that differ.
+
+    One diffstat between the branch tips decides which components could
+    differ; components none of whose candidate paths appear in it are
+    identical on both branches and get no per-file lookups. The rest go
+    through production_states (both branches concurrently, shared client).
+    If the diffstat can't be fetched, every component is resolved.
+
+    Returns (state_a, state_b, unchanged_components, mode), where the states
+    cover only the resolved components and mode is "identical" (same tip
+    commit), "diffstat" or "full" (fallback).
+    """
+    if not isinstance(components, list) or not components:
+        raise ValueError("components list is required")
+
+    gclient = gclient or BitBucketClient(log)
+    sha_a, sha_b = gclient.resolve_ref(branch_a), gclient.resolve_ref(branch_b)
+
+    if sha_a and sha_a == sha_b:
+        mode, changed = "identical", frozenset()
+    else:
+        diffstat = gclient.get_branch_diffstat(branch_a, branch_b)
+        if diffstat is None:
+            log.warning(f"⚠️ No diffstat for {branch_a}..{branch_b}; resolving all {len(components)} components")
+            state_a, state_b = production_states([branch_a, branch_b], components, gclient, max_workers)
+            return state_a, state_b, [], "full"
+        mode = "diffstat"
+        changed = frozenset(p for d in diffstat for p in (d.get("old_path"), d.get("new_path")) if p)
+
+    bundles = bundle_types()
+    touched, unchanged = [], []
+    for comp in components:
+        if mode == "identical":
+            unchanged.append(comp)
+            continue
+        paths, folders = component_paths(gclient, comp, bundles)
+        (touched if _touched(paths, folders, changed) else unchanged).append(comp)
+
+    log.info(f"🔀 {branch_a}..{branch_b} ({mode}): {len(changed)} changed paths, "
+             f"{len(touched)}/{len(components)} components to resolve")
+
+    if touched:
+        state_a, state_b = production_states([branch_a, branch_b], touched, gclient, max_workers)
+    else:
+        state_a, state_b = (_empty_state(branch_a), _empty_state(branch_b))
+    return state_a, state_b, unchanged, mode
+
+
+def _empty_state(branch: str) -> Dict:
+    return {
+        "success": True,
+        "branch": branch,
+        "checked_at": datetime.utcnow().isoformat(),
+        "total_components": 0,
+        "existing": 0,
+        "missing": 0,
+        "production_state": []
+    }
+
+
+def bundle_diff(component_type: str, component_name: str,
+                prod_branch: str = 'master', uat_branch: str = 'uatsfdc',
+                gclient: Optional[BitBucketClient] = None) -> Dict:
+    """BitBucketClient.get_bundle_diff for one component (the /api/get-code-diff data)"""
+    if '.' in component_name:
+        component_name = component_name.split('.', 1)[1]
+
+    gclient = gclient or BitBucketClient()
+    # Use bundle diff for multi-file components
+    return gclient.get_bundle_diff(
+        component_name=component_name,
+        component_type=component_type,
+        prod_branch=prod_branch,
+        uat_branch=uat_branch
+    )
@@ -31,6 +31,41 @@ class Config:
     VALIDATION_LEVEL_DEFAULT: str = "standard"
     VALIDATION_LEVEL_CRITICAL: str = "full"
 
+    # ========== Bulk proof concurrency ==========
+    PROOF_MAX_WORKERS: int = 8          # stories proven at once
+    PROOF_SF_CONCURRENCY: int = 4       # in-flight Salesforce calls per prover
+    PROOF_GIT_CONCURRENCY: int = 8      # in-flight Bitbucket calls per prover
+    PROOF_STORY_TIMEOUT: float = 300.0  # seconds per story (0 = no limit)
+
+    # ========== Background proof jobs (async bulk proofs) ==========
+    PROOF_JOB_WORKERS: int = 2          # jobs run at once per process
+    PROOF_JOB_DB_PATH: str = "tmp/cache/proof_jobs.sqlite"
+    PROOF_JOB_RETENTION_DAYS: float = 7.0
+
+    # ========== Per-component endpoints (component-history, compare-deployment, ...) ==========
+    API_COMPONENT_TIMEOUT: float = 60.0  # seconds per component (0 = no limit)
+
+    # ========== Bitbucket file cache (shared across requests/workers) ==========
+    FILE_CACHE_ENABLED: bool = True
+    FILE_CACHE_PATH: str = "tmp/cache/bitbucket_files.sqlite"
+    FILE_CACHE_MAX_MB: int = 512
+    BITBUCKET_REF_TTL: float = 30.0     # seconds a branch -> commit lookup is trusted
+
+    # ========== Local bare git mirror (optional Bitbucket backend) ==========
+    GIT_MIRROR_ENABLED: bool = False
+    GIT_MIRROR_PATH: str = "tmp/git_mirror"
+    GIT_MIRROR_URL: str | None = None   # default: https://bitbucket.org/{workspace}/{repo}.git (token sent as an auth header)
+    GIT_MIRROR_REFRESH_SECONDS: float = 120.0
+
+    # ========== Bitbucket HTTP (shared pool / rate limiting) ==========
+    BITBUCKET_MAX_CONCURRENCY: int = 16  # in-flight Bitbucket requests per process
+
+    # ========== Salesforce session (shared, lazy login) ==========
+    SF_POOL_SIZE: int = 16               # pooled HTTPS connections on the shared session
+
+    # ========== In-memory models ==========
+    MODEL_INTERN_STRINGS: bool = True    # share repeated names/developers across Component/UserStory
+
 
 _cfg: Config | None = None
 
@@ -78,5 +113,24 @@ def get_config() -> Config:
         VALIDATION_LARGE_FILE_MB=_get_int("VALIDATION_LARGE_FILE_MB", 10),
         VALIDATION_LEVEL_DEFAULT=os.getenv("VALIDATION_LEVEL_DEFAULT", "standard"),
         VALIDATION_LEVEL_CRITICAL=os.getenv("VALIDATION_LEVEL_CRITICAL", "full"),
+        PROOF_MAX_WORKERS=_get_int("PROOF_MAX_WORKERS", 8),
+        PROOF_SF_CONCURRENCY=_get_int("PROOF_SF_CONCURRENCY", 4),
+        PROOF_GIT_CONCURRENCY=_get_int("PROOF_GIT_CONCURRENCY", 8),
+        PROOF_STORY_TIMEOUT=_get_float("PROOF_STORY_TIMEOUT", 300.0),
+        PROOF_JOB_WORKERS=_get_int("PROOF_JOB_WORKERS", 2),
+        PROOF_JOB_DB_PATH=os.getenv("PROOF_JOB_DB_PATH", "tmp/cache/proof_jobs.sqlite"),
+        PROOF_JOB_RETENTION_DAYS=_get_float("PROOF_JOB_RETENTION_DAYS", 7.0),
+        API_COMPONENT_TIMEOUT=_get_float("API_COMPONENT_TIMEOUT", 60.0),
+        FILE_CACHE_ENABLED=_get_bool("FILE_CACHE_ENABLED", True),
+        FILE_CACHE_PATH=os.getenv("FILE_CACHE_PATH", "tmp/cache/bitbucket_files.sqlite"),
+        FILE_CACHE_MAX_MB=_get_int("FILE_CACHE_MAX_MB", 512),
+        BITBUCKET_REF_TTL=_get_float("BITBUCKET_REF_TTL", 30.0),
+        GIT_MIRROR_ENABLED=_get_bool("GIT_MIRROR_ENABLED", False),
+        GIT_MIRROR_PATH=os.getenv("GIT_MIRROR_PATH", "tmp/git_mirror"),
+        GIT_MIRROR_URL=os.getenv("GIT_MIRROR_URL"),
+        GIT_MIRROR_REFRESH_SECONDS=_get_float("GIT_MIRROR_REFRESH_SECONDS", 120.0),
+        BITBUCKET_MAX_CONCURRENCY=_get_int("BITBUCKET_MAX_CONCURRENCY", 16),
+        SF_POOL_SIZE=_get_int("SF_POOL_SIZE", 16),
+        MODEL_INTERN_STRINGS=_get_bool("MODEL_INTERN_STRINGS", True),
         )
     return _cfg
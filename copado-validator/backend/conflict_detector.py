@@ -4,8 +4,9 @@ Conflict Detection Engine
 Analyzes user stories to find components touched by multiple stories.
 Calculates risk scores and severity levels.
 """
+import heapq
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import defaultdict
 from models import (
     UserStory, Component, ConflictingComponent,
@@ -94,30 +95,56 @@ class ConflictDetector:
                 'risk': 'Minimal risk'
             }
     
-    def analyze_story_to_story_conflicts(self) -> List[dict]:
-        """Find which stories conflict with each other across multiple components"""
+    def analyze_story_to_story_conflicts(self, top_k: Optional[int] = None) -> List[dict]:
+        """
+        Find which stories conflict with each other across multiple components
+        
+        Walks component -> stories postings, so only pairs that actually share
+        a component are counted (no all-pairs scan).
+        
+        Args:
+            top_k: Only return the top_k pairs (same order as the full list)
+        """
+        story_components = [{c.api_name for c in story.components} for story in self.user_stories]
+        
+        # Inverted index: component -> positions of the stories touching it (ascending)
+        postings = defaultdict(list)
+        for idx, names in enumerate(story_components):
+            for name in names:
+                postings[name].append(idx)
+        
+        # Shared-component count per story pair (i < j)
+        overlap = defaultdict(int)
+        for story_idxs in postings.values():
+            if len(story_idxs) < 2:
+                continue
+            for pos, i in enumerate(story_idxs):
+                for j in story_idxs[pos + 1:]:
+                    overlap[(i, j)] += 1
+        
+        # Most shared first; ties keep the original pair order (stable sort over i, j)
+        def rank(pair):
+            return (-overlap[pair], pair)
+        if top_k is not None:
+            pairs = heapq.nsmallest(max(0, top_k), overlap, key=rank)
+        else:
+            pairs = sorted(overlap, key=rank)
+        
         story_conflicts = []
+        for i, j in pairs:
+            story1, story2 = self.user_stories[i], self.user_stories[j]
+            shared = story_components[i] & story_components[j]
+            story_conflicts.append({
+                'story1_id': story1.id,
+                'story1_developer': story1.developer,
+                'story2_id': story2.id,
+                'story2_developer': story2.developer,
+                'shared_count': len(shared),
+                'shared_components': list(shared),
+                'needs_coordination': story1.developer != story2.developer
+            })
         
-        for i, story1 in enumerate(self.user_stories):
-            for story2 in self.user_stories[i+1:]:
-                # Find shared components
-                comps1 = {c.api_name for c in story1.components}
-                comps2 = {c.api_name for c in story2.components}
-                shared = comps1 & comps2
-                
-                if len(shared) > 0:
-                    story_conflicts.append({
-                        'story1_id': story1.id,
-                        'story1_developer': story1.developer,
-                        'story2_id': story2.id,
-                        'story2_developer': story2.developer,
-                        'shared_count': len(shared),
-                        'shared_components': list(shared),
-                        'needs_coordination': story1.developer != story2.developer
-                    })
-        
-        return sorted(story_conflicts, key=lambda x: x['shared_count'], reverse=True)
-
+        return story_conflicts
 
     def get_developer_coordination_map(self) -> dict:
         """Who needs to coordinate with whom"""
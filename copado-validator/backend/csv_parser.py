@@ -14,6 +14,65 @@ from models import (
 )
 
 
+STORY_COLUMN = 'copado__User_Story__r.Name'
+
+TYPE_MAP = {
+    'ApexClass': MetadataType.APEX_CLASS,
+    'IntegrationProcedure': MetadataType.INTEGRATION_PROCEDURE,
+    'DataRaptor': MetadataType.DATA_RAPTOR,
+    'OmniScript': MetadataType.OMNI_SCRIPT,
+    'PermissionSet': MetadataType.PERMISSION_SET,
+    'Flow': MetadataType.FLOW,
+    'Product2': MetadataType.PRODUCT,
+    'System': MetadataType.SYSTEM,
+}
+
+STATUS_MAP = {
+    'Potential Conflict': ConflictStatus.POTENTIAL_CONFLICT,
+    'Auto-resolved': ConflictStatus.AUTO_RESOLVED,
+    'Back Promoted': ConflictStatus.BACK_PROMOTED,
+}
+
+
+def _parse_one_date(value, utc_naive: bool):
+    """Scalar date parse: Timestamp or None (tz-aware -> naive UTC if utc_naive)"""
+    if pd.isna(value):
+        return None
+    try:
+        parsed = pd.to_datetime(value)
+        if utc_naive and parsed.tz is not None:
+            parsed = parsed.tz_convert('UTC').tz_localize(None)
+        return parsed
+    except Exception:
+        return None
+
+
+def to_datetime_column(values: pd.Series, utc_naive: bool = True) -> list:
+    """
+    Parse a whole column of dates at once; returns Timestamps / None.
+
+    Same results as parsing each value with pd.to_datetime: the column is
+    parsed with one inferred format, and only values that format can't read
+    (mixed formats, junk) fall back to scalar parsing.
+    """
+    try:
+        if utc_naive:
+            # Naive values are taken as-is, aware ones converted to UTC
+            parsed = pd.to_datetime(values, errors='coerce', utc=True).dt.tz_localize(None)
+        else:
+            parsed = pd.to_datetime(values, errors='coerce')
+    except (TypeError, ValueError):
+        # e.g. mixed UTC offsets without utc=True
+        return [_parse_one_date(v, utc_naive) for v in values]
+
+    out = parsed.astype(object).where(parsed.notna(), None).tolist()
+    retry = (parsed.isna() & values.notna()).to_numpy().nonzero()[0]
+    raw = values.tolist()
+    for i in retry:
+        out[i] = _parse_one_date(raw[i], utc_naive)
+    return out
+
+
 class CopadoCSVParser:
     """
     Parses Copado CSV exports into structured data
@@ -24,9 +83,15 @@ class CopadoCSVParser:
         print(f"Found {len(result.user_stories)} stories")
     """
     
-    def __init__(self):
-        """Initialize the parser"""
-        pass
+    def __init__(self, vectorized: bool = True):
+        """
+        Initialize the parser
+        
+        Args:
+            vectorized: Build stories column-wise (fast). False uses the
+                        original row-by-row path, kept for comparison.
+        """
+        self.vectorized = vectorized
     
     def parse_file(self, file_path: str) -> ParsedData:
         """
@@ -73,11 +138,92 @@ class CopadoCSVParser:
         Returns:
             List of UserStory objects
         """
+        if self.vectorized:
+            return self._transform_columnwise(df)
+        return self._transform_rowwise(df)
+    
+    def _transform_columnwise(self, df: pd.DataFrame) -> List[UserStory]:
+        """
+        Vectorized transform: map types/statuses and parse dates per column,
+        then group row positions by story (first-appearance order)
+        """
+        n = len(df)
+        
+        def column(name: str, default=None) -> pd.Series:
+            if name in df.columns:
+                return df[name]
+            return pd.Series([default] * n, index=df.index, dtype=object)
+        
+        def as_str(name: str, default) -> list:
+            # str(row.get(name, default)), including 'nan' for empty cells
+            if name not in df.columns:
+                return [str(default)] * n
+            return [str(v) for v in df[name].tolist()]
+        
+        def optional_str(name: str) -> list:
+            values = column(name)
+            return [str(v) if keep else None
+                    for v, keep in zip(values.tolist(), values.notna().tolist())]
+        
+        def mapped(name: str, table: Dict, default) -> list:
+            values = column(name)
+            return [table.get(str(v), default) if keep else default
+                    for v, keep in zip(values.tolist(), values.notna().tolist())]
+        
+        story_ids = as_str(STORY_COLUMN, 'UNKNOWN')
+        
+        types = mapped('copado__Type__c', TYPE_MAP, MetadataType.UNKNOWN)
+        statuses = mapped('copado__Status__c', STATUS_MAP, ConflictStatus.UNKNOWN)
+        dates = to_datetime_column(column('copado__Last_Commit_Date__c'))
+        api_names = as_str('copado__Metadata_API_Name__c', 'Unknown')
+        unique_ids = as_str('copado__Unique_ID__c', '')
+        created_by = optional_str('CreatedBy.Name')
+        commit_hashes = column('copado__User_Story_Commit__c').tolist()
+        
+        components = [
+            Component(
+                api_name=api_names[i],
+                type=types[i],
+                status=statuses[i],
+                user_story_id=story_ids[i],
+                unique_id=unique_ids[i],
+                last_commit_date=dates[i],
+                created_by=created_by[i],
+                commit_hash=commit_hashes[i]
+            )
+            for i in range(n)
+        ]
+        
+        # Story header fields come from each story's first row
+        titles = as_str('copado__User_Story__r.copado__User_Story_Title__c', '')
+        jira_keys = optional_str('copado__User_Story__r.copadoccmint__JIRA_key__c')
+        projects = as_str('copado__User_Story__r.copado__Project__r.Name', 'Unknown')
+        environments = as_str('copado__User_Story__r.copado__Environment__r.Name', 'Unknown')
+        developers = optional_str('copado__User_Story__r.copado__Developer__r.Name')
+        
+        groups = pd.Series(story_ids, dtype=object).groupby(story_ids, sort=False).indices
+        stories = []
+        for story_id in dict.fromkeys(story_ids):
+            positions = groups[story_id]
+            first = positions[0]
+            stories.append(UserStory(
+                id=story_id,
+                title=titles[first],
+                jira_key=jira_keys[first],
+                project=projects[first],
+                environment=environments[first],
+                developer=developers[first],
+                components=[components[i] for i in positions]
+            ))
+        return stories
+    
+    def _transform_rowwise(self, df: pd.DataFrame) -> List[UserStory]:
+        """Original row-by-row transform (one iterrows pass)"""
         stories_dict: Dict[str, UserStory] = {}
         
         for _, row in df.iterrows():
             # Get user story ID
-            story_id = str(row.get('copado__User_Story__r.Name', 'UNKNOWN'))
+            story_id = str(row.get(STORY_COLUMN, 'UNKNOWN'))
             
             # Create user story if doesn't exist
             if story_id not in stories_dict:
@@ -126,31 +272,14 @@ class CopadoCSVParser:
         if pd.isna(type_str):
             return MetadataType.UNKNOWN
         
-        type_map = {
-            'ApexClass': MetadataType.APEX_CLASS,
-            'IntegrationProcedure': MetadataType.INTEGRATION_PROCEDURE,
-            'DataRaptor': MetadataType.DATA_RAPTOR,
-            'OmniScript': MetadataType.OMNI_SCRIPT,
-            'PermissionSet': MetadataType.PERMISSION_SET,
-            'Flow': MetadataType.FLOW,
-            'Product2': MetadataType.PRODUCT,
-            'System': MetadataType.SYSTEM,
-        }
-        
-        return type_map.get(str(type_str), MetadataType.UNKNOWN)
+        return TYPE_MAP.get(str(type_str), MetadataType.UNKNOWN)
     
     def _map_conflict_status(self, status_str) -> ConflictStatus:
         """Map CSV string to ConflictStatus enum"""
         if pd.isna(status_str):
             return ConflictStatus.UNKNOWN
         
-        status_map = {
-            'Potential Conflict': ConflictStatus.POTENTIAL_CONFLICT,
-            'Auto-resolved': ConflictStatus.AUTO_RESOLVED,
-            'Back Promoted': ConflictStatus.BACK_PROMOTED,
-        }
-        
-        return status_map.get(str(status_str), ConflictStatus.UNKNOWN)
+        return STATUS_MAP.get(str(status_str), ConflictStatus.UNKNOWN)
     
     def _parse_dateback(self, date_str) -> datetime:
         """Parse date string from Copado CSV"""
@@ -7,16 +7,22 @@ INTEGRATION NOTE:
 This file contains all NEW validator code. You need to ADD your existing
 helper methods at the bottom (marked with # YOUR EXISTING METHODS HERE)
 """
+import copy
 import logging
 import re
-from typing import Dict, List, Optional, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import hashlib
 import json
 import os
 import time
 
+from bounded_pool import map_bounded
+from config import get_config
+from sf_session import resolve_salesforce
+from validator_scheduler import ValidatorScheduler, build_specs, DEFAULT_TIMEOUT_SECONDS
+
 log = logging.getLogger(__name__)
 
 # Try to import existing modules
@@ -42,7 +48,8 @@ except ImportError:
     log.warning("git_client not available - mock mode only")
 
 try:
-    from validation_config import get_enabled_validators, can_run_validator, get_validator_config
+    from validation_config import (get_enabled_validators, can_run_validator, get_validator_config,
+                                   get_scheduler_config)
     VALIDATION_CONFIG_AVAILABLE = True
     log.info("✅ validation_config.py imported successfully")
 except ImportError as e:
@@ -57,6 +64,154 @@ except Exception as e:
     log.error(f"❌ Error importing validation_config.py: {e}")
 
 
+class ProductionComponentIndex:
+    """
+    Hash lookup over pre-fetched production records
+    
+    Validators used to scan production_components for every story component.
+    Records are bucketed by (_component_type, compare_field) on first use and
+    keyed by the lowercased field value. The first record in list order wins,
+    matching the old linear scan's `break` on first match.
+    """
+    
+    def __init__(self, production_components: List[Dict]):
+        self.records = production_components or []
+        self._buckets: Dict[Tuple[str, str], Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+    
+    def find(self, comp_type: str, compare_field: str, value: str) -> Optional[Dict]:
+        """First production record of comp_type whose compare_field equals value (case-insensitive)"""
+        if not value:
+            return None
+        return self._bucket(comp_type, compare_field).get(value.lower())
+    
+    def _bucket(self, comp_type: str, compare_field: str) -> Dict[str, Dict]:
+        key = (comp_type, compare_field)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = {}
+                    for record in self.records:
+                        if record.get('_component_type') != comp_type:
+                            continue
+                        prod_value = record.get(compare_field)
+                        if prod_value and isinstance(prod_value, str):
+                            bucket.setdefault(prod_value.lower(), record)
+                    self._buckets[key] = bucket
+        return bucket
+
+
+class BulkResponseBuilder:
+    """
+    format_bulk_response, one result at a time.
+    
+    Streaming callers fold each result in as it finishes (keep_stories=False)
+    so the full per-story results never need to be held together; only the
+    counters and the small filter sets are kept.
+    """
+    
+    def __init__(self, prover: 'DeploymentProver', keep_stories: bool = True):
+        self.prover = prover
+        self.keep_stories = keep_stories
+        self.total_stories = 0
+        self.proven = 0
+        self.partial = 0
+        self.unproven = 0
+        self.total_components = 0
+        self.proven_components = 0
+        self.component_types: Dict[str, int] = {}
+        self.validators_passed = 0
+        self.validators_failed = 0
+        self.stories: List[Dict] = []
+        self.authors = set()
+        self.statuses = set()
+        self.environments = set()
+        self.errors: List[Dict] = []
+    
+    def add(self, result: Dict) -> Optional[Dict]:
+        """Fold in one story result; returns its UI summary (None if it could not be formatted)"""
+        self.total_stories += 1
+        
+        verdict = result.get('overall_proof', {}).get('verdict', 'UNPROVEN')
+        if verdict == 'PROVEN':
+            self.proven += 1
+        elif verdict in ['LIKELY PROVEN', 'POSSIBLY PROVEN']:
+            self.partial += 1
+        else:
+            self.unproven += 1
+        
+        self.total_components += result.get('summary', {}).get('total_components', 0)
+        self.proven_components += result.get('summary', {}).get('proven_components', 0)
+        for comp in result.get('component_proofs', []):
+            comp_type = comp.get('component', {}).get('type', 'Unknown')
+            self.component_types[comp_type] = self.component_types.get(comp_type, 0) + 1
+        
+        if result.get('validation', {}).get('failed', 0) > 0:
+            self.validators_failed += 1
+        else:
+            self.validators_passed += 1
+        self.environments.add(result.get('environment'))
+        
+        story_summary = None
+        try:
+            story_summary = self.prover._format_story_summary(result)
+            if self.keep_stories:
+                self.stories.append(story_summary)
+            self.authors.add(story_summary['commit']['author'])
+            self.statuses.add(story_summary['status'])
+        except Exception as e:
+            story_id = result.get('stories', {}).get('requested', ['Unknown'])[0]
+            self.errors.append({
+                'story_id': story_id,
+                'error_type': 'formatting_error',
+                'message': str(e),
+                'severity': 'warning'
+            })
+            log.error(f"Error formatting story {story_id}: {e}")
+        return story_summary
+    
+    def build(self, start_time) -> Dict:
+        """The format_bulk_response dict ('stories' is empty when keep_stories=False)"""
+        execution_time = str(datetime.now() - start_time)
+        total = self.total_stories
+        success_rate = round((self.proven / total * 100) if total > 0 else 0, 1)
+        
+        return {
+            'overview': {
+                'total_stories': total,
+                'processing_time': execution_time,
+                'timestamp': datetime.now().isoformat(),
+                'summary': {
+                    'proven': self.proven,
+                    'unproven': self.unproven,
+                    'partial': self.partial,
+                    'success_rate': success_rate
+                },
+                'component_summary': {
+                    'total_components': self.total_components,
+                    'proven_components': self.proven_components,
+                    'unproven_components': self.total_components - self.proven_components,
+                    'component_types': self.component_types
+                },
+                'validation_summary': {
+                    'all_validators_passed': self.validators_passed,
+                    'some_validators_failed': self.validators_failed,
+                    'critical_failures': self.unproven
+                }
+            },
+            'stories': self.stories,
+            'filters': {
+                'statuses': sorted(list(self.statuses)),
+                'authors': sorted(list(self.authors)),
+                'environments': list(self.environments),
+                'component_types': sorted(self.component_types.keys())
+            },
+            'errors': self.errors
+        }
+
+
 class DeploymentProver:
     """
     Fast deployment validation with configuration-driven validators
@@ -70,10 +225,29 @@ class DeploymentProver:
     
     INVALID_STATUSES = ['Cancelled', 'Rejected', 'Draft', 'Approval Failed']
     
-    def __init__(self, sf_client=None, git_client=None, max_workers=20, mock_mode=False):
+    # Validators whose result depends only on the commit SHA
+    COMMIT_SCOPED_VALIDATORS = {'commit_exists', 'files_in_commit', 'commit_contents'}
+    
+    def __init__(self, sf_client=None, git_client=None, max_workers=None, mock_mode=False,
+                 sf_concurrency=None, git_concurrency=None, story_timeout=None):
+        cfg = get_config()
         self.sf = sf_client
         self.git = git_client
-        self.max_workers = max_workers
+        self.max_workers = max(1, max_workers or cfg.PROOF_MAX_WORKERS)
+        self.story_timeout = cfg.PROOF_STORY_TIMEOUT if story_timeout is None else story_timeout
+        
+        # Shared by every request using this prover, so the limits are global
+        self._sf_slots = threading.BoundedSemaphore(max(1, sf_concurrency or cfg.PROOF_SF_CONCURRENCY))
+        self._git_slots = threading.BoundedSemaphore(max(1, git_concurrency or cfg.PROOF_GIT_CONCURRENCY))
+        scheduler_config = get_scheduler_config() if VALIDATION_CONFIG_AVAILABLE else {}
+        self._validator_scheduler = ValidatorScheduler(scheduler_config.get('concurrency'))
+        
+        # One provider for all stories and threads, so concurrent proofs share its single-flight
+        self._commit_metadata = None
+        if git_client is not None:
+            from commit_metadata import CommitMetadataProvider
+            self._commit_metadata = CommitMetadataProvider(git_client, http_get=self._git_get)
+        
         self.mock_mode = mock_mode or not all([SALESFORCE_CLIENT_AVAILABLE, GIT_CLIENT_AVAILABLE])
         
         if self.mock_mode:
@@ -199,25 +373,226 @@ class DeploymentProver:
         log.info(f"📦 PRODUCTION COMPONENTS FETCHED: {len(production_components)}")
         log.info("=" * 80)
         
+        return self._prove_components(
+            story_names=story_names,
+            valid_stories=valid_stories,
+            invalid_stories=invalid_stories,
+            validation_summary=validation_results['summary'],
+            components=unique_components,
+            commit_shas=commit_shas,
+            production_components=production_components,
+            target_env=target_env,
+            target_branch=target_branch,
+            validation_level=validation_level,
+            start_time=start_time
+        )
+    
+    def prove_release_bulk(self, story_names: List[str], target_env: str,
+                           target_branch: str = "master",
+                           validate_story_env: bool = True,
+                           validation_level: str = 'standard',
+                           max_workers: Optional[int] = None,
+                           story_timeout: Optional[float] = None,
+                           on_result: Optional[Callable[[int, Dict], None]] = None,
+                           keep_results: bool = True) -> List[Dict]:
+        """
+        Prove many stories as one release, sharing work across stories
+        
+        Story data is loaded once, components are deduplicated across the whole
+        release, production state is fetched once, and commit-scoped validators
+        run once per distinct commit SHA. Results are fanned back out per story,
+        with stories proven concurrently (see _run_stories_concurrently).
+        
+        on_result(index, result) is called as each story finishes (see
+        _run_stories_concurrently), e.g. to report job progress. With
+        keep_results=False results only go to on_result and [] is returned.
+        
+        Returns:
+            One result per requested story, in input order, each in the shape
+            prove_deployment([story]) returns (what format_bulk_response expects)
+        """
+        release_start = datetime.now()
+        
+        log.info(f"🚀 Starting release proof for {len(story_names)} stories -> {target_env}")
+        log.info(f"📊 Validation level: {validation_level}")
+        
+        # Step 1: Load and validate every story at once
+        validation_results = self._validate_stories(story_names, target_env, validate_story_env)
+        valid_by_name = {s['story_name']: s for s in validation_results['valid_stories']}
+        invalid_by_name = {s['story']: s for s in validation_results['invalid_stories']}
+        
+        # Step 2: Deduplicate components across the release and fetch production once
+        all_components = []
+        for story_data in validation_results['valid_stories']:
+            all_components.extend(story_data['components'])
+        release_components = self._deduplicate_components(all_components)
+        
+        log.info(f"📦 {len(release_components)} unique components across "
+                 f"{len(valid_by_name)} valid stories ({len(invalid_by_name)} invalid)")
+        
+        production_components = (
+            self._fetch_all_production_components(release_components) if release_components else []
+        )
+        log.info(f"📦 PRODUCTION COMPONENTS FETCHED: {len(production_components)}")
+        production_index = ProductionComponentIndex(production_components)
+        
+        # Step 3: Fan out per story, reusing commit-scoped validator results per SHA
+        commit_validator_cache: Dict[Tuple[str, str], Dict] = {}
+        
+        def prove_one(story_name: str) -> Dict:
+            start_time = datetime.now()
+            
+            story_data = valid_by_name.get(story_name)
+            if not story_data:
+                invalid = invalid_by_name.get(story_name, {'story': story_name, 'reason': 'Story not found or no commit data'})
+                summary = {
+                    'total_requested': 1,
+                    'valid_stories': 0,
+                    'invalid_stories': 1,
+                    'environment_validation': validate_story_env,
+                    'reasons': {invalid['reason']: 1}
+                }
+                return self._error_result(f"No valid stories. Issues: {summary}")
+            
+            components = self._deduplicate_components(story_data['components'])
+            if not components:
+                return self._error_result("No components found in story.")
+            
+            return self._prove_components(
+                story_names=[story_name],
+                valid_stories=[story_data],
+                invalid_stories=[],
+                validation_summary={
+                    'total_requested': 1,
+                    'valid_stories': 1,
+                    'invalid_stories': 0,
+                    'environment_validation': validate_story_env,
+                    'reasons': {}
+                },
+                components=components,
+                commit_shas=[story_data['commit_sha']] if story_data['commit_sha'] else [],
+                production_components=production_components,
+                target_env=target_env,
+                target_branch=target_branch,
+                validation_level=validation_level,
+                start_time=start_time,
+                commit_validator_cache=commit_validator_cache,
+                production_index=production_index
+            )
+        
+        results = self._run_stories_concurrently(
+            story_names,
+            prove_one,
+            story_name_of=lambda name: name,
+            max_workers=max_workers,
+            story_timeout=story_timeout,
+            on_result=on_result,
+            keep_results=keep_results
+        )
+        
+        log.info(f"✅ Release proof completed for {len(story_names)} stories ({datetime.now() - release_start})")
+        return results
+    
+    def prove_stories_parallel(self, story_requests: List[Dict],
+                               max_workers: Optional[int] = None,
+                               story_timeout: Optional[float] = None,
+                               on_result: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+        """
+        Prove independent stories concurrently, each with its own parameters
+        
+        Args:
+            story_requests: Dicts with story_name, target_env and optionally
+                target_branch, validate_story_env, validation_level
+        
+        Returns:
+            One prove_deployment result per request, in input order
+        """
+        def prove_one(req: Dict) -> Dict:
+            return self.prove_deployment(
+                story_names=[req['story_name']],
+                target_env=req['target_env'],
+                target_branch=req.get('target_branch', 'master'),
+                validate_story_env=req.get('validate_story_env', True),
+                validation_level=req.get('validation_level', 'standard')
+            )
+        
+        return self._run_stories_concurrently(
+            story_requests,
+            prove_one,
+            story_name_of=lambda req: req['story_name'],
+            max_workers=max_workers,
+            story_timeout=story_timeout,
+            on_result=on_result
+        )
+    
+    def _run_stories_concurrently(self, items: List[Any], prove_one: Callable[[Any], Dict],
+                                  story_name_of: Callable[[Any], str],
+                                  max_workers: Optional[int] = None,
+                                  story_timeout: Optional[float] = None,
+                                  on_result: Optional[Callable[[int, Dict], None]] = None,
+                                  keep_results: bool = True) -> List[Dict]:
+        """
+        Run prove_one over items on a bounded pool, returning results in input order
+        
+        The timeout is counted from when a story starts running, not from when it
+        is queued. A story that overruns gets an error result; its worker thread
+        cannot be interrupted, so it finishes in the background and is discarded.
+        Salesforce/Bitbucket concurrency is bounded separately by _sf_call/_git_get.
+        on_result(index, result) is called (on this thread) as each story's
+        result is settled, including errors and timeouts. keep_results=False
+        drops each result once on_result has seen it and returns [].
+        """
+        workers = max_workers or self.max_workers
+        timeout = self.story_timeout if story_timeout is None else story_timeout
+        if items:
+            log.info(f"⚡ Proving {len(items)} stories with {min(workers, len(items))} workers "
+                     f"(timeout: {f'{timeout}s' if timeout else 'none'})")
+        
+        def run(item: Any) -> Dict:
+            log.info(f"   Proving {story_name_of(item)}...")
+            return prove_one(item)
+        
+        return map_bounded(
+            run, items,
+            fallback=lambda item, e: self._story_exception_result(story_name_of(item), e),
+            max_workers=workers,
+            timeout=timeout,
+            on_result=on_result,
+            keep_results=keep_results,
+            describe=story_name_of,
+            thread_name_prefix='prove'
+        )
+    
+    def _prove_components(self, story_names: List[str], valid_stories: List[Dict],
+                          invalid_stories: List[Dict], validation_summary: Dict,
+                          components: List[Dict], commit_shas: List[str],
+                          production_components: List[Dict], target_env: str,
+                          target_branch: str, validation_level: str, start_time,
+                          commit_validator_cache: Optional[Dict] = None,
+                          production_index: Optional[ProductionComponentIndex] = None) -> Dict:
+        """Run validators and component proofs for already-loaded stories and build the result"""
         # Step 3: Execute validators based on level
+        context = {
+            'story_names': [s['story_name'] for s in valid_stories],
+            'target_env': target_env,
+            'target_branch': target_branch,
+            'commit_shas': commit_shas,
+            'production_components': production_components,
+            'production_index': production_index or ProductionComponentIndex(production_components),
+            'commit_metadata': self._get_commit_metadata()
+        }
+        if commit_validator_cache is not None:
+            context['commit_validator_cache'] = commit_validator_cache
+        
         validators_execution = self._execute_validators(
             validation_level=validation_level,
-            components=unique_components,
-            context={
-                'story_names': [s['story_name'] for s in valid_stories],
-                'target_env': target_env,
-                'target_branch': target_branch,
-                'commit_shas': commit_shas,
-                'production_components': production_components
-            }
+            components=components,
+            context=context
         )
         
-        # ========== NEW: Store validator results for overall proof calculation ==========
-        self._last_validation_results = validators_execution
-        
         # Step 4: Run component proofs (creates initial proof structure)
         proof_results = self._run_component_proofs(
-            unique_components, 
+            components, 
             commit_shas[0] if commit_shas else None, 
             target_env, 
             target_branch
@@ -230,7 +605,7 @@ class DeploymentProver:
         )
         
         # Step 5: Calculate overall proof (now uses validator results)
-        overall_proof = self._calculate_overall_proof(proof_results)
+        overall_proof = self._calculate_overall_proof(proof_results, validators_execution)
         
         execution_time = str(datetime.now() - start_time)
         
@@ -247,10 +622,10 @@ class DeploymentProver:
             "validation": validators_execution,
             "overall_proof": overall_proof,
             "component_proofs": proof_results,
-            "validation_summary": validation_results['summary'],
+            "validation_summary": validation_summary,
             "summary": {
                 "total_stories": len(valid_stories),
-                "total_components": len(unique_components),
+                "total_components": len(components),
                 "proven_components": sum(1 for r in proof_results if r['proven']),
                 "proof_score": overall_proof['score'],
                 "confidence": overall_proof['confidence']
@@ -340,9 +715,9 @@ class DeploymentProver:
         skipped = 0
         no_access = 0
         
+        results_by_name = {}
+        runnable = []
         for validator_name in validators_to_run:
-            validator_start = time.time()
-            
             # Check access
             if VALIDATION_CONFIG_AVAILABLE and not can_run_validator(validator_name):
                 validator_config = get_validator_config(validator_name)
@@ -350,63 +725,94 @@ class DeploymentProver:
             
                 log.info(f"  ⊘ Skipping: {validator_name} (requires: {requires_access})")
                 log.info(f"  ⊘ Skipping: {validator_name} (no access)")
-                no_access += 1
-                validation_results.append({
+                results_by_name[validator_name] = {
                     'validator': validator_name,
                     'status': 'no_access',
                     'execution_time_ms': 0,
                     'details': {'reason': 'Access not available'}
-                })
-                continue
-            
+                }
+            else:
+                runnable.append(validator_name)
+        
+        def failure_status(validator_name: str) -> str:
+            if VALIDATION_CONFIG_AVAILABLE:
+                failure_mode = get_validator_config(validator_name).get('failure_mode', 'warning')
+            else:
+                failure_mode = 'warning'
+            return 'failed' if failure_mode == 'critical' else 'warning'
+        
+        def run_one(validator_name: str) -> Dict:
+            validator_start = time.time()
             try:
                 log.info(f"  → Running: {validator_name}")
                 
-                result = self._run_validator(validator_name, components, context)
-                
-                execution_time = int((time.time() - validator_start) * 1000)
-                result['execution_time_ms'] = execution_time
+                # Commit-scoped validators only depend on the SHA, so a release run
+                # computes them once per distinct commit and reuses the result
+                commit_cache = context.get('commit_validator_cache')
+                commit_sha = (context.get('commit_shas') or [None])[0]
+                cache_key = (validator_name, commit_sha)
+                cacheable = (commit_cache is not None and commit_sha
+                             and validator_name in self.COMMIT_SCOPED_VALIDATORS)
                 
-                if result['status'] == 'success':
-                    successful += 1
-                elif result['status'] == 'failed':
-                    failed += 1
-                elif result['status'] in ['warning', 'no_access']:
-                    warnings += 1
-                elif result['status'] == 'skipped':
-                    skipped += 1
+                if cacheable and cache_key in commit_cache:
+                    result = copy.deepcopy(commit_cache[cache_key])
+                    log.info(f"  ↺ Reusing {validator_name} result for commit {commit_sha[:8]}")
+                else:
+                    result = self._run_validator(validator_name, components, context)
+                    if cacheable:
+                        commit_cache[cache_key] = copy.deepcopy(result)
                 
-                log.info(f"  ✓ {validator_name}: {result['status']} ({execution_time}ms)")
+                log.info(f"  ✓ {validator_name}: {result['status']} "
+                         f"({int((time.time() - validator_start) * 1000)}ms)")
+                return result
                 
             except Exception as e:
                 log.error(f"  ✗ {validator_name} failed: {e}")
-                
-                if VALIDATION_CONFIG_AVAILABLE:
-                    validator_config = get_validator_config(validator_name)
-                    failure_mode = validator_config.get('failure_mode', 'warning')
-                else:
-                    failure_mode = 'warning'
-                
-                if failure_mode == 'critical':
-                    failed += 1
-                    status = 'failed'
-                else:
-                    warnings += 1
-                    status = 'warning'
-                
-                result = {
+                return {
                     'validator': validator_name,
-                    'status': status,
-                    'error': str(e),
-                    'execution_time_ms': int((time.time() - validator_start) * 1000)
+                    'status': failure_status(validator_name),
+                    'error': str(e)
                 }
-                
+        
+        def on_timeout(spec, elapsed: float) -> Dict:
+            return {
+                'validator': spec.name,
+                'status': failure_status(spec.name),
+                'error': f'Timed out after {elapsed:.1f}s (limit {spec.timeout}s)'
+            }
+        
+        # Independent validators run concurrently (see validator_scheduler.py)
+        scheduler_config = get_scheduler_config() if VALIDATION_CONFIG_AVAILABLE else {}
+        specs = build_specs(
+            list(dict.fromkeys(runnable)),
+            {name: get_validator_config(name) for name in runnable} if VALIDATION_CONFIG_AVAILABLE else {},
+            default_timeout=scheduler_config.get('default_timeout_seconds', DEFAULT_TIMEOUT_SECONDS)
+        )
+        # 'parallel': False runs them one at a time, in execution_order
+        max_running = None if scheduler_config.get('parallel', True) else 1
+        results_by_name.update(self._validator_scheduler.run(specs, run_one, on_timeout,
+                                                             max_running=max_running))
+        
+        for validator_name in validators_to_run:
+            result = results_by_name[validator_name]
+            if validator_name not in runnable:
+                no_access += 1
+            elif result['status'] == 'success':
+                successful += 1
+            elif result['status'] == 'failed':
+                failed += 1
+            elif result['status'] in ['warning', 'no_access']:
+                warnings += 1
+            elif result['status'] == 'skipped':
+                skipped += 1
             validation_results.append(result)
         
         total_time = int((time.time() - start_time) * 1000)
+        summed_time = sum(r.get('execution_time_ms', 0) for r in validation_results)
         
         log.info(f"✅ Validators complete: {successful} success, {failed} failed, "
-                f"{warnings} warnings, {skipped} skipped, {no_access} no access ({total_time}ms)")
+                f"{warnings} warnings, {skipped} skipped, {no_access} no access "
+                f"({total_time}ms wall, {summed_time}ms summed)")
         
         return {
             'validation_level': validation_level,
@@ -418,6 +824,8 @@ class DeploymentProver:
             'skipped': skipped,
             'no_access': no_access,
             'total_execution_time_ms': total_time,
+            'summed_validator_time_ms': summed_time,
+            'parallel_speedup': round(summed_time / total_time, 2) if total_time else None,
             'results': validation_results,
             'timestamp': datetime.now().isoformat()
         }
@@ -454,17 +862,46 @@ class DeploymentProver:
     # =========================================================================
     
     
+    def _get_production_index(self, context: Dict) -> ProductionComponentIndex:
+        """Production lookup index from the validator context (built here if the caller didn't)"""
+        index = context.get('production_index')
+        if index is None:
+            index = ProductionComponentIndex(context.get('production_components', []))
+            context['production_index'] = index
+        return index
+    
+    def _get_commit_metadata(self, context: Optional[Dict] = None):
+        """Shared per-SHA Bitbucket payloads (commit, diffstat, diff); None without a git client"""
+        if context is not None and context.get('commit_metadata') is not None:
+            return context['commit_metadata']
+        if self._commit_metadata is None:
+            return None
+        if context is not None:
+            context['commit_metadata'] = self._commit_metadata
+        return self._commit_metadata
+    
+    def _sf_call(self, fn: Callable, *args, **kwargs):
+        """Run a Salesforce call while holding one of the prover's SF slots"""
+        with self._sf_slots:
+            return fn(*args, **kwargs)
+    
+    def _git_get(self, url: str, **kwargs):
+        """GET a Bitbucket URL while holding one of the prover's Bitbucket slots"""
+        with self._git_slots:
+            return self.git.session.get(url, **kwargs)
+    
     def _query_tooling(self, query: str) -> Optional[List[Dict]]:
         """Execute Tooling API query"""
         try:
             log.info(f"      Executing Tooling API query")
-            if hasattr(self.sf, 'toolingexecute'):
-                result = self.sf.toolingexecute(f"query/?q={query}")
+            client = resolve_salesforce(self.sf)
+            if hasattr(client, 'toolingexecute'):
+                result = self._sf_call(self.sf.toolingexecute, f"query/?q={query}")
                 records = result.get('records', []) if result else []
                 log.info(f"      ✓ Tooling API returned {len(records)} record(s)")
                 return records
-            elif hasattr(self.sf, 'tooling'):
-                result = self.sf.tooling.query(query)
+            elif hasattr(client, 'tooling'):
+                result = self._sf_call(self.sf.tooling.query, query)
                 records = result.get('records', []) if result else []
                 log.info(f"      ✓ Tooling API returned {len(records)} record(s)")
                 return records
@@ -489,13 +926,13 @@ class DeploymentProver:
             }
         
         try:
-            production_components = context.get('production_components', [])
+            production_index = self._get_production_index(context)
             
             log.info(f"    🔵 Querying Salesforce for {len(components)} components...")
-            log.info(f"    📚 Using {len(production_components)} pre-fetched production records")
+            log.info(f"    📚 Using {len(production_index.records)} pre-fetched production records")
             
-            from vlocity_query_builder import VlocityQueryBuilder
-            builder = VlocityQueryBuilder()
+            from vlocity_query_builder import get_query_builder
+            builder = get_query_builder()
             
             found_count = 0
             not_found = []
@@ -520,21 +957,8 @@ class DeploymentProver:
                     log.info(f"         🐛 compare_field from config: {compare_field}")
                     log.info(f"         🐛 search_field from config: {comp_config.get('search_field')}")
                     
-                    prod_record = None
-                    for prod_comp in production_components:
-                        prod_type = prod_comp.get('_component_type')
-                        
-                        if prod_type != comp_type:
-                            continue
-                        
-                        # 🎯 USE CONFIGURED COMPARISON FIELD
-                        prod_value = prod_comp.get(compare_field, '')
-                        
-                        log.debug(f"            {compare_field}='{prod_value}' vs cleaned='{cleaned_name}'")
-                        
-                        if prod_value and prod_value.lower() == cleaned_name.lower(): 
-                            prod_record = prod_comp
-                            break
+                    # 🎯 USE CONFIGURED COMPARISON FIELD
+                    prod_record = production_index.find(comp_type, compare_field, cleaned_name)
                             
                     if prod_record:
                         found_count += 1
@@ -622,14 +1046,9 @@ class DeploymentProver:
             
             log.info(f"    🟢 Verifying commit: {commit_sha[:8]}")
             
-            workspace = self.git.workspace
-            repo = self.git.repo
-            url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/commit/{commit_sha}"
-            
-            response = self.git.session.get(url, timeout=5)
+            status_code, commit_data = self._get_commit_metadata(context).commit(commit_sha)
             
-            if response.status_code == 200:
-                commit_data = response.json()
+            if status_code == 200:
                 log.info(f"      ✓ Commit verified: {commit_sha[:8]}")
                 return {
                     'validator': 'commit_exists',
@@ -649,7 +1068,7 @@ class DeploymentProver:
                     'details': {
                         'commit_sha': commit_sha[:8],
                         'exists': False,
-                        'api_status': response.status_code
+                        'api_status': status_code
                     }
                 }
         except Exception as e:
@@ -680,14 +1099,9 @@ class DeploymentProver:
             
             log.info(f"    📁 Getting files from commit...")
             
-            workspace = self.git.workspace
-            repo = self.git.repo
-            url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/diffstat/{commit_sha}"
-            
-            response = self.git.session.get(url, timeout=5)
+            status_code, data = self._get_commit_metadata(context).diffstat(commit_sha)
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 files_changed = len(data.get('values', []))
                 
                 return {
@@ -704,7 +1118,7 @@ class DeploymentProver:
                 return {
                     'validator': 'files_in_commit',
                     'status': 'warning',
-                    'details': {'api_status': response.status_code}
+                    'details': {'api_status': status_code}
                 }
         except Exception as e:
             return {
@@ -748,7 +1162,7 @@ class DeploymentProver:
             repo = self.git.repo
             url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/commit/{commit_sha}"
             
-            response = self.git.session.get(url, timeout=5)
+            response = self._git_get(url, timeout=5)
             if response.status_code != 200:
                 return {
                     'validator': 'component_timestamp',
@@ -777,8 +1191,8 @@ class DeploymentProver:
                         cleaned_name = api_name.replace('CustomField.PartyConsent.', '').replace('__c', '')
                         log.debug(f"      🎯 CUSTOMFIELD TIMESTAMP CLEANED: {api_name} → {cleaned_name}")
                     else:
-                        from vlocity_query_builder import VlocityQueryBuilder
-                        builder = VlocityQueryBuilder()
+                        from vlocity_query_builder import get_query_builder
+                        builder = get_query_builder()
                         cleaned_name = builder._clean_component_name(api_name, comp_type)
                     
                     
@@ -912,7 +1326,7 @@ class DeploymentProver:
             }
         
         try:
-            production_components = context.get('production_components', [])
+            production_index = self._get_production_index(context)
             commit_shas = context.get('commit_shas', [])
             
             if not commit_shas:
@@ -925,23 +1339,21 @@ class DeploymentProver:
             commit_sha = commit_shas[0]
             
             # Get commit date from Git
-            workspace = self.git.workspace
-            repo = self.git.repo
-            url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/commit/{commit_sha}"
-            
-            response = self.git.session.get(url, timeout=5)
-            if response.status_code != 200:
+            status_code, commit_data = self._get_commit_metadata(context).commit(commit_sha)
+            if status_code != 200:
                 return {
                     'validator': 'component_timestamp',
                     'status': 'warning',
-                    'reason': f'Could not get commit date (HTTP {response.status_code})'
+                    'reason': f'Could not get commit date (HTTP {status_code})'
                 }
             
-            commit_data = response.json()
             commit_date_str = commit_data.get('date')
             commit_date = datetime.fromisoformat(commit_date_str.replace('Z', '+00:00'))
             log.info(f"      Git commit date: {commit_date.isoformat()}")
             
+            from vlocity_query_builder import get_query_builder
+            builder = get_query_builder()
+            
             # Track results for ALL components
             matches = 0
             mismatches = 0
@@ -958,8 +1370,6 @@ class DeploymentProver:
                         cleaned_name = api_name.replace('CustomField.PartyConsent.', '').replace('__c', '')
                         log.debug(f"      🎯 CUSTOMFIELD TIMESTAMP CLEANED: {api_name} → {cleaned_name}")
                     else:
-                        from vlocity_query_builder import VlocityQueryBuilder
-                        builder = VlocityQueryBuilder()
                         cleaned_name = builder._clean_component_name(api_name, comp_type)
                     
                     log.debug(f"      Checking: {comp_type}.{cleaned_name}")
@@ -974,21 +1384,9 @@ class DeploymentProver:
                         compare_field = 'Name'
                     
                     # Find matching production component USING CORRECT FIELD
-                    prod_record = None
-                    for prod_comp in production_components:
-                        if prod_comp.get('_component_type') != comp_type:
-                            continue
-                        
-                        # 🎯 USE CORRECT COMPARISON FIELD
-                        prod_value = prod_comp.get(compare_field, '')
-                        
-                        log.debug(f"            {compare_field}='{prod_value}' vs cleaned='{cleaned_name}'")
-                        
-                        # Check if names match (case-insensitive)
-                        if prod_value and prod_value.lower() == cleaned_name.lower():
-                            prod_record = prod_comp
-                            log.debug(f"            ✅ MATCH FOUND for {cleaned_name}")
-                            break
+                    prod_record = production_index.find(comp_type, compare_field, cleaned_name)
+                    if prod_record:
+                        log.debug(f"            ✅ MATCH FOUND for {cleaned_name}")
                     
                     if not prod_record:
                         not_found += 1
@@ -1116,7 +1514,7 @@ class DeploymentProver:
                 LIMIT 5
             """
             
-            result = self.sf.query(query)
+            result = self._sf_call(self.sf.query, query)
             
             if not result or not result.get('records'):
                 return {
@@ -1292,7 +1690,7 @@ class DeploymentProver:
             repo = self.git.repo
             commit_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/commit/{commit_sha}"
             
-            commit_response = self.git.session.get(commit_url, timeout=5)
+            commit_response = self._git_get(commit_url, timeout=5)
             if commit_response.status_code != 200:
                 return {
                     'validator': 'commit_contents',
@@ -1309,7 +1707,7 @@ class DeploymentProver:
             # Step 2: Get files changed in commit
             diffstat_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/diffstat/{commit_sha}"
             
-            response = self.git.session.get(diffstat_url, timeout=5)
+            response = self._git_get(diffstat_url, timeout=5)
             if response.status_code != 200:
                 return {
                     'validator': 'commit_contents',
@@ -1488,41 +1886,35 @@ class DeploymentProver:
             options = validator_config.get('options', {})
             show_diffs = options.get('show_diffs', True)
             max_diff_lines = options.get('max_diff_lines', 50)
+            max_diff_bytes = options.get('max_diff_bytes', 2 * 1024 * 1024)
             exclude_patterns = options.get('exclude_patterns', [])
             
-            workspace = self.git.workspace
-            repo = self.git.repo
+            commit_metadata = self._get_commit_metadata(context)
             
             # Step 1: Get commit metadata
-            commit_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/commit/{commit_sha}"
-            
-            commit_response = self.git.session.get(commit_url, timeout=5)
-            if commit_response.status_code != 200:
+            status_code, commit_data = commit_metadata.commit(commit_sha)
+            if status_code != 200:
                 return {
                     'validator': 'commit_contents',
                     'status': 'warning',
-                    'reason': f'Could not get commit metadata (HTTP {commit_response.status_code})',
+                    'reason': f'Could not get commit metadata (HTTP {status_code})',
                     'notes': [f'⚠️  Could not retrieve commit information']
                 }
             
-            commit_data = commit_response.json()
             commit_message = commit_data.get('message', '').split('\n')[0]
             commit_author = commit_data.get('author', {}).get('user', {}).get('display_name', 'Unknown')
             commit_date = commit_data.get('date', '')
             
             # Step 2: Get diffstat (file list with stats)
-            diffstat_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/diffstat/{commit_sha}"
-            
-            response = self.git.session.get(diffstat_url, timeout=5)
-            if response.status_code != 200:
+            status_code, data = commit_metadata.diffstat(commit_sha)
+            if status_code != 200:
                 return {
                     'validator': 'commit_contents',
                     'status': 'warning',
-                    'reason': f'Could not get commit files (HTTP {response.status_code})',
+                    'reason': f'Could not get commit files (HTTP {status_code})',
                     'notes': [f'⚠️  Could not retrieve file list']
                 }
             
-            data = response.json()
             
             # Extract file changes
             file_changes = []
@@ -1541,15 +1933,13 @@ class DeploymentProver:
             # Step 3: Get actual diff content if enabled
             file_diffs = {}
             if show_diffs:
-                diff_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/diff/{commit_sha}"
-                
-                diff_response = self.git.session.get(diff_url, timeout=10)
-                if diff_response.status_code == 200:
-                    full_diff = diff_response.text
-                    file_diffs = self._parse_diff_by_file(full_diff, exclude_patterns, max_diff_lines)
+                status_code, parsed = commit_metadata.diff(commit_sha, exclude_patterns, max_diff_lines,
+                                                           max_diff_bytes)
+                if status_code == 200:
+                    file_diffs = parsed
                     log.info(f"      Retrieved diffs for {len(file_diffs)} files")
                 else:
-                    log.warning(f"      Could not get diff content: HTTP {diff_response.status_code}")
+                    log.warning(f"      Could not get diff content: HTTP {status_code}")
             
             # Step 4: Map to Salesforce components
             from component_mapper import ComponentMapper
@@ -1677,84 +2067,11 @@ class DeploymentProver:
         Returns:
             Dict mapping file paths to their diff info
         """
-        import re
-        
-        files = {}
-        current_file = None
-        current_lines = []
-        line_count = 0
-        
-        for line in diff_text.split('\n'):
-            # New file header
-            if line.startswith('diff --git'):
-                # Save previous file
-                if current_file and current_lines:
-                    files[current_file] = {
-                        'lines': current_lines,
-                        'truncated': max_lines > 0 and line_count > max_lines
-                    }
-                
-                # Extract file path
-                match = re.search(r'b/(.+)$', line)
-                if match:
-                    current_file = match.group(1)
-                    current_lines = []
-                    line_count = 0
-                    
-                    # Check if we should skip this file
-                    should_skip = False
-                    for pattern in exclude_patterns:
-                        if pattern.startswith('*.'):
-                            # Extension pattern
-                            ext = pattern[1:]  # Remove *
-                            if current_file.endswith(ext):
-                                should_skip = True
-                                break
-                        elif current_file.endswith(pattern):
-                            should_skip = True
-                            break
-                    
-                    if should_skip:
-                        current_file = None
-            
-            # Skip if we're not tracking this file
-            if current_file is None:
-                continue
-            
-            # Skip if we've hit the line limit
-            if max_lines > 0 and line_count >= max_lines:
-                continue
-            
-            # Hunk header (@@ ... @@)
-            if line.startswith('@@'):
-                if current_lines:  # Add spacing between hunks
-                    current_lines.append('')
-                current_lines.append(line)
-                line_count += 1
-            
-            # Added line
-            elif line.startswith('+') and not line.startswith('+++'):
-                current_lines.append(f"+ {line[1:]}")  # Green/added
-                line_count += 1
-            
-            # Removed line
-            elif line.startswith('-') and not line.startswith('---'):
-                current_lines.append(f"- {line[1:]}")  # Red/removed
-                line_count += 1
-            
-            # Context line (unchanged)
-            elif line.startswith(' '):
-                current_lines.append(f"  {line[1:]}")  # Gray/context
-                line_count += 1
-        
-        # Save last file
-        if current_file and current_lines:
-            files[current_file] = {
-                'lines': current_lines,
-                'truncated': max_lines > 0 and line_count > max_lines
-            }
-        
-        return files
+        from diff_stream import parse_diff_lines
+        return parse_diff_lines(
+            (line.encode('utf-8') for line in diff_text.split('\n')),
+            exclude_patterns, max_lines
+        )
     
   
 
@@ -1767,8 +2084,11 @@ class DeploymentProver:
         valid_stories = []
         invalid_stories = []
         
+        # One bulk load for all stories instead of two queries per story
+        story_data_by_name = self._get_story_data_bulk(story_names)
+        
         for story_name in story_names:
-            story_data = self._get_story_data(story_name)
+            story_data = story_data_by_name.get(story_name)
             
             if not story_data:
                 invalid_stories.append({
@@ -1823,95 +2143,120 @@ class DeploymentProver:
     
     def _get_story_data(self, story_name: str) -> Optional[Dict]:
         """Get story data from Copado with components"""
+        return self._get_story_data_bulk([story_name]).get(story_name)
+    
+    def _get_story_data_bulk(self, story_names: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Get story data for many stories with a few chunked IN queries
+        
+        Fetches commits and metadata for all stories at once and picks the latest
+        commit per story client-side.
+        
+        Returns:
+            Dict mapping each requested story name to the same dict _get_story_data
+            returns, or None if the story has no commit data
+        """
         if self.mock_mode:
-            return self._get_mock_story_data(story_name)
+            return {name: self._get_mock_story_data(name) for name in story_names}
+        
+        story_data: Dict[str, Optional[Dict]] = {name: None for name in story_names}
+        if not story_names:
+            return story_data
         
         try:
-            # Get commit SHA
-            commit_query = f"""
+            from salesforce_client import soql_in_batches
+            
+            # SOQL string comparison is case-insensitive; map results back to the requested names
+            requested = {}
+            for name in story_names:
+                requested.setdefault(name.lower(), []).append(name)
+            unique_names = [names[0] for names in requested.values()]
+            
+            # Step 1: Latest commit per story
+            commit_template = """
             SELECT 
                 copado__External_Id__c,
+                CreatedDate,
                 copado__User_Story__r.Name,
                 copado__User_Story__r.copado__Environment__r.Name,
                 copado__User_Story__r.copado__Status__c
             FROM copado__User_Story_Commit__c 
-            WHERE copado__User_Story__r.Name = '{story_name}'
-            ORDER BY CreatedDate DESC 
-            LIMIT 1
+            WHERE copado__User_Story__r.Name IN {values}
             """
             
-            commit_result = self.sf.query(commit_query)
-            if not commit_result['records']:
-                log.warning(f"No commits found for story {story_name}")
-                return None
-            
-            commit_record = commit_result['records'][0]
-            commit_sha = self._extract_commit_sha(commit_record, story_name)
-            
-            story_env = commit_record.get('copado__User_Story__r', {}).get('copado__Environment__r', {}).get('Name', 'Unknown')
-            story_status = commit_record.get('copado__User_Story__r', {}).get('copado__Status__c', 'Unknown')
-            
-            log.info(f"📋 Story: {story_name}, Env: {story_env}, Status: {story_status}, Commit: {commit_sha[:8] if commit_sha else 'None'}")
+            latest_commits: Dict[str, Dict] = {}
+            commit_batches = soql_in_batches(unique_names, commit_template)
+            for _, query in commit_batches:
+                result = self._sf_call(self.sf.query_all, query)
+                for record in (result or {}).get('records', []):
+                    key = ((record.get('copado__User_Story__r') or {}).get('Name') or '').lower()
+                    if key not in requested:
+                        continue
+                    current = latest_commits.get(key)
+                    if current is None or (record.get('CreatedDate') or '') > (current.get('CreatedDate') or ''):
+                        latest_commits[key] = record
             
-            # Query Copado metadata table for components
-            metadata_query = f"""
+            # Step 2: Metadata rows for the stories that have a commit
+            components_by_story: Dict[str, List[Dict]] = {key: [] for key in latest_commits}
+            metadata_template = """
             SELECT 
+                copado__User_Story__r.Name,
                 copado__Metadata_API_Name__c,
                 copado__Type__c,
                 copado__Action__c
             FROM copado__User_Story_Metadata__c
-            WHERE copado__User_Story__r.Name = '{story_name}'
+            WHERE copado__User_Story__r.Name IN {values}
             AND copado__Action__c != 'Destructive Changes'
             """
             
-            log.info(f"🔍 Querying Copado metadata table...")
-            log.info(f"   Query: {metadata_query.strip()}")
-            
-            metadata_result = self.sf.query(metadata_query)
-            
-            log.info(f"📊 Query result: {metadata_result}")
-            
-            # Map to components
-            components = []
-            if metadata_result and metadata_result.get('records'):
-                record_count = len(metadata_result['records'])
-                log.info(f"   ✅ Found {record_count} metadata records")
-                
-                for i, record in enumerate(metadata_result['records']):
+            names_with_commits = [requested[key][0] for key in latest_commits]
+            batches = soql_in_batches(names_with_commits, metadata_template) if names_with_commits else []
+            for _, query in batches:
+                result = self._sf_call(self.sf.query_all, query)
+                for record in (result or {}).get('records', []):
+                    key = ((record.get('copado__User_Story__r') or {}).get('Name') or '').lower()
                     api_name = record.get('copado__Metadata_API_Name__c')
                     comp_type = record.get('copado__Type__c')
-                    action = record.get('copado__Action__c')
-                    
-                    if i < 3:
-                        log.info(f"   [{i+1}] {comp_type}: {api_name} (Action: {action})")
-                    
-                    if api_name and comp_type:
-                        components.append({
+                    if key in components_by_story and api_name and comp_type:
+                        components_by_story[key].append({
                             'api_name': api_name,
                             'type': comp_type,
-                            'action': action or 'Unknown'
+                            'action': record.get('copado__Action__c') or 'Unknown'
                         })
-                
-                if record_count > 3:
-                    log.info(f"   ... and {record_count - 3} more")
-            else:
-                log.warning(f"   ⚠️  No metadata records found")
             
-            log.info(f"✅ Story {story_name}: {len(components)} components extracted")
+            log.info(f"📋 Loaded {len(latest_commits)}/{len(unique_names)} stories with commits "
+                     f"using {len(commit_batches) + len(batches)} queries")
             
-            return {
-                'story_name': story_name,
-                'commit_sha': commit_sha,
-                'environment': story_env,
-                'status': story_status,
-                'components': components
-            }
+            # Step 3: Build the per-story dicts
+            for key, commit_record in latest_commits.items():
+                for story_name in requested[key]:
+                    commit_sha = self._extract_commit_sha(commit_record, story_name)
+                    story_env = (commit_record.get('copado__User_Story__r') or {}).get('copado__Environment__r', {}).get('Name', 'Unknown')
+                    story_status = (commit_record.get('copado__User_Story__r') or {}).get('copado__Status__c', 'Unknown')
+                    components = list(components_by_story[key])
+                    
+                    log.info(f"📋 Story: {story_name}, Env: {story_env}, Status: {story_status}, "
+                             f"Commit: {commit_sha[:8] if commit_sha else 'None'}, Components: {len(components)}")
+                    
+                    story_data[story_name] = {
+                        'story_name': story_name,
+                        'commit_sha': commit_sha,
+                        'environment': story_env,
+                        'status': story_status,
+                        'components': components
+                    }
+            
+            for key, names in requested.items():
+                if key not in latest_commits:
+                    log.warning(f"No commits found for story {names[0]}")
+            
+            return story_data
             
         except Exception as e:
             log.error(f"❌ Error getting story data: {e}")
             import traceback
             log.error(traceback.format_exc())
-            return None
+            return story_data
     
     def _validate_story_status(self, story_data: Dict) -> Dict:
         """Validate that story is not cancelled"""
@@ -1986,7 +2331,7 @@ class DeploymentProver:
             WHERE copado__User_Story__r.copado__Release__r.Name = '{release_name}'
             """
             
-            result = self.sf.query(query)
+            result = self._sf_call(self.sf.query, query)
             story_names = list(set([record['copado__User_Story__r']['Name'] for record in result['records']]))
             
             log.info(f"Found {len(story_names)} stories in release {release_name}")
@@ -2006,7 +2351,7 @@ class DeploymentProver:
             url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/diffstat/{commit_sha}"
             
             # Use the client's session to maintain authentication
-            response = self.git.session.get(url)
+            response = self._git_get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -2174,7 +2519,7 @@ class DeploymentProver:
             names_str = ", ".join([f"'{name}'" for name in comp_names])
             
             query = bulk_query.format(names=names_str)
-            result = self.sf.query(query)
+            result = self._sf_call(self.sf.query, query)
             
             existing_components = {rec['Name']: rec for rec in result['records']}
             
@@ -2270,7 +2615,7 @@ class DeploymentProver:
         """Get user stories from a release"""
         from salesforce_client import get_user_stories_from_release
         log.info(f"DeploymentProver: Getting stories for release {release_name}")
-        stories = get_user_stories_from_release(self.sf, release_name)
+        stories = self._sf_call(get_user_stories_from_release, self.sf, release_name)
         log.info(f"DeploymentProver: Got {len(stories)} stories")
         return stories
      
@@ -2363,7 +2708,7 @@ class DeploymentProver:
             log.info("=" * 80)
             log.info("🔷 FETCHING VLOCITY COMPONENTS...")
             log.info("=" * 80)
-            vlocity_prod = fetch_vlocity_component_state(self.sf, vlocity)
+            vlocity_prod = self._sf_call(fetch_vlocity_component_state, self.sf, vlocity)
             all_production.extend(vlocity_prod)
             log.info(f"   ✅ Vlocity: Found {len(vlocity_prod)} records")
         
@@ -2392,7 +2737,7 @@ class DeploymentProver:
         """
         
         
-        from vlocity_query_builder import VlocityQueryBuilder
+        from vlocity_query_builder import get_query_builder
         
         try:
             from validation_config import get_component_query_config
@@ -2400,7 +2745,7 @@ class DeploymentProver:
         except ImportError:
             config_available = False
         
-        builder = VlocityQueryBuilder()
+        builder = get_query_builder()
         all_records = []
         
         for comp in components:
@@ -2447,7 +2792,7 @@ class DeploymentProver:
                     records = result if result else []
                 else:
                     # Use standard SOQL
-                    result = self.sf.query(query)
+                    result = self._sf_call(self.sf.query, query)
                     records = result.get('records', []) if result else []
                 
                 if records:
@@ -2486,8 +2831,8 @@ class DeploymentProver:
         except ImportError:
             config_available = False
         
-        from vlocity_query_builder import VlocityQueryBuilder
-        builder = VlocityQueryBuilder()
+        from vlocity_query_builder import get_query_builder
+        builder = get_query_builder()
         all_records = []
         
         for comp in components:
@@ -2538,7 +2883,7 @@ class DeploymentProver:
                     records = result if result else []
                 else:
                     # Use standard SOQL
-                    result = self.sf.query(query)
+                    result = self._sf_call(self.sf.query, query)
                     records = result.get('records', []) if result else []
                 
                 if records:
@@ -2564,6 +2909,11 @@ class DeploymentProver:
         """
         Fetch components using configuration-driven approach
         
+        Components are grouped by (object, name_field, api) from COMPONENT_QUERY_CONFIG
+        and fetched with chunked IN (...) queries instead of one query per component.
+        At most one record is kept per (component type, name), matching the old
+        per-component LIMIT 1 behaviour.
+        
         Args:
             components: List of components to fetch
             api_type: 'soql' or 'tooling'
@@ -2578,9 +2928,12 @@ class DeploymentProver:
         except ImportError:
             config_available = False
         
-        from vlocity_query_builder import VlocityQueryBuilder
-        builder = VlocityQueryBuilder()
-        all_records = []
+        from salesforce_client import soql_in_batches
+        from vlocity_query_builder import get_query_builder
+        builder = get_query_builder()
+        
+        # (object, name_field, api) -> {'date_fields': [...], 'names': {lower_name: {'name', 'types'}}}
+        groups: Dict[Tuple[str, str, str], Dict] = {}
         
         for comp in components:
             comp_type = comp.get('type')
@@ -2589,66 +2942,85 @@ class DeploymentProver:
             # 🎯 CUSTOMFIELD CLEANING
             if comp_type == 'CustomField':
                 cleaned_name = api_name.replace('CustomField.PartyConsent.', '').replace('__c', '')
-                log.info(f"   🎯 CUSTOMFIELD CLEANED: {api_name} → {cleaned_name}")
+                log.debug(f"   🎯 CUSTOMFIELD CLEANED: {api_name} → {cleaned_name}")
             else:
                 # Use vlocity_query_builder for other components
                 cleaned_name = builder._clean_component_name(api_name, comp_type)
             
-            log.info(f"   🔍 Querying {api_type.upper()} for: {comp_type}.{cleaned_name}")
+            config = get_component_query_config(comp_type) if config_available else None
+            if not config:
+                log.warning(f"      ⚠️  No config for {comp_type}, skipping")
+                continue
             
-            try:
-                # Get query configuration
-                if config_available:
-                    config = get_component_query_config(comp_type)
-                else:
-                    config = None
-                
-                if not config:
-                    log.warning(f"      ⚠️  No config for {comp_type}, skipping")
-                    continue
-                
-                # Extract config
-                object_name = config['object']
-                name_field = config['name_field']
-                date_field = config.get('date_field', 'LastModifiedDate')
-                query_api = config.get('api', 'soql')
-                
-                # Build query
-                query = f"""
-                    SELECT Id, {name_field}, {date_field}, CreatedDate
-                    FROM {object_name}
-                    WHERE {name_field} = '{cleaned_name}'
-                    LIMIT 1
-                """
-                
+            query_api = 'tooling' if (config.get('api', 'soql') == 'tooling' or api_type == 'tooling') else 'soql'
+            group_key = (config['object'], config['name_field'], query_api)
+            group = groups.setdefault(group_key, {'date_fields': [], 'names': {}})
+            
+            date_field = config.get('date_field', 'LastModifiedDate')
+            if date_field not in group['date_fields']:
+                group['date_fields'].append(date_field)
+            
+            entry = group['names'].setdefault(cleaned_name.lower(), {'name': cleaned_name, 'types': []})
+            if comp_type not in entry['types']:
+                entry['types'].append(comp_type)
+        
+        all_records = []
+        
+        for (object_name, name_field, query_api), group in groups.items():
+            fields = ['Id', name_field]
+            for field in group['date_fields'] + ['CreatedDate']:
+                if field not in fields:
+                    fields.append(field)
+            
+            template = f"SELECT {', '.join(fields)} FROM {object_name} WHERE {name_field} IN {{values}}"
+            names = [entry['name'] for entry in group['names'].values()]
+            batches = soql_in_batches(names, template)
+            
+            log.info(f"   🔍 Querying {query_api.upper()} {object_name}.{name_field}: "
+                     f"{len(names)} name(s) in {len(batches)} batch(es)")
+            
+            # One record per (type, name), like the old per-component LIMIT 1
+            filled = set()
+            
+            for batch, query in batches:
                 log.debug(f"      Query: {query}")
+                try:
+                    if query_api == 'tooling':
+                        records = self._query_tooling(query) or []
+                    else:
+                        result = self._sf_call(self.sf.query_all, query)
+                        records = result.get('records', []) if result else []
+                except Exception as e:
+                    log.error(f"      ❌ Error fetching {object_name} batch ({len(batch)} names): {e}")
+                    import traceback
+                    log.debug(traceback.format_exc())
+                    continue
                 
-                # Execute based on API type
-                if query_api == 'tooling' or api_type == 'tooling':
-                    # Use Tooling API
-                    result = self._query_tooling(query)
-                    records = result if result else []
-                else:
-                    # Use standard SOQL
-                    result = self.sf.query(query)
-                    records = result.get('records', []) if result else []
-                
-                if records:
-                    for record in records:
+                for record in records:
+                    value = record.get(name_field)
+                    entry = group['names'].get(value.lower()) if isinstance(value, str) else None
+                    if not entry:
+                        continue
+                    
+                    for comp_type in entry['types']:
+                        if (comp_type, value.lower()) in filled:
+                            continue
+                        filled.add((comp_type, value.lower()))
+                        
+                        tagged = dict(record) if len(entry['types']) > 1 else record
                         # Tag with component type
-                        record['_component_type'] = comp_type
+                        tagged['_component_type'] = comp_type
                         # Normalize field name
-                        if name_field != 'Name' and 'Name' not in record:
-                            record['Name'] = record.get(name_field)
-                        all_records.append(record)
-                    log.info(f"      ✅ Found: {cleaned_name}")
-                else:
-                    log.warning(f"      ✗ Not found: {cleaned_name}")
-                    
-            except Exception as e:
-                log.error(f"      ❌ Error fetching {api_name}: {e}")
-                import traceback
-                log.debug(traceback.format_exc())
+                        if name_field != 'Name' and 'Name' not in tagged:
+                            tagged['Name'] = tagged.get(name_field)
+                        all_records.append(tagged)
+            
+            missing = [entry['name'] for key, entry in group['names'].items()
+                       if not all((t, key) in filled for t in entry['types'])]
+            log.info(f"      ✅ Found {len(names) - len(missing)}/{len(names)}")
+            if missing:
+                log.warning(f"      ✗ Not found: {', '.join(missing[:10])}"
+                            f"{' …' if len(missing) > 10 else ''}")
         
         return all_records
     
@@ -2686,8 +3058,8 @@ class DeploymentProver:
                         cleaned_name = api_name.replace('CustomField.PartyConsent.', '').replace('__c', '')
                         log.debug(f"      🎯 CUSTOMFIELD VALIDATION CLEANED: {api_name} → {cleaned_name}")
                     else:
-                        from vlocity_query_builder import VlocityQueryBuilder
-                        builder = VlocityQueryBuilder()
+                        from vlocity_query_builder import get_query_builder
+                        builder = get_query_builder()
                         cleaned_name = builder._clean_component_name(api_name, comp_type)
                     
                     log.debug(f"      Checking: {comp_type}.{cleaned_name} (original: {api_name})")
@@ -2781,7 +3153,7 @@ class DeploymentProver:
     def _fetch_standard_components(self, components: List[Dict]) -> List[Dict]:
         """Fetch standard components using SOQL (uses existing logic)"""
         from salesforce_client import fetch_production_component_state
-        return fetch_production_component_state(self.sf, components)
+        return self._sf_call(fetch_production_component_state, self.sf, components)
         
     def _execute_verification_method(self, method_name: str, component: Dict, 
                                     commit_sha: str, target_env: str, target_branch: str) -> Dict:
@@ -2811,19 +3183,19 @@ class DeploymentProver:
     
     
     
-    def _calculate_overall_proof(self, proof_results: List[Dict]) -> Dict:
+    def _calculate_overall_proof(self, proof_results: List[Dict],
+                                 validation: Optional[Dict] = None) -> Dict:
         """
         Calculate overall proof based on VALIDATOR RESULTS
         
         This is the NEW VERSION that uses the validation results instead of 
         the old component proof logic.
         
-        NOTE: This should be called AFTER validators have executed, and it will
-        look at self._last_validation_results to determine the overall proof.
+        NOTE: Pass the _execute_validators result as `validation`. It is taken
+        as an argument (not instance state) so concurrent proofs stay isolated.
         """
         # Use validator results if available
-        if hasattr(self, '_last_validation_results'):
-            validation = self._last_validation_results
+        if validation is not None:
             
             successful = validation.get('successful', 0)
             failed = validation.get('failed', 0)
@@ -3060,6 +3432,15 @@ class DeploymentProver:
             "mock_mode": self.mock_mode
         }
     
+    def _story_exception_result(self, story_name: str, error: Exception) -> Dict:
+        """Per-story result for a story whose proof raised, in the shape format_bulk_response expects"""
+        return {
+            'stories': {'requested': [story_name], 'valid': [], 'invalid': [story_name]},
+            'overall_proof': {'verdict': 'UNPROVEN', 'confidence': 'very low', 'score': 0.0},
+            'summary': {'total_components': 0, 'proven_components': 0},
+            'error': str(error)
+        }
+    
     def _extract_commit_sha(self, commit_record: Dict, story_name: str) -> Optional[str]:
         """Extract commit SHA from various Copado fields"""
         commit_sha = None
@@ -3401,97 +3782,16 @@ class DeploymentProver:
         """
         Transform results into UI-friendly format
         """
-        execution_time = str(datetime.now() - start_time)
-        
-        # Calculate statistics
-        total_stories = len(results)
-        proven_count = 0
-        partial_count = 0
-        unproven_count = 0
-        
-        for r in results:
-            verdict = r.get('overall_proof', {}).get('verdict', 'UNPROVEN')
-            if verdict == 'PROVEN':
-                proven_count += 1
-            elif verdict in ['LIKELY PROVEN', 'POSSIBLY PROVEN']:
-                partial_count += 1
-            else:
-                unproven_count += 1
-        
-        # Component statistics
-        total_components = 0
-        proven_components = 0
-        component_types = {}
-        
-        for result in results:
-            total_components += result.get('summary', {}).get('total_components', 0)
-            proven_components += result.get('summary', {}).get('proven_components', 0)
-            
-            for comp in result.get('component_proofs', []):
-                comp_type = comp.get('component', {}).get('type', 'Unknown')
-                component_types[comp_type] = component_types.get(comp_type, 0) + 1
-        
-        # Build story list
-        stories = []
-        all_authors = set()
-        all_statuses = set()
-        errors = []
-        
+        builder = BulkResponseBuilder(self)
         for result in results:
-            try:
-                story_summary = self._format_story_summary(result)
-                stories.append(story_summary)
-                all_authors.add(story_summary['commit']['author'])
-                all_statuses.add(story_summary['status'])
-            except Exception as e:
-                story_id = result.get('stories', {}).get('requested', ['Unknown'])[0]
-                errors.append({
-                    'story_id': story_id,
-                    'error_type': 'formatting_error',
-                    'message': str(e),
-                    'severity': 'warning'
-                })
-                log.error(f"Error formatting story {story_id}: {e}")
-        
-        # Build response
-        success_rate = round((proven_count / total_stories * 100) if total_stories > 0 else 0, 1)
-        
-        return {
-            'overview': {
-                'total_stories': total_stories,
-                'processing_time': execution_time,
-                'timestamp': datetime.now().isoformat(),
-                'summary': {
-                    'proven': proven_count,
-                    'unproven': unproven_count,
-                    'partial': partial_count,
-                    'success_rate': success_rate
-                },
-                'component_summary': {
-                    'total_components': total_components,
-                    'proven_components': proven_components,
-                    'unproven_components': total_components - proven_components,
-                    'component_types': component_types
-                },
-                'validation_summary': {
-                    'all_validators_passed': sum(1 for r in results 
-                        if r.get('validation', {}).get('failed', 0) == 0),
-                    'some_validators_failed': sum(1 for r in results 
-                        if r.get('validation', {}).get('failed', 0) > 0),
-                    'critical_failures': unproven_count
-                }
-            },
-            'stories': stories,
-            'filters': {
-                'statuses': sorted(list(all_statuses)),
-                'authors': sorted(list(all_authors)),
-                'environments': list(set(r.get('environment') for r in results)),
-                'component_types': sorted(component_types.keys())
-            },
-            'errors': errors
-        }
+            builder.add(result)
+        return builder.build(start_time)
 
 
+    def summarize_story(self, result: Dict) -> Dict:
+        """One 'stories' entry of format_bulk_response, for results reported one at a time"""
+        return self._format_story_summary(result)
+    
     def _format_story_summary(self, result: Dict) -> Dict:
         """Format single story for UI display"""
         
@@ -0,0 +1,154 @@
+# diff_stream.py
+"""
+Streaming unified-diff reader for Bitbucket /diff/{sha} responses.
+
+The commit_contents validator only shows the first few lines of each file, so
+there is no point holding a multi-MB diff in memory. Lines are read straight
+off the response as bytes and only decoded when they are kept:
+
+- files matching an exclude pattern are skipped without decoding/buffering
+- once a file reaches max_lines, the rest of its hunk lines are dropped
+- reading stops (and the connection is released) after max_bytes
+"""
+import logging
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Longest line we keep in memory; anything beyond is dropped (minified JSON, static resources)
+MAX_LINE_BYTES = 8 * 1024
+
+_HEADER_PATH_RE = re.compile(r' b/(.+)$')
+
+
+def iter_lines(chunks: Iterable[bytes], max_bytes: int = 0,
+               max_line_bytes: int = MAX_LINE_BYTES) -> Iterator[bytes]:
+    """
+    Split a byte-chunk stream into lines (without the newline).
+    Stops after max_bytes have been read (0 = no limit). Over-long lines are
+    cut at max_line_bytes rather than buffered whole.
+    """
+    pending = b''
+    overflow = False
+    read = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if max_bytes:
+            chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+
+        start = 0
+        while True:
+            nl = chunk.find(b'\n', start)
+            if nl < 0:
+                break
+            if not overflow:
+                yield (pending + chunk[start:nl])[:max_line_bytes]
+            pending = b''
+            overflow = False
+            start = nl + 1
+
+        if not overflow:
+            pending += chunk[start:]
+            if len(pending) > max_line_bytes:
+                yield pending[:max_line_bytes]
+                pending = b''
+                overflow = True
+
+        if max_bytes and read >= max_bytes:
+            log.info(f"      Diff byte budget reached ({max_bytes // 1024} KB); stopped reading")
+            return
+
+    if pending and not overflow:
+        yield pending
+
+
+def _is_excluded(path: str, exclude_patterns: List[str]) -> bool:
+    for pattern in exclude_patterns:
+        if pattern.startswith('*.'):
+            if path.endswith(pattern[1:]):
+                return True
+        elif path.endswith(pattern):
+            return True
+    return False
+
+
+def parse_diff_lines(lines: Iterable[bytes], exclude_patterns: List[str],
+                     max_lines: int) -> Dict[str, Dict]:
+    """
+    Per-file changes from unified diff lines (bytes).
+
+    Returns {path: {'lines': [...], 'truncated': bool}} in the same display
+    format as DeploymentProver._parse_diff_by_file always produced.
+    """
+    files: Dict[str, Dict] = {}
+    current: Optional[Dict] = None
+    skipping = True
+
+    for line in lines:
+        if line.startswith(b'diff --git'):
+            current = None
+            skipping = True
+            match = _HEADER_PATH_RE.search(line.decode('utf-8', 'replace').rstrip('\r'))
+            if match and not _is_excluded(match.group(1), exclude_patterns):
+                current = {'path': match.group(1), 'lines': [], 'count': 0, 'truncated': False}
+                skipping = False
+                # Registered on first kept line so header-only files (binary, mode changes) are left out
+            continue
+
+        if skipping:
+            continue
+
+        first = line[:1]
+        if first == b'@':
+            if not line.startswith(b'@@'):
+                continue
+        elif first == b'+':
+            if line.startswith(b'+++'):
+                continue
+        elif first == b'-':
+            if line.startswith(b'---'):
+                continue
+        elif first != b' ':
+            continue
+
+        if max_lines > 0 and current['count'] >= max_lines:
+            current['truncated'] = True
+            continue
+
+        text = line.decode('utf-8', 'replace').rstrip('\r')
+        out = current['lines']
+        if first == b'@':
+            if out:  # Add spacing between hunks
+                out.append('')
+            out.append(text)
+        elif first == b'+':
+            out.append(f"+ {text[1:]}")
+        elif first == b'-':
+            out.append(f"- {text[1:]}")
+        else:
+            out.append(f"  {text[1:]}")
+        current['count'] += 1
+
+        if current['count'] == 1:
+            files[current['path']] = current
+
+    return {
+        path: {'lines': info['lines'], 'truncated': info['truncated']}
+        for path, info in files.items()
+    }
+
+
+def parse_diff_response(response, exclude_patterns: List[str], max_lines: int,
+                        max_bytes: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Dict]:
+    """Parse a streamed (stream=True) diff response, then release the connection"""
+    try:
+        return parse_diff_lines(
+            iter_lines(response.iter_content(chunk_size=chunk_size), max_bytes=max_bytes),
+            exclude_patterns, max_lines,
+        )
+    finally:
+        response.close()
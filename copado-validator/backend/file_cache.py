@@ -0,0 +1,405 @@
+# file_cache.py
+"""
+Persistent Bitbucket file cache shared by every BitBucketClient in every worker.
+
+Contents are stored once per distinct blob (sha256 of the text) and mapped from
+(repo, commit, path). A file at a given commit never changes, so entries are
+never invalidated - only evicted (least recently used) when the store grows past
+its size cap. Commit graph edges and per-commit payloads (diffstats, diffs) count
+against the same cap and are evicted alongside blobs. Branch names are resolved to commits through a short-TTL ref table
+before any lookup, so a branch move is picked up within the TTL.
+
+SQLite in WAL mode gives cross-process sharing without a separate service.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import get_config
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs(last_access);
+
+CREATE TABLE IF NOT EXISTS files (
+    repo TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    path TEXT NOT NULL,
+    blob_hash TEXT,                 -- NULL = file does not exist at this commit
+    PRIMARY KEY (repo, commit_sha, path)
+);
+CREATE INDEX IF NOT EXISTS idx_files_blob ON files(blob_hash);
+
+CREATE TABLE IF NOT EXISTS trees (
+    repo TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    paths TEXT NOT NULL,            -- JSON list of file paths directly in dir
+    last_access REAL NOT NULL,
+    PRIMARY KEY (repo, commit_sha, dir)
+);
+
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    parents TEXT NOT NULL,          -- JSON list of parent hashes
+    date TEXT,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (repo, commit_sha)
+);
+CREATE INDEX IF NOT EXISTS idx_commits_last_access ON commits(last_access);
+
+CREATE TABLE IF NOT EXISTS commit_payloads (
+    repo TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    kind TEXT NOT NULL,             -- 'commit', 'diffstat', 'diff:<options>'
+    payload TEXT NOT NULL,          -- JSON
+    last_access REAL NOT NULL,
+    PRIMARY KEY (repo, commit_sha, kind)
+);
+CREATE INDEX IF NOT EXISTS idx_commit_payloads_last_access ON commit_payloads(last_access);
+
+CREATE TABLE IF NOT EXISTS refs (
+    repo TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (repo, ref)
+);
+"""
+
+# Directory listings are small; drop ones nobody has read for a week
+_TREE_MAX_AGE = 7 * 24 * 3600
+
+# Commit graph rows and commit payloads nobody has read for a month
+_COMMIT_MAX_AGE = 30 * 24 * 3600
+
+# Every evictable row with its approximate size, oldest first
+_LRU_QUERY = """
+SELECT 'blob', hash, size, last_access FROM blobs
+UNION ALL
+SELECT 'payload', rowid, LENGTH(payload), last_access FROM commit_payloads
+UNION ALL
+SELECT 'commit', rowid, LENGTH(commit_sha) + LENGTH(parents) + COALESCE(LENGTH(date), 0), last_access FROM commits
+ORDER BY last_access
+"""
+
+# Check the size cap every N writes (or after 5% of the cap is written) rather than on every put
+_EVICT_CHECK_EVERY = 50
+_EVICT_CHECK_FRACTION = 0.05
+
+
+class FileContentCache:
+    """SQLite-backed (repo, commit, path) -> content cache with LRU size cap"""
+
+    def __init__(self, path: str, max_bytes: int, ref_ttl: float = 30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ref_ttl = ref_ttl
+        self._local = threading.local()
+        self._writes = 0
+        self._bytes_since_check = 0
+        self._writes_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        log.info(f"🗄️  File cache at {path} (cap {max_bytes // (1024 * 1024)} MB, ref TTL {ref_ttl}s)")
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite handles cross-process locking"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _record_write(self, size: int) -> None:
+        """Run eviction every few writes, or once enough bytes have been written"""
+        with self._writes_lock:
+            self._writes += 1
+            self._bytes_since_check += size
+            check = (self._writes % _EVICT_CHECK_EVERY == 0
+                     or self._bytes_since_check >= self.max_bytes * _EVICT_CHECK_FRACTION)
+            if check:
+                self._bytes_since_check = 0
+        if check:
+            self.evict()
+
+    # ------------------------------------------------------------------
+    # File contents
+    # ------------------------------------------------------------------
+
+    def get(self, repo: str, commit_sha: str, path: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (hit, content). content is None on a hit for a file that was
+        recorded as missing at that commit.
+        """
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT f.blob_hash, b.content FROM files f "
+                "LEFT JOIN blobs b ON b.hash = f.blob_hash "
+                "WHERE f.repo = ? AND f.commit_sha = ? AND f.path = ?",
+                (repo, commit_sha, path),
+            ).fetchone()
+            if row is None:
+                return False, None
+
+            blob_hash, content = row
+            if blob_hash is None:
+                return True, None
+            if content is None:
+                # Blob was evicted; treat as a miss so it gets re-fetched
+                return False, None
+
+            conn.execute("UPDATE blobs SET last_access = ? WHERE hash = ?", (time.time(), blob_hash))
+            return True, content
+        except sqlite3.Error as e:
+            log.warning(f"File cache read failed for {path}@{commit_sha[:8]}: {e}")
+            return False, None
+
+    def put(self, repo: str, commit_sha: str, path: str, content: Optional[str]) -> None:
+        """Record content (or None for 'does not exist') for path at commit_sha"""
+        try:
+            conn = self._conn()
+            blob_hash = None
+            size = 0
+            if content is not None:
+                data = content.encode("utf-8", "surrogatepass")
+                blob_hash = hashlib.sha256(data).hexdigest()
+                size = len(data)
+                conn.execute(
+                    "INSERT INTO blobs(hash, content, size, last_access) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(hash) DO UPDATE SET last_access = excluded.last_access",
+                    (blob_hash, content, size, time.time()),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO files(repo, commit_sha, path, blob_hash) VALUES (?, ?, ?, ?)",
+                (repo, commit_sha, path, blob_hash),
+            )
+        except sqlite3.Error as e:
+            log.warning(f"File cache write failed for {path}@{commit_sha[:8]}: {e}")
+            return
+
+        self._record_write(size)
+
+    def evict(self) -> int:
+        """Drop stale commit rows, then least recently used entries until the store is under max_bytes"""
+        try:
+            conn = self._conn()
+            now = time.time()
+            conn.execute("DELETE FROM trees WHERE last_access < ?", (now - _TREE_MAX_AGE,))
+            conn.execute("DELETE FROM commits WHERE last_access < ?", (now - _COMMIT_MAX_AGE,))
+            conn.execute("DELETE FROM commit_payloads WHERE last_access < ?", (now - _COMMIT_MAX_AGE,))
+
+            # Evict down to 90% of the cap so we don't churn on every write
+            target = int(self.max_bytes * 0.9)
+            removed = 0
+            freed = 0
+            # Size is read under the write lock so concurrent evictors don't double-count
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM ({_LRU_QUERY})").fetchone()[0]
+                if total <= self.max_bytes:
+                    conn.execute("COMMIT")
+                    return 0
+                for kind, key, size, _ in conn.execute(_LRU_QUERY).fetchall():
+                    if total - freed <= target:
+                        break
+                    if kind == "blob":
+                        conn.execute("DELETE FROM blobs WHERE hash = ?", (key,))
+                        conn.execute("DELETE FROM files WHERE blob_hash = ?", (key,))
+                    elif kind == "payload":
+                        conn.execute("DELETE FROM commit_payloads WHERE rowid = ?", (key,))
+                    else:
+                        conn.execute("DELETE FROM commits WHERE rowid = ?", (key,))
+                    freed += size
+                    removed += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            log.info(f"🧹 File cache evicted {removed} entries ({freed // 1024} KB)")
+            return removed
+        except sqlite3.Error as e:
+            log.warning(f"File cache eviction failed: {e}")
+            return 0
+
+    # ------------------------------------------------------------------
+    # Directory listings (tree snapshots)
+    # ------------------------------------------------------------------
+
+    def get_tree(self, repo: str, commit_sha: str, folder: str) -> Optional[List[str]]:
+        """File paths directly inside folder at commit_sha, if recorded"""
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT paths FROM trees WHERE repo = ? AND commit_sha = ? AND dir = ?",
+                (repo, commit_sha, folder),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE trees SET last_access = ? WHERE repo = ? AND commit_sha = ? AND dir = ?",
+                (time.time(), repo, commit_sha, folder),
+            )
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            log.warning(f"Tree cache read failed for {folder}@{commit_sha[:8]}: {e}")
+            return None
+
+    def put_tree(self, repo: str, commit_sha: str, folder: str, paths: List[str]) -> None:
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO trees(repo, commit_sha, dir, paths, last_access) VALUES (?, ?, ?, ?, ?)",
+                (repo, commit_sha, folder, json.dumps(sorted(paths)), time.time()),
+            )
+        except sqlite3.Error as e:
+            log.warning(f"Tree cache write failed for {folder}@{commit_sha[:8]}: {e}")
+
+    # ------------------------------------------------------------------
+    # Commit graph (commit -> parents edges never change)
+    # ------------------------------------------------------------------
+
+    def get_commits(self, repo: str, shas: List[str]) -> Dict[str, Tuple[List[str], Optional[str]]]:
+        """{sha: (parents, date)} for the shas already recorded"""
+        found: Dict[str, Tuple[List[str], Optional[str]]] = {}
+        try:
+            conn = self._conn()
+            for i in range(0, len(shas), 500):
+                batch = shas[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT commit_sha, parents, date FROM commits WHERE repo = ? "
+                    f"AND commit_sha IN ({','.join('?' * len(batch))})",
+                    [repo] + batch,
+                ).fetchall()
+                for sha, parents, date in rows:
+                    found[sha] = (json.loads(parents), date)
+                if rows:
+                    conn.execute(
+                        f"UPDATE commits SET last_access = ? WHERE repo = ? "
+                        f"AND commit_sha IN ({','.join('?' * len(rows))})",
+                        [time.time(), repo] + [row[0] for row in rows],
+                    )
+        except (sqlite3.Error, ValueError) as e:
+            log.warning(f"Commit graph read failed: {e}")
+        return found
+
+    def put_commits(self, repo: str, commits: Dict[str, Tuple[List[str], Optional[str]]]) -> None:
+        if not commits:
+            return
+        rows = [(repo, sha, json.dumps(parents), date, time.time()) for sha, (parents, date) in commits.items()]
+        try:
+            self._conn().executemany(
+                "INSERT INTO commits(repo, commit_sha, parents, date, last_access) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(repo, commit_sha) DO UPDATE SET last_access = excluded.last_access",
+                rows,
+            )
+        except sqlite3.Error as e:
+            log.warning(f"Commit graph write failed: {e}")
+            return
+
+        self._record_write(sum(len(sha) + len(parents) + len(date or "") for _, sha, parents, date, _ in rows))
+
+    def get_commit_payload(self, repo: str, commit_sha: str, kind: str):
+        """Decoded JSON payload recorded for a commit, or None"""
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT payload FROM commit_payloads WHERE repo = ? AND commit_sha = ? AND kind = ?",
+                (repo, commit_sha, kind),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE commit_payloads SET last_access = ? WHERE repo = ? AND commit_sha = ? AND kind = ?",
+                (time.time(), repo, commit_sha, kind),
+            )
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            log.warning(f"Commit payload read failed for {kind}@{commit_sha[:8]}: {e}")
+            return None
+
+    def put_commit_payload(self, repo: str, commit_sha: str, kind: str, payload) -> None:
+        try:
+            data = json.dumps(payload)
+            self._conn().execute(
+                "INSERT OR REPLACE INTO commit_payloads(repo, commit_sha, kind, payload, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (repo, commit_sha, kind, data, time.time()),
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            log.warning(f"Commit payload write failed for {kind}@{commit_sha[:8]}: {e}")
+            return
+
+        self._record_write(len(data))
+
+    # ------------------------------------------------------------------
+    # Ref -> commit resolution
+    # ------------------------------------------------------------------
+
+    def get_ref(self, repo: str, ref: str) -> Optional[str]:
+        """Cached commit for a branch/tag name, if not expired"""
+        try:
+            row = self._conn().execute(
+                "SELECT commit_sha FROM refs WHERE repo = ? AND ref = ? AND expires_at > ?",
+                (repo, ref, time.time()),
+            ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            log.warning(f"Ref cache read failed for {ref}: {e}")
+            return None
+
+    def put_ref(self, repo: str, ref: str, commit_sha: str) -> None:
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO refs(repo, ref, commit_sha, expires_at) VALUES (?, ?, ?, ?)",
+                (repo, ref, commit_sha, time.time() + self.ref_ttl),
+            )
+        except sqlite3.Error as e:
+            log.warning(f"Ref cache write failed for {ref}: {e}")
+
+
+_file_cache: Optional[FileContentCache] = None
+_file_cache_lock = threading.Lock()
+
+
+def get_file_cache() -> Optional[FileContentCache]:
+    """Process-wide cache instance, or None when disabled/unavailable"""
+    global _file_cache
+    if _file_cache is not None:
+        return _file_cache
+
+    cfg = get_config()
+    if not cfg.FILE_CACHE_ENABLED:
+        return None
+
+    with _file_cache_lock:
+        if _file_cache is None:
+            try:
+                _file_cache = FileContentCache(
+                    cfg.FILE_CACHE_PATH,
+                    max_bytes=cfg.FILE_CACHE_MAX_MB * 1024 * 1024,
+                    ref_ttl=cfg.BITBUCKET_REF_TTL,
+                )
+            except Exception as e:
+                log.error(f"❌ File cache unavailable ({cfg.FILE_CACHE_PATH}): {e}")
+                return None
+    return _file_cache
@@ -10,12 +10,14 @@ import component_registry as cr
 from urllib.parse import unquote,quote
 import re
 GUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+FULL_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
 from component_registry import vlocity_bundle_folder_candidates
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
 from config import get_config
-from urllib3.util.retry import Retry
+from file_cache import get_file_cache
+from bitbucket_http import get_shared_session
+from git_mirror import get_git_mirror
 log = logging.getLogger(__name__)
 
 
@@ -52,25 +54,38 @@ class BitBucketClient:
       
     
     
-    def get_diffstat(self, ref_a: str, ref_b: str, pagelen: int = 200) -> list[dict]:
+    def get_branch_diffstat(self, ref_a: str, ref_b: str, pagelen: int = 200) -> Optional[list[dict]]:
         """
-        Fetch Bitbucket diffstat between two refs (branch names or commit SHAs).
-        Returns a flat list of entries with keys: status, old_path, new_path.
+        Files that differ between two refs (branch names or commit SHAs).
+        Returns a flat list of entries with keys: status, old_path, new_path,
+        or None if the diff can't be fetched (so callers can tell "no
+        differences" from "unknown").
+        
+        This is a plain two-dot tree diff (topic=false), not the merge-base
+        diff Bitbucket returns by default, so it lists every file whose
+        content differs between the two tips. Callers that only need the set
+        of differing paths should read both old_path and new_path.
         """
         if not ref_a or not ref_b:
-            return []
+            return None
+
+        if self.mirror:
+            values = self._from_mirror(self.mirror.diffstat, ref_a, ref_b)
+            if values is not None:
+                return [{
+                    "status": v.get("status"),
+                    "old_path": (v.get("old") or {}).get("path"),
+                    "new_path": (v.get("new") or {}).get("path"),
+                } for v in values]
 
         spec = f"{ref_a}..{ref_b}"
         url = f"{self.base_url}/diffstat/{spec}"
-        params = {"pagelen": int(pagelen)}
+        params = {"pagelen": int(pagelen), "topic": "false"}
 
         items: list[dict] = []
         try:
             while url:
                 resp = self.session.get(url, headers=self._get_headers(), params=params, timeout=self.timeout)
-                if resp.status_code == 404:
-                    # No diff found (e.g., refs invalid) — return empty
-                    return []
                 resp.raise_for_status()
                 data = resp.json() or {}
                 for v in data.get("values", []) or []:
@@ -85,8 +100,8 @@ class BitBucketClient:
                 url = data.get("next")
                 params = None  # 'next' already includes query params
         except Exception as e:
-            self.logger.error("get_diffstat(%s..%s) failed: %s", ref_a, ref_b, e)
-            return []
+            self.logger.error("get_branch_diffstat(%s..%s) failed: %s", ref_a, ref_b, e)
+            return None
 
         return items
 
@@ -100,14 +115,14 @@ class BitBucketClient:
         url = f"{self.base_url}/commit/{commit_hash}"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
             
             if response.status_code == 200:
                 commit_data = response.json()
                 
                 # Check if commit is in the branch
                 branches_url = f"{self.base_url}/commit/{commit_hash}/branches"
-                branches_response = requests.get(branches_url, headers=self._get_headers())
+                branches_response = self.session.get(branches_url, headers=self._get_headers(), timeout=self.timeout)
                 
                 in_branch = False
                 if branches_response.status_code == 200:
@@ -145,7 +160,7 @@ class BitBucketClient:
         url = f"{self.base_url}/commit/{commit_hash}"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
             
             if response.status_code != 200:
                 return {
@@ -157,7 +172,7 @@ class BitBucketClient:
             
             # Get diff for this commit
             diff_url = f"{self.base_url}/commit/{commit_hash}/diff"
-            diff_response = requests.get(diff_url, headers=self._get_headers())
+            diff_response = self.session.get(diff_url, headers=self._get_headers(), timeout=self.timeout)
             
             files_changed = []
             total_additions = 0
@@ -238,49 +253,65 @@ class BitBucketClient:
             is_ancestor: True if newer includes older
             relationship: Description of relationship
         """
-        # BitBucket API to check commit parents
-        url = f"{self.base_url}/commit/{newer_commit}"
-        
+        return self.check_commit_ancestry_many([(older_commit, newer_commit)])[0]
+    
+    def check_commit_ancestry_many(self, pairs: List[tuple]) -> List[dict]:
+        """
+        check_commit_ancestry for many (older, newer) pairs in one go, in input order.
+        All pairs share one commit graph, so a whole release costs a few
+        history pages instead of a parent walk per pair.
+        """
+        results: List[Optional[dict]] = [None] * len(pairs)
+        known = []
         try:
-            response = requests.get(url, headers=self._get_headers())
-            
-            if response.status_code != 200:
-                return {
-                    'success': False,
-                    'error': f'Commit not found: {newer_commit}'
-                }
-            
-            commit_data = response.json()
-            parents = commit_data.get('parents', [])
-            
-            # Check if older_commit is in the ancestry
-            # We need to walk the parent chain
-            is_ancestor = self._is_commit_ancestor(older_commit, newer_commit)
-            
-            if is_ancestor:
-                relationship = "INCLUDES"
-                message = f"✅ Commit {newer_commit[:7]} includes changes from {older_commit[:7]}"
-                safe_order = f"Safe to deploy newer commit only"
-            else:
-                relationship = "SEPARATE"
-                message = f"⚠️ Commits are on separate branches - changes will conflict"
-                safe_order = f"Deploy {older_commit[:7]} first, then {newer_commit[:7]}"
+            for i, (older_commit, newer_commit) in enumerate(pairs):
+                # Loading the newer commit doubles as the existence check
+                if not ((self.mirror and self._from_mirror(self.mirror.resolve, newer_commit))
+                        or self.ancestry.resolve(newer_commit)):
+                    results[i] = {
+                        'success': False,
+                        'error': f'Commit not found: {newer_commit}'
+                    }
+                else:
+                    known.append(i)
             
-            return {
-                'success': True,
-                'is_ancestor': is_ancestor,
-                'relationship': relationship,
-                'message': message,
-                'recommended_order': safe_order,
-                'older_commit': older_commit[:7],
-                'newer_commit': newer_commit[:7]
-            }
+            answers = self.ancestry.is_ancestor_many([pairs[i] for i in known])
+            for i in known:
+                older_commit, newer_commit = pairs[i]
+                results[i] = self._ancestry_result(older_commit, newer_commit,
+                                                   answers[(older_commit, newer_commit)])
+            return results
             
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e)
-            }
+            return [r or {'success': False, 'error': str(e)} for r in results]
+    
+    def _ancestry_result(self, older_commit: str, newer_commit: str, is_ancestor: bool) -> dict:
+        if is_ancestor:
+            relationship = "INCLUDES"
+            message = f"✅ Commit {newer_commit[:7]} includes changes from {older_commit[:7]}"
+            safe_order = f"Safe to deploy newer commit only"
+        else:
+            relationship = "SEPARATE"
+            message = f"⚠️ Commits are on separate branches - changes will conflict"
+            safe_order = f"Deploy {older_commit[:7]} first, then {newer_commit[:7]}"
+        
+        return {
+            'success': True,
+            'is_ancestor': is_ancestor,
+            'relationship': relationship,
+            'message': message,
+            'recommended_order': safe_order,
+            'older_commit': older_commit[:7],
+            'newer_commit': newer_commit[:7]
+        }
+    
+    @property
+    def ancestry(self):
+        """Commit-graph ancestry oracle for this repo (created on first use)"""
+        if getattr(self, "_ancestry", None) is None:
+            from commit_ancestry import CommitAncestryOracle
+            self._ancestry = CommitAncestryOracle(self)
+        return self._ancestry
 
     def list_folder_files(self, folder_path: str, branch: str = "master") -> list:
         """
@@ -292,6 +323,12 @@ class BitBucketClient:
         if cache_key in self._cache_list_folder_files:
             return self._cache_list_folder_files[cache_key]
 
+        if self.mirror:
+            files = self._from_mirror(self.mirror.list_files, branch, folder_path)
+            if files is not None:
+                self._cache_list_folder_files[cache_key] = files
+                return files
+
         url = f"{self.base_url}/src/{quote(branch, safe='')}/{quote(folder_path, safe='/')}"
         try:
             response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
@@ -404,45 +441,6 @@ class BitBucketClient:
      
 
     
-    def _is_commit_ancestor(self, ancestor_hash: str, descendant_hash: str, max_depth: int = 50) -> bool:
-        """
-        Check if ancestor_hash is an ancestor of descendant_hash
-        by walking parent chain
-        """
-        if ancestor_hash == descendant_hash:
-            return True
-        
-        visited = set()
-        queue = [descendant_hash]
-        depth = 0
-        
-        while queue and depth < max_depth:
-            current = queue.pop(0)
-            
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            # Get commit info
-            url = f"{self.base_url}/commit/{current}"
-            try:
-                response = requests.get(url, headers=self._get_headers())
-                if response.status_code == 200:
-                    commit_data = response.json()
-                    parents = commit_data.get('parents', [])
-                    
-                    for parent in parents:
-                        parent_hash = parent.get('hash', '')
-                        if parent_hash.startswith(ancestor_hash):
-                            return True
-                        queue.append(parent_hash)
-            except:
-                pass
-            
-            depth += 1
-        
-        return False    
-    
    
     def __init__(
         self,
@@ -460,7 +458,7 @@ class BitBucketClient:
         Single, unified constructor:
         - Reads defaults from config.py (which reads your env: API_MAX_WORKERS, BITBUCKET_MAX_WORKERS, BITBUCKET_POOL_MAXSIZE, BITBUCKET_TIMEOUT, etc.)
         - Allows per-instance overrides via kwargs (backward-compatible).
-        - Sets up a pooled HTTP session with retries and Authorization header.
+        - Uses the process-wide pooled, retrying, rate-limited session (bitbucket_http) unless one is injected.
         - Initializes per-instance caches (intended: one client per request).
         """
         cfg = get_config()
@@ -485,37 +483,34 @@ class BitBucketClient:
         # performance knobs
         self.timeout     = float(timeout if timeout is not None else cfg.BITBUCKET_TIMEOUT)
         self.max_workers = int(max_workers if max_workers is not None else cfg.BITBUCKET_MAX_WORKERS)
-        pool_max         = int(cfg.BITBUCKET_POOL_MAXSIZE)
 
-        # ---- HTTP session (inject or create) ----
+        # ---- HTTP session (inject, or the process-wide pooled + rate-limited one) ----
+        # The shared session outlives this client, so close() leaves it open.
         if session is not None:
             self.session = session
+            self._owns_session = True
         else:
-            self.session = requests.Session()
-            retry = Retry(
-                total=3, connect=3, read=3,
-                backoff_factor=0.3,
-                status_forcelist=(429, 500, 502, 503, 504),
-                allowed_methods=frozenset({"GET", "POST"}),
-                raise_on_status=False,
-            )
-            adapter = HTTPAdapter(pool_connections=pool_max, pool_maxsize=pool_max, max_retries=retry)
-            self.session.mount("http://", adapter)
-            self.session.mount("https://", adapter)
-
-            # Default headers once, on the session
-            headers = {"Accept": "application/json"}
-            if self.token:
-                headers["Authorization"] = f"Bearer {self.token}"
-            else:
+            self.session = get_shared_session(self.token)
+            self._owns_session = False
+            if not self.token:
                 self.logger.warning("BITBUCKET_TOKEN not set; private repo calls may fail.")
-            self.session.headers.update(headers)
 
         # ---- per-instance caches (cleared when client is discarded) ----
         self._cache_list_folder: Dict[tuple, object] = {}
         self._cache_list_folder_files: Dict[tuple, List[str]] = {}
         self._cache_get_file_content: Dict[tuple, Optional[str]] = {}
         self._cache_get_file_commits: Dict[tuple, List[Dict]] = {}
+        self._resolved_refs: Dict[str, Optional[str]] = {}
+        self._tree_dirs: Dict[tuple, Optional[frozenset]] = {}
+
+        # ---- shared on-disk file cache (commit + path keyed; None if disabled) ----
+        self.file_cache = get_file_cache()
+        self.repo_key = f"{self.workspace}/{self.repo}"
+
+        # ---- optional local bare mirror (answers reads locally; REST is the fallback) ----
+        self.mirror = get_git_mirror(self.workspace, self.repo, self.token)
+        # git_diff / multi_compare_adapter look for a local repo path on the client
+        self.repo_path = self.mirror.path if self.mirror and self.mirror.ready else None
 
         self.closed = False
 
@@ -532,7 +527,8 @@ class BitBucketClient:
     def close(self):
         if getattr(self, "session", None) and not getattr(self, "closed", False):
             try:
-                self.session.close()
+                if getattr(self, "_owns_session", True):
+                    self.session.close()
             finally:
                 self.closed = True
     
@@ -543,9 +539,50 @@ class BitBucketClient:
             "Accept": "application/json"
         }
   
+    def _from_mirror(self, lookup, *args):
+        """Run a mirror lookup; None (caller falls back to REST) if it can't answer or fails"""
+        try:
+            return lookup(*args)
+        except Exception as e:
+            self.logger.warning("git mirror %s failed, using REST: %s", getattr(lookup, "__name__", lookup), e)
+            return None
+
+    def resolve_ref(self, ref: str) -> Optional[str]:
+        """
+        Resolve a branch/tag/short SHA to a full commit hash.
+        Pinned for the life of this client and shared across clients through
+        the file cache's short-TTL ref table. Returns None if it can't be resolved.
+        """
+        if not ref:
+            return None
+        if FULL_SHA_RE.match(ref):
+            return ref
+        if ref in self._resolved_refs:
+            return self._resolved_refs[ref]
+
+        commit_sha = self.file_cache.get_ref(self.repo_key, ref) if self.file_cache else None
+        if commit_sha is None:
+            url = f"{self.base_url}/commit/{quote(ref, safe='')}"
+            try:
+                response = self.session.get(url, params={"fields": "hash"}, timeout=self.timeout)
+                if response.status_code == 200:
+                    commit_sha = (response.json() or {}).get("hash")
+                else:
+                    self.logger.warning("resolve_ref %s -> %s", ref, response.status_code)
+            except Exception as e:
+                self.logger.error("resolve_ref error for %s: %s", ref, e)
+
+            if commit_sha and self.file_cache:
+                self.file_cache.put_ref(self.repo_key, ref, commit_sha)
+
+        self._resolved_refs[ref] = commit_sha
+        return commit_sha
+
     def get_file_content(self, file_path: str, branch: str = "master") -> Optional[str]:
         """
         Get file content from repository. Returns None on 404.
+        The branch is resolved to a commit first so results can be served from
+        (and stored in) the shared on-disk cache.
         """
         if not file_path:
             return None
@@ -554,14 +591,33 @@ class BitBucketClient:
         if cache_key in self._cache_get_file_content:
             return self._cache_get_file_content[cache_key]
 
-        url = f"{self.base_url}/src/{quote(branch, safe='')}/{quote(file_path, safe='/')}"
+        if self.mirror:
+            answered, content = self.mirror.file_content(branch, file_path)
+            if answered:
+                self._cache_get_file_content[cache_key] = content
+                return content
+
+        commit_sha = self.resolve_ref(branch) if self.file_cache else None
+        if commit_sha:
+            hit, content = self.file_cache.get(self.repo_key, commit_sha, file_path)
+            if hit:
+                self._cache_get_file_content[cache_key] = content
+                return content
+
+        # Fetch at the resolved commit so the content matches the cache key
+        ref = commit_sha or branch
+        url = f"{self.base_url}/src/{quote(ref, safe='')}/{quote(file_path, safe='/')}"
         try:
             response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
             if response.status_code == 200:
                 self._cache_get_file_content[cache_key] = response.text
+                if commit_sha:
+                    self.file_cache.put(self.repo_key, commit_sha, file_path, response.text)
                 return response.text
             elif response.status_code == 404:
                 self._cache_get_file_content[cache_key] = None
+                if commit_sha:
+                    self.file_cache.put(self.repo_key, commit_sha, file_path, None)
                 return None
             else:
                 self.logger.warning("get_file_content %s %s -> %s", branch, file_path, response.status_code)
@@ -574,6 +630,11 @@ class BitBucketClient:
 
     def get_diffstat(self, commit_sha: str) -> dict:
         """Get diffstat for a commit - returns file changes with paths"""
+        if self.mirror:
+            values = self._from_mirror(self.mirror.diffstat, None, commit_sha)
+            if values is not None:
+                return {'values': values, 'pagelen': len(values), 'size': len(values), 'page': 1}
+
         url = f"{self.base_url}/repositories/{self.workspace}/{self.repo}/diffstat/{commit_sha}"
         
         try:
@@ -593,6 +654,9 @@ class BitBucketClient:
         possible_paths = self.get_possible_paths(component_name, component_type)
         
         for path in possible_paths:
+            # Skip guesses the branch's tree snapshot rules out (None = unknown, try it)
+            if self.path_in_tree(path, branch) is False:
+                continue
             content = self.get_file_content(path, branch)
             if content is not None:
                 print(f"✅ Found: {path}")
@@ -602,6 +666,78 @@ class BitBucketClient:
         print(f"   Tried: {', '.join(possible_paths)}")
         return (None, None)
     
+    def path_in_tree(self, path: str, branch: str = "master") -> Optional[bool]:
+        """
+        Whether path exists on branch, answered from a tree snapshot of the
+        branch's commit. None when the snapshot can't be loaded.
+        """
+        commit_sha = self.resolve_ref(branch)
+        if not commit_sha or not path:
+            return None
+        folder = path.rsplit("/", 1)[0] if "/" in path else ""
+        files = self._tree_dir(commit_sha, folder)
+        return None if files is None else path in files
+
+    def _tree_dir(self, commit_sha: str, folder: str) -> Optional[frozenset]:
+        """
+        File paths directly inside folder at commit_sha. Sources, cheapest first:
+        this client, the local mirror's full tree, the shared on-disk cache, and
+        finally one (paged) /src listing of the folder, which is then persisted.
+        Listings at a commit never change, so none of these expire.
+        """
+        key = (commit_sha, folder)
+        if key in self._tree_dirs:
+            return self._tree_dirs[key]
+
+        files = None
+        if self.mirror:
+            tree = self._from_mirror(self.mirror.tree_paths, commit_sha)
+            if tree is not None:
+                # Membership against the full tree answers any folder
+                files = tree
+
+        if files is None and self.file_cache:
+            cached = self.file_cache.get_tree(self.repo_key, commit_sha, folder)
+            if cached is not None:
+                files = frozenset(cached)
+
+        if files is None:
+            listed = self._list_tree_dir(commit_sha, folder)
+            if listed is not None:
+                files = frozenset(listed)
+                if self.file_cache:
+                    self.file_cache.put_tree(self.repo_key, commit_sha, folder, listed)
+
+        self._tree_dirs[key] = files
+        return files
+
+    def _list_tree_dir(self, commit_sha: str, folder: str) -> Optional[List[str]]:
+        """All file paths directly in folder via /src; [] if the folder doesn't exist, None on error"""
+        url = f"{self.base_url}/src/{commit_sha}/{quote(folder, safe='/')}"
+        if folder:
+            url += "/"
+        params = {"pagelen": 100, "fields": "values.path,values.type,next"}
+        files: List[str] = []
+        try:
+            while url:
+                resp = self.session.get(url, params=params, timeout=self.timeout)
+                if resp.status_code == 404:
+                    return []
+                if resp.status_code != 200:
+                    self.logger.warning("tree listing %s@%s -> %s", folder, commit_sha[:8], resp.status_code)
+                    return None
+                data = resp.json() or {}
+                files.extend(
+                    item["path"] for item in data.get("values", []) or []
+                    if item.get("type") == "commit_file" and isinstance(item.get("path"), str)
+                )
+                url = data.get("next")
+                params = None  # 'next' already includes query params
+        except Exception as e:
+            self.logger.error("tree listing error for %s: %s", folder, e)
+            return None
+        return files
+
     def get_possible_paths(self, component_name: str, component_type: str) -> list:
         """
         Get all possible paths where component might exist
@@ -791,7 +927,7 @@ class BitBucketClient:
                 }
                 
         try:
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self.session.get(url, headers=self._get_headers(), params=params, timeout=self.timeout)
             
             if response.status_code != 200:
                 return {
@@ -814,7 +950,7 @@ class BitBucketClient:
             
             # Get diffstat (shows which files changed)
             diffstat_url = f"{self.base_url}/diffstat/{latest_commit['hash']}"
-            diffstat_response = requests.get(diffstat_url, headers=self._get_headers())
+            diffstat_response = self.session.get(diffstat_url, headers=self._get_headers(), timeout=self.timeout)
             
             if diffstat_response.status_code == 200:
                 diffstat = diffstat_response.json()
@@ -954,7 +1090,7 @@ class BitBucketClient:
         url = f"{self.base_url}/src/{branch}/{folder_path}"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1090,7 +1226,7 @@ class BitBucketClient:
         url = f"{self.base_url}/src/{branch}/vlocity/"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
+            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1119,6 +1255,12 @@ class BitBucketClient:
         if cache_key in self._cache_get_file_commits:
             return self._cache_get_file_commits[cache_key]
 
+        if self.mirror:
+            result = self._from_mirror(self.mirror.file_commits, branch, file_path, limit)
+            if result is not None:
+                self._cache_get_file_commits[cache_key] = result
+                return result
+
         url = f"{self.base_url}/commits/{quote(branch, safe='')}"
         params = {'path': file_path, 'pagelen': int(limit)}
 
@@ -0,0 +1,368 @@
+# git_mirror.py
+"""
+Local bare mirror of the Bitbucket repository.
+
+BitBucketClient delegates file reads, folder listings, file history, diffstats
+and ancestry checks here when GIT_MIRROR_ENABLED is set, so they become local
+git object reads instead of REST calls. The mirror is cloned once and kept
+current by a background `git fetch`; any lookup the mirror can't answer (not
+cloned yet, commit not fetched yet) returns None and the client falls back to
+the REST API.
+"""
+import fcntl
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import get_config
+
+log = logging.getLogger(__name__)
+
+# Full-tree path sets kept in memory (oldest dropped first)
+_TREE_SNAPSHOTS_KEPT = 8
+
+_DIFF_STATUS = {
+    "A": "added",
+    "D": "removed",
+    "M": "modified",
+    "T": "modified",
+    "R": "renamed",
+    "C": "added",
+}
+
+
+class LocalGitMirror:
+    """Bare `git clone --mirror` plus the read helpers BitBucketClient needs"""
+
+    def __init__(self, path: str, remote_url: str, refresh_seconds: float = 120.0,
+                 token: Optional[str] = None):
+        self.path = os.path.abspath(path)
+        self.remote_url = remote_url
+        self.refresh_seconds = refresh_seconds
+        # Sent per command as an HTTP header, never written into the mirror's config
+        self._token = token
+
+        self._lock = threading.Lock()
+        self._batch: Optional[subprocess.Popen] = None
+        self._batch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self._resolved: Dict[str, str] = {}   # ref -> commit, cleared after each fetch
+        self._trees: Dict[str, frozenset] = {}  # commit -> all file paths (immutable)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def ready(self) -> bool:
+        return os.path.isfile(os.path.join(self.path, "HEAD"))
+
+    def start(self) -> None:
+        """Clone (if needed) and keep fetching in a daemon thread"""
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="git-mirror", daemon=True)
+            self._refresher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._close_batch()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                log.error(f"❌ Git mirror refresh failed: {e}")
+            self._stop.wait(self.refresh_seconds)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Clone or fetch. A file lock next to the mirror keeps worker processes
+        from fetching at once; a process that loses the race just skips.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+
+            if not self.ready:
+                log.info(f"📥 Cloning git mirror into {self.path}")
+                started = time.time()
+                # Clone beside the target and rename, so `ready` never sees a partial clone
+                tmp_path = f"{self.path}.cloning"
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                self._git_raw(["clone", "--mirror", "--quiet", self.remote_url, tmp_path],
+                              cwd=None, timeout=1800, auth=True)
+                os.rename(tmp_path, self.path)
+                log.info(f"✅ Git mirror cloned in {time.time() - started:.1f}s")
+            else:
+                # Freshness is shared across processes through FETCH_HEAD's mtime
+                fetch_head = os.path.join(self.path, "FETCH_HEAD")
+                if not force and os.path.exists(fetch_head) and \
+                        time.time() - os.path.getmtime(fetch_head) < self.refresh_seconds:
+                    return False
+                self._git_raw(["fetch", "--prune", "--quiet", "origin"], timeout=600, auth=True)
+                log.debug(f"🔄 Git mirror fetched ({self.path})")
+
+        # Refs may have moved and there are new packs
+        self._resolved = {}
+        self._close_batch()
+        return True
+
+    # ------------------------------------------------------------------
+    # git plumbing
+    # ------------------------------------------------------------------
+
+    def _git_raw(self, args: List[str], cwd: Optional[str] = "", timeout: float = 60,
+                 auth: bool = False) -> bytes:
+        cmd = ["git"] + args if cwd is None else ["git", "-C", cwd or self.path] + args
+        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout,
+                           env=self._auth_env() if auth else None)
+        if p.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args[:2])} failed: {p.stderr.decode(errors='replace').strip()}")
+        return p.stdout
+
+    def _auth_env(self) -> Optional[Dict[str, str]]:
+        """
+        Environment for network commands: the token goes in as a config-by-env
+        http.extraHeader, so it is neither on the command line nor on disk
+        """
+        if not self._token:
+            return None
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        count = int(env.get("GIT_CONFIG_COUNT", "0") or 0)
+        env["GIT_CONFIG_COUNT"] = str(count + 1)
+        env[f"GIT_CONFIG_KEY_{count}"] = "http.extraHeader"
+        env[f"GIT_CONFIG_VALUE_{count}"] = f"Authorization: Bearer {self._token}"
+        return env
+
+    def _git(self, args: List[str], timeout: float = 60) -> str:
+        return self._git_raw(["-c", "core.quotepath=off"] + args, timeout=timeout).decode("utf-8", errors="replace")
+
+    def _close_batch(self) -> None:
+        with self._batch_lock:
+            if self._batch is not None:
+                try:
+                    self._batch.stdin.close()
+                    self._batch.terminate()
+                except Exception:
+                    pass
+                self._batch = None
+
+    def _read_object(self, spec: str) -> Optional[bytes]:
+        """Read one object through a long-lived `git cat-file --batch`"""
+        with self._batch_lock:
+            if self._batch is None or self._batch.poll() is not None:
+                self._batch = subprocess.Popen(
+                    ["git", "-C", self.path, "cat-file", "--batch"],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+                )
+            proc = self._batch
+            proc.stdin.write(spec.encode("utf-8") + b"\n")
+            proc.stdin.flush()
+
+            header = proc.stdout.readline().decode("utf-8", errors="replace").rstrip("\n")
+            parts = header.split()
+            if len(parts) != 3 or parts[1] in ("missing", "ambiguous"):
+                return None
+            size = int(parts[2])
+            data = proc.stdout.read(size)
+            proc.stdout.read(1)  # trailing newline
+            return data if parts[1] == "blob" else None
+
+    # ------------------------------------------------------------------
+    # Lookups (None = mirror can't answer, caller should fall back)
+    # ------------------------------------------------------------------
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """Full commit hash for a branch/tag/SHA, or None if not in the mirror"""
+        if not ref or not self.ready:
+            return None
+        commit = self._resolved.get(ref)
+        if commit:
+            return commit
+        for candidate in (f"refs/heads/{ref}", ref):
+            try:
+                commit = self._git(["rev-parse", "--verify", "--quiet", f"{candidate}^{{commit}}"]).strip()
+            except Exception:
+                continue
+            if commit:
+                self._resolved[ref] = commit
+                return commit
+        return None
+
+    def file_content(self, ref: str, path: str) -> Tuple[bool, Optional[str]]:
+        """(answered, content) - content None means the file doesn't exist at ref"""
+        commit = self.resolve(ref)
+        if not commit:
+            return False, None
+        try:
+            data = self._read_object(f"{commit}:{path}")
+        except Exception as e:
+            log.warning(f"Git mirror read failed for {path}@{ref}: {e}")
+            self._close_batch()
+            return False, None
+        return True, data.decode("utf-8", errors="replace") if data is not None else None
+
+    def tree_paths(self, commit: str) -> Optional[frozenset]:
+        """Every file path at commit (one `ls-tree -r`), memoized per commit"""
+        paths = self._trees.get(commit)
+        if paths is not None:
+            return paths
+        if not self.ready:
+            return None
+        out = self._git(["ls-tree", "-r", "-z", "--name-only", commit])
+        paths = frozenset(p for p in out.split("\0") if p)
+        with self._lock:
+            if len(self._trees) >= _TREE_SNAPSHOTS_KEPT:
+                self._trees.pop(next(iter(self._trees)))
+            self._trees[commit] = paths
+        return paths
+
+    def list_files(self, ref: str, folder: str) -> Optional[List[str]]:
+        """Paths of files directly inside folder (like the /src folder listing)"""
+        commit = self.resolve(ref)
+        if not commit:
+            return None
+        out = self._git(["ls-tree", "-z", commit, f"{folder.strip('/')}/"])
+        files = []
+        for entry in out.split("\0"):
+            if not entry:
+                continue
+            meta, _, path = entry.partition("\t")
+            if meta.split()[1] == "blob":
+                files.append(path)
+        return files
+
+    def file_commits(self, ref: str, path: str, limit: int = 10) -> Optional[List[Dict]]:
+        """Newest-first commits touching path, in get_file_commits' shape"""
+        commit = self.resolve(ref)
+        if not commit:
+            return None
+        out = self._git(["log", f"-n{int(limit)}", "--format=%H%x1f%an <%ae>%x1f%aI%x1f%B%x1e",
+                         commit, "--", path])
+        result = []
+        for record in out.split("\x1e"):
+            record = record.strip("\n")
+            if not record:
+                continue
+            sha, author, date, message = record.split("\x1f", 3)
+            result.append({
+                'hash': sha,
+                'short_hash': sha[:8],
+                'message': message,
+                'author': author,
+                'date': date
+            })
+        return result
+
+    def diffstat(self, base: Optional[str], head: str) -> Optional[List[Dict]]:
+        """
+        Bitbucket-style diffstat values between base and head (base None =
+        head against its first parent, or the empty tree for a root commit).
+        """
+        head_sha = self.resolve(head)
+        if not head_sha:
+            return None
+        if base is None:
+            parents = self._git(["rev-list", "--parents", "-n1", head_sha]).split()[1:]
+            base_sha = parents[0] if parents else None
+        else:
+            base_sha = self.resolve(base)
+            if not base_sha:
+                return None
+
+        if base_sha:
+            common = ["diff", "-r", "-M", "--no-color", "-z", base_sha, head_sha]
+        else:
+            common = ["diff-tree", "-r", "-M", "--no-color", "-z", "--no-commit-id", "--root", head_sha]
+
+        # -z output: numstat "add\tdel\tpath\0" or "add\tdel\t\0old\0new\0" for renames
+        numstat = {}
+        tokens = self._git(common[:1] + ["--numstat"] + common[1:]).split("\0")
+        i = 0
+        while i < len(tokens) - 1:
+            added, removed, path = tokens[i].split("\t", 2)
+            if path:
+                i += 1
+            else:
+                path = tokens[i + 2]
+                i += 3
+            numstat[path] = (
+                int(added) if added.isdigit() else 0,
+                int(removed) if removed.isdigit() else 0
+            )
+
+        # name-status: "M\0path\0" or "R100\0old\0new\0"
+        values = []
+        tokens = self._git(common[:1] + ["--name-status"] + common[1:]).split("\0")
+        i = 0
+        while i < len(tokens) - 1:
+            code = tokens[i][:1]
+            if code in ("R", "C"):
+                old_path, new_path = tokens[i + 1], tokens[i + 2]
+                i += 3
+            else:
+                old_path = new_path = tokens[i + 1]
+                i += 2
+            if code == "A":
+                old_path = None
+            elif code == "D":
+                new_path = None
+            added, removed = numstat.get(new_path or old_path, (0, 0))
+            values.append({
+                'type': 'diffstat',
+                'status': _DIFF_STATUS.get(code, 'modified'),
+                'lines_added': added,
+                'lines_removed': removed,
+                'old': {'path': old_path} if old_path else None,
+                'new': {'path': new_path} if new_path else None
+            })
+        return values
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> Optional[bool]:
+        """
+        True/False from `git merge-base --is-ancestor`; None if either commit
+        is unknown or git fails (so the caller falls back to REST)
+        """
+        a = self.resolve(ancestor)
+        d = self.resolve(descendant)
+        if not a or not d:
+            return None
+        p = subprocess.run(["git", "-C", self.path, "merge-base", "--is-ancestor", a, d],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if p.returncode not in (0, 1):
+            return None
+        return p.returncode == 0
+
+
+_mirrors: Dict[str, LocalGitMirror] = {}
+_mirrors_lock = threading.Lock()
+
+
+def get_git_mirror(workspace: str, repo: str, token: Optional[str] = None) -> Optional[LocalGitMirror]:
+    """Process-wide mirror for workspace/repo (started on first use), or None if disabled"""
+    cfg = get_config()
+    if not cfg.GIT_MIRROR_ENABLED:
+        return None
+
+    key = f"{workspace}/{repo}"
+    with _mirrors_lock:
+        mirror = _mirrors.get(key)
+        if mirror is None:
+            path = os.path.join(cfg.GIT_MIRROR_PATH, workspace, f"{repo}.git")
+            remote_url = cfg.GIT_MIRROR_URL or f"https://bitbucket.org/{workspace}/{repo}.git"
+            mirror = LocalGitMirror(path, remote_url, refresh_seconds=cfg.GIT_MIRROR_REFRESH_SECONDS,
+                                    token=token)
+            mirror.start()
+            _mirrors[key] = mirror
+    return mirror
@@ -5,11 +5,14 @@ This defines the structure of our data using Python dataclasses.
 Think of these as blueprints - like TypeScript interfaces.
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional
 from enum import Enum
 from datetime import datetime
 
+from config import get_config
+
 
 # ==============================================================================
 # ENUMS - Predefined Constants
@@ -48,8 +51,19 @@ class ConflictSeverity(Enum):
 # ==============================================================================
 # DATA CLASSES - Our Domain Models
 # ==============================================================================
+# Slotted (no per-instance __dict__): whole-org analyses hold hundreds of
+# thousands of components. Enum fields already point at shared singletons.
+# Strings that repeat across rows (names, developers, environments) are
+# interned so every copy shares one object (MODEL_INTERN_STRINGS).
 
-@dataclass
+_INTERN_STRINGS = get_config().MODEL_INTERN_STRINGS
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class Component:
     """
     Represents a single Salesforce component (file)
@@ -63,9 +77,16 @@ class Component:
     last_commit_date: Optional[datetime] = None
     created_by: Optional[str] = None 
     commit_hash: Optional[str] = None 
+    
+    def __post_init__(self):
+        if _INTERN_STRINGS:
+            self.api_name = _intern(self.api_name)
+            self.user_story_id = _intern(self.user_story_id)
+            self.unique_id = _intern(self.unique_id)
+            self.created_by = _intern(self.created_by)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStory:
     """
     Represents a Copado User Story
@@ -78,9 +99,16 @@ class UserStory:
     environment: str = "Unknown"
     developer: Optional[str] = None
     components: List[Component] = field(default_factory=list)
+    
+    def __post_init__(self):
+        if _INTERN_STRINGS:
+            self.id = _intern(self.id)
+            self.project = _intern(self.project)
+            self.environment = _intern(self.environment)
+            self.developer = _intern(self.developer)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConflictingComponent:
     """
     A component that has conflicts between multiple stories
@@ -7,17 +7,80 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, Optional
 
+from csv_parser import to_datetime_column
 
-def parse_production_state(file_path: str) -> Dict:
+
+def parse_production_state(file_path: str, vectorized: bool = True) -> Dict:
     """
     Parse production CSV and index by component
     
+    Args:
+        file_path: Path to the production CSV
+        vectorized: Group column-wise (fast). False uses the original
+                    row-by-row loop, kept for comparison.
+    
     Returns:
         Dict mapping component_name -> production_info
     """
     df = pd.read_csv(file_path)
     df.columns = df.columns.str.strip()
     
+    if vectorized:
+        return _production_state_columnwise(df)
+    return _production_state_rowwise(df)
+
+
+def _production_state_columnwise(df: pd.DataFrame) -> Dict:
+    """
+    Same result as the row loop: type / last_modified_by come from a
+    component's first row; its date is the latest one, unless the first
+    row had no date (then it stays None).
+    """
+    def as_str(name: str, default: str) -> pd.Series:
+        if name not in df.columns:
+            return pd.Series([default] * len(df), index=df.index, dtype=object)
+        return pd.Series([str(v) for v in df[name].tolist()], index=df.index, dtype=object)
+    
+    names = as_str('copado__Metadata_API_Name__c', '').str.strip()
+    keep = (names != '') & (names != 'nan')
+    if not keep.any():
+        return {}
+    
+    if 'copado__Last_Commit_Date__c' in df.columns:
+        dates = pd.Series(to_datetime_column(df['copado__Last_Commit_Date__c'], utc_naive=False),
+                          index=df.index, dtype=object)
+    else:
+        dates = pd.Series([None] * len(df), index=df.index, dtype=object)
+    
+    frame = pd.DataFrame({
+        'name': names,
+        'date': dates,
+        'type': as_str('copado__Type__c', 'Unknown'),
+        'modified_by': as_str('LastModifiedBy.Name', 'Unknown'),
+    })[keep]
+    
+    # Latest date per component (dates may be tz-aware objects, so no numeric max)
+    latest = {}
+    for name, date in zip(frame['name'].tolist(), frame['date'].tolist()):
+        if date is not None and (latest.get(name) is None or date > latest[name]):
+            latest[name] = date
+    
+    first = frame[~frame['name'].duplicated()]
+    return {
+        name: {
+            'last_commit_date': latest[name] if date is not None else None,
+            'type': ctype,
+            'last_modified_by': modified_by,
+            'exists_in_prod': True
+        }
+        for name, date, ctype, modified_by in zip(
+            first['name'].tolist(), first['date'].tolist(),
+            first['type'].tolist(), first['modified_by'].tolist())
+    }
+
+
+def _production_state_rowwise(df: pd.DataFrame) -> Dict:
+    """Original row-by-row loop"""
     prod_state = {}
     
     for _, row in df.iterrows():
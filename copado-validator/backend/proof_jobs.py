@@ -0,0 +1,350 @@
+# proof_jobs.py
+"""
+Background jobs for long-running bulk / release proofs.
+
+POST /api/deployment/prove/bulk with "async": true enqueues a job and returns
+its id straight away; a small worker pool runs the proof. Each story's UI
+summary is written to SQLite as soon as it is proven, so:
+
+- GET /api/deployment/prove/jobs/<id> reports status and progress (polling),
+- GET /api/deployment/prove/bulk?job_id=<id> pages, filters and sorts the
+  stories proven so far (or all of them once the job is done).
+
+Same storage approach as file_cache.py: one SQLite file in WAL mode, one
+connection per thread. Jobs left queued/running by a process that died are
+marked failed when the next queue starts on that host; finished jobs are
+purged after PROOF_JOB_RETENTION_DAYS.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import get_config
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,             -- 'bulk' / 'advanced'
+    status TEXT NOT NULL,           -- queued / running / completed / failed
+    owner TEXT NOT NULL,            -- 'host:pid' of the process running it
+    params TEXT NOT NULL,           -- JSON request body
+    total INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    phase TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    response TEXT                   -- JSON bulk response without 'stories'
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at);
+
+CREATE TABLE IF NOT EXISTS job_stories (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,           -- position in the request
+    story_id TEXT NOT NULL,
+    status TEXT NOT NULL,           -- proven / partial / unproven
+    author TEXT,
+    commit_date TEXT,
+    proof_score REAL,
+    summary TEXT NOT NULL,          -- JSON story entry, as in the bulk response 'stories'
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_job_stories_status ON job_stories(job_id, status);
+CREATE INDEX IF NOT EXISTS idx_job_stories_author ON job_stories(job_id, author);
+CREATE INDEX IF NOT EXISTS idx_job_stories_date ON job_stories(job_id, commit_date);
+"""
+
+# Sortable story columns (query param -> SQL column)
+SORT_COLUMNS = {
+    'index': 'idx',
+    'story': 'story_id',
+    'status': 'status',
+    'author': 'author',
+    'date': 'commit_date',
+    'score': 'proof_score',
+}
+
+class ProofJobStore:
+    """SQLite-backed job records and per-story results"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---- jobs ----
+
+    def create(self, kind: str, params: Dict) -> str:
+        job_id = uuid.uuid4().hex
+        self._conn().execute(
+            "INSERT INTO jobs(id, kind, status, owner, params, phase, created_at) "
+            "VALUES (?, ?, 'queued', ?, ?, 'queued', ?)",
+            (job_id, kind, _OWNER, json.dumps(params, default=str), time.time()),
+        )
+        return job_id
+
+    def start(self, job_id: str) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = 'running', phase = 'starting', started_at = ? WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    def update(self, job_id: str, *, total: Optional[int] = None, phase: Optional[str] = None) -> None:
+        if total is not None:
+            self._conn().execute("UPDATE jobs SET total = ? WHERE id = ?", (total, job_id))
+        if phase is not None:
+            self._conn().execute("UPDATE jobs SET phase = ? WHERE id = ?", (phase, job_id))
+
+    def add_story(self, job_id: str, idx: int, story_id: str, summary: Dict) -> None:
+        commit = summary.get('commit') or {}
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO job_stories(job_id, idx, story_id, status, author, commit_date, "
+                "proof_score, summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, idx, story_id, summary.get('status', 'unproven'), commit.get('author'),
+                 commit.get('date') or None, summary.get('proof_score'), json.dumps(summary, default=str)),
+            ).rowcount
+            if inserted:
+                conn.execute("UPDATE jobs SET done = done + 1 WHERE id = ?", (job_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def finish(self, job_id: str, response: Dict) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = 'completed', phase = 'completed', finished_at = ?, response = ? WHERE id = ?",
+            (time.time(), json.dumps(response, default=str), job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = 'failed', phase = 'failed', finished_at = ?, error = ? WHERE id = ?",
+            (time.time(), error, job_id),
+        )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job_dict(row) if row else None
+
+    def latest(self) -> Optional[Dict]:
+        row = self._conn().execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT 1").fetchone()
+        return self._job_dict(row) if row else None
+
+    def recover_interrupted(self) -> int:
+        """
+        Fail queued/running jobs whose owning process on this host is gone.
+        Jobs of live workers (e.g. other gunicorn workers) are left alone.
+        """
+        conn = self._conn()
+        host = _OWNER.rsplit(':', 1)[0]
+        dead = []
+        for job_id, owner in conn.execute(
+            "SELECT id, owner FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchall():
+            owner_host, _, pid = owner.rpartition(':')
+            if owner_host == host and not _pid_alive(int(pid)):
+                dead.append(job_id)
+        for job_id in dead:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', phase = 'failed', finished_at = ?, "
+                "error = 'Interrupted: server restarted before the job finished' WHERE id = ?",
+                (time.time(), job_id),
+            )
+        return len(dead)
+
+    def purge(self, older_than_seconds: float) -> int:
+        cutoff = time.time() - older_than_seconds
+        conn = self._conn()
+        old = [r[0] for r in conn.execute(
+            "SELECT id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,)
+        ).fetchall()]
+        for job_id in old:
+            conn.execute("DELETE FROM job_stories WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return len(old)
+
+    # ---- stories ----
+
+    def stories(self, job_id: str, *, status: Optional[str] = None, author: Optional[str] = None,
+                date_from: Optional[str] = None, date_to: Optional[str] = None,
+                sort: str = 'index', descending: bool = False,
+                page: int = 1, page_size: int = 50) -> Tuple[List[Dict], int]:
+        """
+        One page of story summaries plus the total matching count.
+        Dates compare as ISO-8601 strings (commit dates are stored that way);
+        date_to is inclusive of the whole day when only a date is given.
+        """
+        where = ["job_id = ?"]
+        args: List[Any] = [job_id]
+        if status:
+            statuses = [s.strip() for s in status.split(',') if s.strip()]
+            where.append(f"status IN ({','.join('?' * len(statuses))})")
+            args.extend(statuses)
+        if author:
+            where.append("author = ? COLLATE NOCASE")
+            args.append(author)
+        if date_from:
+            where.append("commit_date >= ?")
+            args.append(date_from)
+        if date_to:
+            where.append("commit_date <= ?")
+            args.append(date_to + 'T23:59:59.999999' if len(date_to) == 10 else date_to)
+
+        column = SORT_COLUMNS.get(sort, 'idx')
+        order = f"{column} {'DESC' if descending else 'ASC'}, idx ASC"
+        clause = " AND ".join(where)
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM job_stories WHERE {clause}", args).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT summary FROM job_stories WHERE {clause} ORDER BY {order} LIMIT ? OFFSET ?",
+            args + [page_size, (page - 1) * page_size],
+        ).fetchall()
+        return [json.loads(r[0]) for r in rows], total
+
+    def facets(self, job_id: str) -> Dict:
+        """Distinct statuses/authors for the UI filter dropdowns"""
+        conn = self._conn()
+        return {
+            'statuses': [r[0] for r in conn.execute(
+                "SELECT DISTINCT status FROM job_stories WHERE job_id = ? ORDER BY status", (job_id,))],
+            'authors': [r[0] for r in conn.execute(
+                "SELECT DISTINCT author FROM job_stories WHERE job_id = ? AND author IS NOT NULL "
+                "ORDER BY author", (job_id,))],
+        }
+
+    @staticmethod
+    def _job_dict(row: sqlite3.Row) -> Dict:
+        total, done = row['total'], row['done']
+        return {
+            'job_id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'phase': row['phase'],
+            'progress': {
+                'total': total,
+                'done': done,
+                'percent': round(done / total * 100, 1) if total else (100.0 if row['status'] == 'completed' else 0.0),
+            },
+            'created_at': _iso(row['created_at']),
+            'started_at': _iso(row['started_at']),
+            'finished_at': _iso(row['finished_at']),
+            'error': row['error'],
+            'params': json.loads(row['params']),
+            'response': json.loads(row['response']) if row['response'] else None,
+        }
+
+
+_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return False  # a fresh queue in this process has no running jobs yet
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(ts)) if ts else None
+
+
+class JobContext:
+    """Handed to a job's runner to report progress"""
+
+    def __init__(self, store: ProofJobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def set_total(self, total: int) -> None:
+        self.store.update(self.job_id, total=total)
+
+    def phase(self, phase: str) -> None:
+        self.store.update(self.job_id, phase=phase)
+
+    def story_done(self, idx: int, story_id: str, summary: Dict) -> None:
+        try:
+            self.store.add_story(self.job_id, idx, story_id, summary)
+        except sqlite3.Error as e:
+            log.warning(f"Job {self.job_id[:8]}: could not store {story_id}: {e}")
+
+
+class ProofJobQueue:
+    """Bounded worker pool running proof jobs recorded in a ProofJobStore"""
+
+    def __init__(self, store: ProofJobStore, workers: int, retention_seconds: float):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="proof-job")
+        recovered = store.recover_interrupted()
+        purged = store.purge(retention_seconds)
+        log.info(f"🧵 Proof job queue: {max(1, workers)} workers at {store.path} "
+                 f"({recovered} interrupted, {purged} expired)")
+
+    def submit(self, kind: str, params: Dict, runner: Callable[[JobContext], Dict]) -> str:
+        """Record a job and queue runner(ctx); runner returns the final bulk response"""
+        job_id = self.store.create(kind, params)
+        self._executor.submit(self._run, job_id, runner)
+        log.info(f"📥 Queued {kind} proof job {job_id[:8]}")
+        return job_id
+
+    def _run(self, job_id: str, runner: Callable[[JobContext], Dict]) -> None:
+        start = time.time()
+        self.store.start(job_id)
+        try:
+            response = runner(JobContext(self.store, job_id))
+            # Stories are served page by page from job_stories
+            response = {k: v for k, v in response.items() if k != 'stories'}
+            self.store.finish(job_id, response)
+            log.info(f"✅ Proof job {job_id[:8]} completed in {time.time() - start:.1f}s")
+        except Exception as e:
+            log.error(f"❌ Proof job {job_id[:8]} failed: {e}", exc_info=True)
+            self.store.fail(job_id, str(e))
+
+
+_queue: Optional[ProofJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> ProofJobQueue:
+    """Process-wide job queue (created on first use)"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                cfg = get_config()
+                _queue = ProofJobQueue(
+                    ProofJobStore(cfg.PROOF_JOB_DB_PATH),
+                    workers=cfg.PROOF_JOB_WORKERS,
+                    retention_seconds=cfg.PROOF_JOB_RETENTION_DAYS * 24 * 3600,
+                )
+    return _queue
@@ -6,9 +6,10 @@ from typing import Iterable, List,Dict,Optional
 # Install with: pip install simple-salesforce
 import re
 import logging
+from urllib.parse import quote_plus
 logger = logging.getLogger(__name__)
 log = logging.getLogger(__name__)
-from vlocity_query_builder import VlocityQueryBuilder
+from vlocity_query_builder import get_query_builder
 
 
 
@@ -173,12 +174,45 @@ def soql_in(values: Iterable[str]) -> str:
     Safely quote values for a SOQL IN clause: ('a','b',...).
     Escapes single quotes.
     """
-    items = []
+    return "(" + ",".join(_soql_literal(v) for v in values) + ")"
+
+
+def _soql_literal(value) -> str:
+    """Quote a single value as a SOQL string literal."""
+    if not isinstance(value, str):
+        value = str(value)
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+# simple_salesforce sends SOQL as a GET query string, so the practical ceiling
+# is the ~16k request-URI limit rather than the 100k SOQL statement limit.
+SOQL_MAX_URI_LENGTH = 15000
+
+
+def soql_in_batches(values: Iterable[str], template: str,
+                    max_length: int = SOQL_MAX_URI_LENGTH) -> List[tuple]:
+    """
+    Split values into IN-clause batches so each rendered query stays under max_length.
+
+    template must contain a single "{values}" placeholder, e.g.
+    "SELECT Id FROM ApexClass WHERE Name IN {values}". Lengths are measured
+    URL-encoded, the way the query actually travels. Returns (batch, soql) pairs.
+    """
+    base_len = len(quote_plus(template.replace("{values}", "()")))
+    out: List[tuple] = []
+    batch: list = []
+    batch_len = base_len
     for v in values:
-        if not isinstance(v, str):
-            v = str(v)
-        items.append("'" + v.replace("'", "\'") + "'")
-    return "(" + ",".join(items) + ")"
+        item_len = len(quote_plus(_soql_literal(v))) + (3 if batch else 0)  # "%2C" separator
+        if batch and batch_len + item_len > max_length:
+            out.append((batch, template.replace("{values}", soql_in(batch))))
+            batch, batch_len = [], base_len
+            item_len -= 3
+        batch.append(v)
+        batch_len += item_len
+    if batch:
+        out.append((batch, template.replace("{values}", soql_in(batch))))
+    return out
 
 def _parse_commit_from_view_in_git(html: str) -> Dict[str, str | None]:
     """
@@ -338,7 +372,7 @@ def fetch_vlocity_component_state(sf, components: List[Dict]) -> List[Dict]:
     
     try:
         # Load query builder with config
-        builder = VlocityQueryBuilder()
+        builder = get_query_builder()
         
         # Build queries for all components
         queries = builder.build_bulk_query(components)
@@ -394,7 +428,8 @@ def _query_tooling(self, query: str) -> Optional[List[Dict]]:
     """
     try:
         # Option 1: If using simple_salesforce directly
-        if hasattr(self.sf, 'toolingexecute'):
+        from sf_session import resolve_salesforce
+        if hasattr(resolve_salesforce(self.sf), 'toolingexecute'):
             result = self.sf.toolingexecute(f"query/?q={query}")
             return result.get('records', []) if result else []
         
@@ -0,0 +1,149 @@
+# sf_session.py
+"""
+Lazy, shared Salesforce session.
+
+- SalesforceSessionManager logs in once, on first use, and hands the same
+  simple_salesforce client to every caller in the process (one manager per
+  config file; None = environment variables).
+- The client's requests.Session gets a connection pool sized by
+  SF_POOL_SIZE, so concurrent proof workers don't queue on urllib3's default
+  pool of 10.
+- LazySalesforce is a drop-in stand-in for a Salesforce client. Nothing
+  happens until an attribute is used; method calls that fail with
+  INVALID_SESSION_ID log in again and are retried once.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+from config import get_config
+from salesforce_client import sf_login_from_config
+
+log = logging.getLogger(__name__)
+
+
+def is_session_expired(exc: BaseException) -> bool:
+    """True if exc means the Salesforce session id is no longer valid"""
+    if type(exc).__name__ == 'SalesforceExpiredSession':
+        return True
+    return 'INVALID_SESSION_ID' in str(exc)
+
+
+class SalesforceSessionManager:
+    """Logs in lazily, shares the session, and refreshes it when it expires"""
+
+    def __init__(self, config_json_path: Optional[str] = None, pool_size: Optional[int] = None):
+        self.config_json_path = config_json_path
+        self.pool_size = max(1, pool_size or get_config().SF_POOL_SIZE)
+        self._client = None
+        self._lock = threading.Lock()
+        self.logins = 0
+        self.refreshes = 0
+        self.last_login_seconds: Optional[float] = None
+
+    def get(self):
+        """Current client, logging in on first call"""
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                self._client = self._login()
+            return self._client
+
+    def refresh(self, stale=None):
+        """
+        Log in again. Pass the client that failed as stale so concurrent
+        callers hitting the same expiry share one login.
+        """
+        with self._lock:
+            if self._client is None or stale is None or self._client is stale:
+                log.warning("🔑 Salesforce session expired; logging in again")
+                self.refreshes += 1
+                self._client = self._login()
+            return self._client
+
+    def stats(self) -> Dict:
+        return {
+            'connected': self._client is not None,
+            'logins': self.logins,
+            'refreshes': self.refreshes,
+            'last_login_ms': (int(self.last_login_seconds * 1000)
+                              if self.last_login_seconds is not None else None),
+            'pool_size': self.pool_size,
+        }
+
+    def _login(self):
+        start = time.time()
+        client = sf_login_from_config(self.config_json_path)
+        session = getattr(client, 'session', None)
+        if session is not None:
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.logins += 1
+        self.last_login_seconds = time.time() - start
+        log.info(f"✅ Salesforce connected ({int(self.last_login_seconds * 1000)}ms, "
+                 f"pool {self.pool_size})")
+        return client
+
+
+class LazySalesforce:
+    """Proxy for a shared Salesforce client; logs in on first attribute access"""
+
+    def __init__(self, manager: SalesforceSessionManager):
+        self._manager = manager
+
+    @property
+    def session_manager(self) -> SalesforceSessionManager:
+        return self._manager
+
+    def __getattr__(self, name):
+        client = self._manager.get()
+        attr = getattr(client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            try:
+                return getattr(client, name)(*args, **kwargs)
+            except Exception as e:
+                if not is_session_expired(e):
+                    raise
+                fresh = self._manager.refresh(stale=client)
+                return getattr(fresh, name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def __repr__(self):
+        return f"<LazySalesforce {self._manager.config_json_path or 'env'} {self._manager.stats()}>"
+
+
+_managers: Dict[Optional[str], SalesforceSessionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_session_manager(config_json_path: Optional[str] = None) -> SalesforceSessionManager:
+    """Process-wide manager for a config file (None = environment variables)"""
+    with _managers_lock:
+        manager = _managers.get(config_json_path)
+        if manager is None:
+            manager = _managers[config_json_path] = SalesforceSessionManager(config_json_path)
+        return manager
+
+
+def resolve_salesforce(sf):
+    """
+    The real client behind sf, logging in if needed. Use it for capability
+    checks: hasattr() on the proxy would log in and let login errors escape.
+    """
+    return sf.session_manager.get() if isinstance(sf, LazySalesforce) else sf
+
+
+def get_salesforce(config_json_path: Optional[str] = None) -> LazySalesforce:
+    """Shared lazy Salesforce client for a config file (None = environment variables)"""
+    return LazySalesforce(get_session_manager(config_json_path))
@@ -17,15 +17,19 @@ Author: Product Validation Team
 Version: 2.1 (With SF Client Support)
 """
 
+from __future__ import annotations
+
 import logging
 import json
-from typing import Optional, Dict, Any, List, Tuple
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from enum import Enum
 
 import yaml
 from flask import Flask, request, jsonify
-from simple_salesforce import Salesforce, SalesforceAuthenticationFailed
+
+if TYPE_CHECKING:
+    from simple_salesforce import Salesforce
 
 # Configure logging
 logging.basicConfig(
@@ -79,6 +83,9 @@ def get_salesforce_connection(config_file: str = SALESFORCE_CONFIG_FILE) -> Opti
     Returns:
         Salesforce connection object or None
     """
+    # imported here to keep module import lightweight
+    from simple_salesforce import Salesforce, SalesforceAuthenticationFailed
+    
     try:
         config = load_configuration(config_file)
         salesforce_config = config.get('salesforce', {})
@@ -0,0 +1,480 @@
+# story_analyzer.py
+"""
+Story analyzer for /api/analyze-stories.
+
+Turns raw Copado User_Story_Metadata rows into blocked / conflicting / safe
+story groups, with per-component conflict details.
+"""
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StoryAnalyzerTransformer:
+    """
+    Transform raw SF Copado records into structured response with:
+    - Blocked stories (old commits + conflicts)
+    - Conflicting stories (same component, current commits)
+    - Safe stories (no conflicts, all current)
+    """
+    
+    def __init__(self):
+        self.stories = {}  # story_id -> story data
+        self.components = {}  # component_id -> component data
+        self.story_components = {}  # story_id -> [component_ids], in extraction order
+        self.component_to_stories = {}  # api_name -> [story_ids]
+        self.conflicts_map = {}  # api_name -> list of story_ids
+        
+        logger.info("[INIT] StoryAnalyzerTransformer initialized")
+    
+    def parse_commit_url_from_json(self, json_blob: str) -> Optional[str]:
+        """Extract commit URL from copado__JsonInformation__c"""
+        try:
+            if not json_blob:
+                return None
+            
+            data = json.loads(json_blob) if isinstance(json_blob, str) else json_blob
+            
+            # Look for common patterns
+            if isinstance(data, dict):
+                # Direct URL field
+                for key in ["commit_url", "commitUrl", "url", "link", "href"]:
+                    if key in data and data[key]:
+                        return data[key]
+                
+                # Look in nested structures (commits, changes)
+                for key in ["commits", "changes", "commit", "change"]:
+                    if key in data:
+                        item = data[key]
+                        if isinstance(item, dict):
+                            for url_key in ["url", "link", "href"]:
+                                if url_key in item and item[url_key]:
+                                    return item[url_key]
+                        elif isinstance(item, list) and len(item) > 0:
+                            first = item[0]
+                            if isinstance(first, dict):
+                                for url_key in ["url", "link", "href"]:
+                                    if url_key in first and first[url_key]:
+                                        return first[url_key]
+            
+            # If JSON has HTML anchors, parse them
+            if isinstance(data, str):
+                match = re.search(r'href=["\']([^"\']+)["\']', data)
+                if match:
+                    return match.group(1)
+            
+            return None
+        except Exception as e:
+            logger.debug(f"[PARSE_URL] Error parsing JSON blob: {e}")
+            return None
+    
+    def parse_commit_hash_from_json(self, json_blob: str) -> Optional[str]:
+        """Extract commit hash/SHA from copado__JsonInformation__c"""
+        try:
+            if not json_blob:
+                return None
+            
+            data = json.loads(json_blob) if isinstance(json_blob, str) else json_blob
+            
+            # Look for common SHA patterns in dict
+            if isinstance(data, dict):
+                # Direct hash fields
+                for key in ["commit_hash", "commitHash", "hash", "sha", "commit_sha", "commitSha"]:
+                    if key in data and data[key]:
+                        val = str(data[key]).strip()
+                        if val and len(val) >= 7:  # Valid SHA should be at least 7 chars
+                            return val
+                
+                # Look in nested structures
+                for key in ["commits", "changes", "commit", "change"]:
+                    if key in data:
+                        item = data[key]
+                        if isinstance(item, dict):
+                            for hash_key in ["hash", "sha", "id", "commit_hash"]:
+                                if hash_key in item and item[hash_key]:
+                                    val = str(item[hash_key]).strip()
+                                    if val and len(val) >= 7:
+                                        return val
+                        elif isinstance(item, list) and len(item) > 0:
+                            first = item[0]
+                            if isinstance(first, dict):
+                                for hash_key in ["hash", "sha", "id", "commit_hash"]:
+                                    if hash_key in first and first[hash_key]:
+                                        val = str(first[hash_key]).strip()
+                                        if val and len(val) >= 7:
+                                            return val
+            
+            # If JSON is string with HTML, extract SHA from URL
+            if isinstance(data, str):
+                # Look for SHA patterns in URLs: /commits/abc123def456
+                match = re.search(r'/commits/([a-f0-9]{7,40})', data)
+                if match:
+                    return match.group(1)
+                
+                # Look for standalone SHA patterns
+                match = re.search(r'\b([a-f0-9]{7,40})\b', data)
+                if match:
+                    return match.group(1)
+            
+            return None
+        except Exception as e:
+            logger.debug(f"[PARSE_HASH] Error parsing JSON blob: {e}")
+            return None
+    
+    def transform(self, sf_records: List[Dict]) -> Dict:
+        """
+        Main transformation pipeline with detailed logging
+        
+        Args:
+            sf_records: Raw records from SF (from sf_records_to_rows or similar)
+        
+        Returns:
+            Structured response with blocked/conflicts/safe stories
+        """
+        
+        logger.info(f"[TRANSFORM] Starting with {len(sf_records)} SF records")
+        
+        # Step 1: Group records by story
+        stories_data = self._group_by_story(sf_records)
+        # Callers may pre-populate self.stories; keep theirs and add the rest
+        for story_id, sdata in stories_data.items():
+            self.stories.setdefault(story_id, sdata)
+        logger.info(f"[TRANSFORM] Step 1 complete: {len(stories_data)} unique stories")
+        
+        # Step 2: Extract and normalize component data
+        self._extract_components(stories_data, sf_records)
+        logger.info(f"[TRANSFORM] Step 2 complete: {len(self.components)} unique components extracted")
+        
+        # Step 3: Detect conflicts (same component in multiple stories)
+        self._detect_conflicts()
+        logger.info(f"[TRANSFORM] Step 3 complete: {len(self.conflicts_map)} components with conflicts")
+        
+        # Step 4: Classify stories
+        blocked, conflicts, safe = self._classify_stories()
+        logger.info(f"[TRANSFORM] Step 4 complete: blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
+        
+        # Step 5: Enrich with conflicting story details
+        blocked = self._enrich_with_conflicts(blocked, sf_records)
+        conflicts = self._enrich_with_conflicts(conflicts, sf_records)
+        safe = self._enrich_with_conflicts(safe, sf_records)
+        logger.info(f"[TRANSFORM] Step 5 complete: enriched all story groups")
+        
+        # Step 6: Calculate summary and validate counts
+        summary = self._build_summary(blocked, conflicts, safe)
+        logger.info(f"[TRANSFORM] Step 6 complete: summary={summary}")
+        
+        # Step 7: Validate counts match
+        self._validate_counts(summary, blocked, conflicts, safe)
+        
+        return {
+            "success": True,
+            "summary": summary,
+            "blocked": blocked,
+            "conflicts": conflicts,
+            "safe": safe
+        }
+    
+    def _group_by_story(self, sf_records: List[Dict]) -> Dict:
+        """Step 1: Group records by story ID"""
+        logger.info("[STEP1] Grouping records by story...")
+        
+        stories_data = {}
+        for i, record in enumerate(sf_records):
+            story_id = record.get("copado__User_Story__r.Name")
+            
+            if not story_id:
+                logger.warning(f"[STEP1] Record {i} has no story ID, skipping")
+                continue
+            
+            if story_id not in stories_data:
+                stories_data[story_id] = {
+                    "story_id": story_id,
+                    "title": record.get("copado__User_Story__r.copado__User_Story_Title__c"),
+                    "jira_key": record.get("jira_key"),
+                    "developer": record.get("developer"),
+                    "story_commit_date": record.get("copado__Last_Commit_Date__c"),
+                    "records": []
+                }
+            
+            stories_data[story_id]["records"].append(record)
+            logger.debug(f"[STEP1] Added record to story {story_id}, total records: {len(stories_data[story_id]['records'])}")
+        
+        logger.info(f"[STEP1] Complete: {len(stories_data)} unique stories found")
+        for sid, sdata in stories_data.items():
+            logger.debug(f"  {sid}: {len(sdata['records'])} records, dev={sdata['developer']}, jira={sdata['jira_key']}")
+        
+        return stories_data
+    
+    def _extract_components(self, stories_data: Dict, sf_records: List[Dict]):
+        """Step 2: Extract and normalize component data"""
+        logger.info("[STEP2] Extracting components...")
+        
+        comp_id = 0
+        seen_story_names = set()  # (api_name, story_id) already in component_to_stories
+        for story_id, sdata in stories_data.items():
+            logger.debug(f"[STEP2] Processing story {story_id}...")
+            
+            for record in sdata["records"]:
+                api_name = record.get("copado__Metadata_API_Name__c")
+                comp_type = record.get("copado__Type__c")
+                
+                if not api_name or not comp_type:
+                    logger.warning(f"[STEP2] Skipping record - missing api_name or type")
+                    continue
+                
+                # Create unique component ID
+                comp_id += 1
+                cid = f"comp-{comp_id}"
+                
+                # Extract commit hash (may be null)
+                commit_hash = record.get("commit_hash")
+                if not commit_hash and record.get("copado__JsonInformation__c"):
+                    # Try to extract from JSON
+                    commit_hash = self.parse_commit_hash_from_json(record.get("copado__JsonInformation__c"))
+                    logger.debug(f"[STEP2] Extracted commit_hash from JSON for {api_name}: {commit_hash}")
+                
+                # Extract commit URL
+                commit_url = self.parse_commit_url_from_json(record.get("copado__JsonInformation__c"))
+                if commit_url:
+                    logger.debug(f"[STEP2] Extracted commit_url from JSON for {api_name}: {commit_url}")
+                
+                story_commit_date_str = record.get("copado__Last_Commit_Date__c")
+                prod_commit_date_str = record.get("production_commit_date")  # If available
+
+                
+                story_commit_date = self._parse_date(story_commit_date_str)
+                prod_commit_date = self._parse_date(prod_commit_date_str) if prod_commit_date_str else story_commit_date
+                
+                # Determine if component is old (story commit < production commit)
+                has_old_commit = False
+                if story_commit_date and prod_commit_date:
+                    has_old_commit = story_commit_date < prod_commit_date
+                    logger.debug(f"[STEP2] {api_name}: story_date={story_commit_date}, prod_date={prod_commit_date}, old={has_old_commit}")
+                
+                component = {
+                    "id": cid,
+                    "api_name": api_name,
+                    "type": comp_type,
+                    "status": record.get("copado__Status__c"),
+                    "action": record.get("copado__Action__c"),
+                    "story_id": story_id,
+                    "commit_hash": commit_hash,
+                    "commit_url": commit_url,
+                    "story_commit_date": story_commit_date_str,
+                    "production_commit_date": prod_commit_date_str,
+                    "production_story_id": record.get("production_story_id"),
+                    "production_story_title": record.get("production_story_title"),
+                    "has_old_commit": has_old_commit
+                }
+                
+                self.components[cid] = component
+                self.story_components.setdefault(story_id, []).append(cid)
+                
+                # Track api_name -> stories mapping for conflict detection
+                if (api_name, story_id) not in seen_story_names:
+                    seen_story_names.add((api_name, story_id))
+                    self.component_to_stories.setdefault(api_name, []).append(story_id)
+                
+                logger.debug(f"[STEP2] Added component {cid}: {api_name} to story {story_id}")
+        
+        logger.info(f"[STEP2] Complete: {len(self.components)} components extracted")
+        logger.info(f"[STEP2] Unique api_names: {len(self.component_to_stories)}")
+    
+    def _classify_stories(self) -> Tuple[List[str], List[str], List[str]]:
+        """Step 4: Classify stories into blocked/conflicts/safe with tags"""
+        logger.info("[STEP4] Classifying stories...")
+        
+        blocked = []
+        conflicts = []
+        safe = []
+        
+        for story_id in self.stories.keys():
+            logger.debug(f"[STEP4] Classifying story {story_id}...")
+            
+            # Get all components for this story
+            story_components = self._story_components(story_id)
+            
+            # Check if any component has old commit (story < production)
+            has_old_component = any(c["has_old_commit"] for c in story_components)
+            
+            # Check if any component is in conflict (same api_name in multiple stories)
+            has_conflict_component = any(
+                c["api_name"] in self.conflicts_map 
+                for c in story_components
+            )
+            
+            logger.debug(f"[STEP4] {story_id}: has_old={has_old_component}, has_conflict={has_conflict_component}")
+            
+            # Classification logic with tags
+            if has_old_component and has_conflict_component:
+                blocked.append(story_id)
+                self.stories[story_id]["classification_tag"] = "Blocked"  # 🆕 ADD TAG
+                logger.info(f"[STEP4] {story_id} → BLOCKED (old components + conflicts)")
+            
+            # CONFLICTING: has conflicts but components are all current/ahead
+            elif has_conflict_component and not has_old_component:
+                conflicts.append(story_id)
+                self.stories[story_id]["classification_tag"] = "Conflict"  # 🆕 ADD TAG
+                logger.info(f"[STEP4] {story_id} → CONFLICTS (conflicts but all components current)")
+            
+            # BLOCKED (no conflicts but has old components): Story behind production
+            elif has_old_component and not has_conflict_component:
+                blocked.append(story_id)
+                self.stories[story_id]["classification_tag"] = "Blocked"  # 🆕 ADD TAG
+                logger.info(f"[STEP4] {story_id} → BLOCKED (components behind production)")
+            
+            # SAFE: No conflicts AND all components are current or ahead
+            else:
+                safe.append(story_id)
+                # 🆕 ADD TAG - differentiate between safe with commits vs deployment tasks
+                if story_components:  # Has components (commits)
+                    self.stories[story_id]["classification_tag"] = "Safe with commit"
+                else:
+                    self.stories[story_id]["classification_tag"] = "Safe"  # Deployment tasks
+                logger.info(f"[STEP4] {story_id} → SAFE (no conflicts, all components current/ahead)")
+        
+        logger.info(f"[STEP4] Complete: blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
+        
+        return blocked, conflicts, safe
+    
+    def _detect_conflicts(self):
+        """Step 3: Detect conflicts (same api_name in multiple stories)"""
+        logger.info("[STEP3] Detecting conflicts...")
+        
+        for api_name, story_ids in self.component_to_stories.items():
+            if len(story_ids) > 1:
+                self.conflicts_map[api_name] = story_ids
+                logger.info(f"[STEP3] CONFLICT: {api_name} found in stories: {story_ids}")
+            else:
+                logger.debug(f"[STEP3] {api_name} unique to story {story_ids[0]}")
+        
+        logger.info(f"[STEP3] Complete: {len(self.conflicts_map)} components have conflicts")
+    
+    def _enrich_with_conflicts(self, story_ids: List[str], sf_records: List[Dict]) -> List[Dict]:
+        """Step 5: Build full story objects with component and conflict details"""
+        logger.info(f"[STEP5] Enriching {len(story_ids)} stories with conflict details...")
+        
+        enriched_stories = []
+        
+        for story_id in story_ids:
+            logger.debug(f"[STEP5] Building story object for {story_id}...")
+            
+            # Get story data
+            story_info = self.stories[story_id]
+            
+            # Get components for this story
+            story_components_data = self._story_components(story_id)
+            
+            # Build component list with conflicts
+            components_list = []
+            for comp in story_components_data:
+                comp_copy = self._copy_component(comp)
+                
+                # Find conflicting stories for this component
+                if comp["api_name"] in self.conflicts_map:
+                    conflicting_story_ids = [
+                        sid for sid in self.conflicts_map[comp["api_name"]] 
+                        if sid != story_id
+                    ]
+                    
+                    # Get details of conflicting stories
+                    conflicting_details = []
+                    for conf_story_id in conflicting_story_ids:
+                        if conf_story_id in self.stories:
+                            conf_story = self.stories[conf_story_id]
+                            conflicting_details.append({
+                                "story_id": conf_story_id,
+                                "jira_key": conf_story.get("jira_key"),
+                                "developer": conf_story.get("developer"),
+                                "commit_date": conf_story.get("story_commit_date")
+                            })
+                            logger.debug(f"[STEP5] {story_id} component {comp['api_name']} conflicts with {conf_story_id}")
+                    
+                    comp_copy["conflicting_stories"] = conflicting_details
+                else:
+                    comp_copy["conflicting_stories"] = []
+                
+                components_list.append(comp_copy)
+            
+            story_obj = {
+                "story_id": story_id,
+                "jira_key": story_info.get("jira_key"),
+                "title": story_info.get("title"),
+                "developer": story_info.get("developer"),
+                "component_count": len(components_list),
+                "components": components_list,
+                "classification_tag": story_info.get("classification_tag", "Safe")  # 🆕 INCLUDE TAG IN RESPONSE
+            }
+            
+            enriched_stories.append(story_obj)
+            logger.debug(f"[STEP5] Completed story {story_id} with {len(components_list)} components")
+        
+        logger.info(f"[STEP5] Complete: {len(enriched_stories)} stories enriched")
+        
+        return enriched_stories
+    
+    def _story_components(self, story_id: str) -> List[Dict]:
+        """Component dicts of a story, in extraction order (via story_components index)"""
+        return [self.components[cid] for cid in self.story_components.get(story_id, ())]
+    
+    @staticmethod
+    def _copy_component(comp: Dict) -> Dict:
+        """
+        Per-story copy of a component dict. Its values are scalars (str / bool /
+        None), so a shallow copy is as independent as a deep one.
+        """
+        return dict(comp)
+    
+    def _build_summary(self, blocked: List[Dict], conflicts: List[Dict], safe: List[Dict]) -> Dict:
+        """Step 6: Build summary with counts"""
+        logger.info("[STEP6] Building summary...")
+        
+        total_stories = len(blocked) + len(conflicts) + len(safe)
+        total_components = len(self.components)
+        components_in_conflict = len(self.conflicts_map)
+        
+        summary = {
+            "total_stories": total_stories,
+            "total_unique_components": total_components,
+            "stories_blocked": len(blocked),
+            "stories_with_conflicts": len(conflicts),
+            "stories_safe": len(safe),
+            "components_with_conflicts": components_in_conflict,
+            "analyzed_at": datetime.now().isoformat()
+        }
+        
+        logger.info(f"[STEP6] Summary: total_stories={total_stories}, components={total_components}, " +
+                   f"blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
+        
+        return summary
+    
+    def _validate_counts(self, summary: Dict, blocked: List[Dict], conflicts: List[Dict], safe: List[Dict]):
+        """Step 7: Validate that counts match"""
+        logger.info("[STEP7] Validating counts...")
+        
+        total_from_summary = summary["total_stories"]
+        total_from_lists = len(blocked) + len(conflicts) + len(safe)
+        
+        if total_from_summary == total_from_lists:
+            logger.info(f"[STEP7] ✓ COUNT VALID: {total_from_summary} = {total_from_lists}")
+        else:
+            logger.error(f"[STEP7] ✗ COUNT MISMATCH: summary={total_from_summary}, lists={total_from_lists}")
+        
+        logger.info(f"[STEP7] Breakdown: blocked={len(blocked)}, conflicts={len(conflicts)}, safe={len(safe)}")
+        logger.info(f"[STEP7] Unique components: {summary['total_unique_components']}")
+        logger.info(f"[STEP7] Components with conflicts: {summary['components_with_conflicts']}")
+    
+    def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
+        """Parse date string to datetime"""
+        if not date_str:
+            return None
+        
+        try:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except Exception as e:
+            logger.debug(f"[PARSE_DATE] Error parsing '{date_str}': {e}")
+            return None
@@ -27,7 +27,9 @@ VALIDATION_CONFIG = {
             'type': 'git',
             'requires_access': 'git',
             'failure_mode': 'critical',
-            'execution_order': 1
+            'execution_order': 1,
+            'resources': ['git'],
+            'timeout_seconds': 30
         },
         
         'commit_contents': {
@@ -37,9 +39,12 @@ VALIDATION_CONFIG = {
                     'requires_access': 'git',
                     'failure_mode': 'warning',
                     'execution_order': 15,
+                    'resources': ['git'],
+                    'timeout_seconds': 60,
                     'options': {
                         'show_diffs': True,           # Show actual diff content
                         'max_diff_lines': 20,         # Max lines to show per file (0 = no limit)
+                        'max_diff_bytes': 2097152,    # Stop reading the diff after this many bytes (0 = no limit)
                         'context_lines': 3,           # Lines of context around changes
                         'exclude_patterns': [          # File patterns to exclude from diffs
                             '*.xml',                   # Often too verbose
@@ -56,7 +61,9 @@ VALIDATION_CONFIG = {
             'type': 'git',
             'requires_access': 'git',
             'failure_mode': 'warning',
-            'execution_order': 3
+            'execution_order': 3,
+            'resources': ['git'],
+            'timeout_seconds': 30
         },
         'component_exists': {
             'enabled': True,
@@ -64,7 +71,9 @@ VALIDATION_CONFIG = {
             'type': 'salesforce',
             'requires_access': 'salesforce',
             'failure_mode': 'critical',
-            'execution_order': 10
+            'execution_order': 10,
+            'resources': ['salesforce'],
+            'timeout_seconds': 120
         },
         'component_timestamp': {
             'enabled': True,
@@ -72,7 +81,9 @@ VALIDATION_CONFIG = {
             'type': 'comparison',
             'requires_access': 'salesforce,git',
             'failure_mode': 'warning',
-            'execution_order': 11
+            'execution_order': 11,
+            'resources': ['git', 'salesforce'],
+            'timeout_seconds': 60
         },
         'metadata_content_match': {
             'enabled': False,  # Enable if you have Tooling API access
@@ -80,7 +91,10 @@ VALIDATION_CONFIG = {
             'type': 'comparison',
             'requires_access': 'salesforce,git,metadata_api',
             'failure_mode': 'warning',
-            'execution_order': 12
+            'execution_order': 12,
+            'depends_on': ['component_exists'],   # Only compare content for components that exist
+            'resources': ['git', 'salesforce'],
+            'timeout_seconds': 120
         },
         'copado_deployment_record': {
             'enabled': True,
@@ -88,7 +102,9 @@ VALIDATION_CONFIG = {
             'type': 'copado',
             'requires_access': 'salesforce',
             'failure_mode': 'warning',
-            'execution_order': 20
+            'execution_order': 20,
+            'resources': ['salesforce'],
+            'timeout_seconds': 60
         },
         'file_mapping': {
             'enabled': False,
@@ -96,7 +112,8 @@ VALIDATION_CONFIG = {
             'type': 'configuration',
             'requires_access': 'none',
             'failure_mode': 'warning',
-            'execution_order': 40
+            'execution_order': 40,
+            'resources': ['local']
         },
         'file_size_check': {
             'enabled': True,
@@ -104,7 +121,22 @@ VALIDATION_CONFIG = {
             'type': 'git',
             'requires_access': 'git',
             'failure_mode': 'warning',
-            'execution_order': 41
+            'execution_order': 41,
+            'resources': ['git']
+        }
+    },
+    
+    # Validator scheduling (see validator_scheduler.py). Per validator:
+    #   depends_on      - validators that must finish first
+    #   resources       - 'git' / 'salesforce' / 'local' (default: from requires_access)
+    #   timeout_seconds - overrunning maps to failure_mode (critical -> failed, else warning)
+    'scheduler': {
+        'parallel': True,                 # False = one validator at a time
+        'default_timeout_seconds': 120,
+        'concurrency': {                  # Shared by all stories proven on one DeploymentProver
+            'git': 4,
+            'salesforce': 4,
+            'local': 2
         }
     },
     
@@ -615,6 +647,15 @@ def get_validator_config(validator_name: str) -> Dict:
     
     return VALIDATION_CONFIG['validators'].get(validator_name, {})
 
+def get_scheduler_config() -> Dict:
+    """
+    Validator scheduler settings (parallelism, per-resource caps, default timeout)
+    """
+    if not VALIDATION_CONFIG_AVAILABLE:
+        return {}
+    
+    return VALIDATION_CONFIG.get('scheduler', {})
+
 # Quick reference exports
 VLOCITY_TYPES = [k for k, v in COMPONENT_QUERY_CONFIG.items() if v.get('vendor') == 'vlocity']
 TOOLING_API_TYPES = get_components_by_api('tooling')
@@ -0,0 +1,177 @@
+# validator_scheduler.py
+"""
+Dependency-aware, resource-capped scheduler for proof validators.
+
+Each validator declares (in VALIDATION_CONFIG['validators']):
+    depends_on       validators that must finish first (ignored if not in this run)
+    resources        classes it uses: 'git', 'salesforce', 'local'
+                     (defaults from requires_access)
+    timeout_seconds  wall-clock budget once started (default from 'scheduler')
+    execution_order  priority among validators that are ready at the same time
+
+Validators whose dependencies are met run concurrently. A validator holds one
+slot in every resource class it declares, and the slots are shared by every
+run on the same scheduler, so concurrent stories on one prover share the
+caps. A validator that overruns its timeout is reported through on_timeout
+and the run moves on; its slots are released at that point, and its thread
+is left to finish in the background without releasing them again.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+RESOURCE_CLASSES = ('git', 'salesforce', 'local')
+DEFAULT_CONCURRENCY = {'git': 4, 'salesforce': 4, 'local': 2}
+DEFAULT_TIMEOUT_SECONDS = 120.0
+
+
+@dataclass
+class ValidatorSpec:
+    name: str
+    depends_on: List[str] = field(default_factory=list)
+    resources: Tuple[str, ...] = ('local',)
+    timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS
+    order: int = 100
+
+
+def resources_from_access(requires_access: str) -> Tuple[str, ...]:
+    """Default resource classes for a validator's requires_access string"""
+    classes = set()
+    for access in (requires_access or 'none').split(','):
+        access = access.strip()
+        if access == 'git':
+            classes.add('git')
+        elif access in ('salesforce', 'metadata_api', 'copado', 'tooling_api'):
+            classes.add('salesforce')
+    return tuple(sorted(classes)) or ('local',)
+
+
+def build_specs(validator_names: List[str], validator_configs: Dict[str, Dict],
+                default_timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS) -> List[ValidatorSpec]:
+    specs = []
+    for name in validator_names:
+        cfg = validator_configs.get(name, {})
+        resources = cfg.get('resources') or resources_from_access(cfg.get('requires_access', 'none'))
+        specs.append(ValidatorSpec(
+            name=name,
+            depends_on=list(cfg.get('depends_on', [])),
+            resources=tuple(sorted(r for r in resources if r in RESOURCE_CLASSES)) or ('local',),
+            timeout=cfg.get('timeout_seconds', default_timeout),
+            order=cfg.get('execution_order', 100),
+        ))
+    return specs
+
+
+class _Lease:
+    """Resource slots held by one validator; released exactly once"""
+
+    def __init__(self, slots: Dict[str, threading.BoundedSemaphore]):
+        self._slots = slots
+        self._held: List[str] = []
+        self._lock = threading.Lock()
+        self._released = False
+
+    def acquire(self, classes: Tuple[str, ...]) -> None:
+        # Fixed acquisition order so validators holding several classes can't deadlock
+        for cls in sorted(classes):
+            self._slots[cls].acquire()
+            self._held.append(cls)
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+            held, self._held = self._held, []
+        for cls in reversed(held):
+            self._slots[cls].release()
+
+
+class ValidatorScheduler:
+    """Runs ValidatorSpecs in dependency order with per-resource-class concurrency caps"""
+
+    def __init__(self, concurrency: Optional[Dict[str, int]] = None):
+        caps = dict(DEFAULT_CONCURRENCY, **(concurrency or {}))
+        self._slots = {cls: threading.BoundedSemaphore(max(1, int(caps[cls]))) for cls in RESOURCE_CLASSES}
+
+    def run(self, specs: List[ValidatorSpec], run_one: Callable[[str], Dict],
+            on_timeout: Callable[[ValidatorSpec, float], Dict],
+            max_running: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Run every spec and return {name: result}. Each result gets
+        'execution_time_ms' (time spent running, not waiting for slots).
+        max_running=1 runs specs one at a time in execution_order.
+        """
+        by_name = {s.name: s for s in specs}
+        waiting_on = {s.name: {d for d in s.depends_on if d in by_name and d != s.name} for s in specs}
+        pending = sorted(specs, key=lambda s: s.order)
+        results: Dict[str, Dict] = {}
+        started: Dict[str, float] = {}
+        running = {}
+        leases: Dict[str, _Lease] = {}
+
+        executor = ThreadPoolExecutor(max_workers=max(1, len(specs)), thread_name_prefix="validator")
+        try:
+            while pending or running:
+                ready = [s for s in pending if not waiting_on[s.name]]
+                if not ready and not running:
+                    # Dependency cycle: start the highest-priority validator anyway
+                    log.warning(f"⚠️ Validator dependency cycle among {[s.name for s in pending]}; "
+                                f"starting {pending[0].name}")
+                    ready = [pending[0]]
+                if max_running:
+                    ready = ready[:max(0, max_running - len(running))]
+                for spec in ready:
+                    pending.remove(spec)
+                    leases[spec.name] = _Lease(self._slots)
+                    running[executor.submit(self._run_spec, spec, run_one, started, leases[spec.name])] = spec
+
+                deadlines = [started[s.name] + s.timeout for s in running.values()
+                             if s.timeout and s.name in started]
+                wait_for = max(0.0, min(deadlines) - time.time()) if deadlines else 0.5
+                done, _ = wait(list(running), timeout=min(wait_for, 0.5), return_when=FIRST_COMPLETED)
+
+                finished = []
+                for future in done:
+                    spec = running.pop(future)
+                    results[spec.name] = future.result()
+                    finished.append(spec.name)
+
+                now = time.time()
+                for future, spec in list(running.items()):
+                    begun = started.get(spec.name)
+                    if spec.timeout and begun and now - begun >= spec.timeout:
+                        running.pop(future)
+                        # Free its slots now; the abandoned thread won't release them again
+                        leases[spec.name].release()
+                        log.warning(f"  ⏱️ {spec.name} timed out after {spec.timeout}s")
+                        result = on_timeout(spec, now - begun)
+                        result['execution_time_ms'] = int((now - begun) * 1000)
+                        results[spec.name] = result
+                        finished.append(spec.name)
+
+                for name in finished:
+                    for deps in waiting_on.values():
+                        deps.discard(name)
+        finally:
+            # Don't block on validators that overran their timeout
+            executor.shutdown(wait=False)
+
+        return results
+
+    @staticmethod
+    def _run_spec(spec: ValidatorSpec, run_one: Callable[[str], Dict],
+                  started: Dict[str, float], lease: _Lease) -> Dict:
+        try:
+            lease.acquire(spec.resources)
+            started[spec.name] = time.time()
+            result = run_one(spec.name)
+            result['execution_time_ms'] = int((time.time() - started[spec.name]) * 1000)
+            return result
+        finally:
+            lease.release()
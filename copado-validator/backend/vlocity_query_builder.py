@@ -4,13 +4,57 @@ Vlocity Query Builder - Updated with configuration-driven name cleaning
 
 import yaml
 import logging
+import os
 import re
+import threading
 import urllib.parse
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 
 log = logging.getLogger(__name__)
 
+# Cleaned names memoized per builder, keyed by (api_name, component_type)
+CLEAN_NAME_CACHE_SIZE = 8192
+
+_builders: Dict[str, Tuple[Optional[Tuple[int, int]], "VlocityQueryBuilder"]] = {}
+_builders_lock = threading.Lock()
+
+
+def _config_signature(config_path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of the config file, or None if it doesn't exist"""
+    try:
+        st = os.stat(config_path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def get_query_builder(config_path: str = "vlocity_config.yaml") -> "VlocityQueryBuilder":
+    """
+    Shared VlocityQueryBuilder for config_path
+    
+    The YAML is parsed once and the builder reused until the file changes
+    (mtime/size), so callers can ask for it freely instead of constructing
+    a new builder (and re-reading the file) per component.
+    """
+    key = os.path.abspath(config_path)
+    signature = _config_signature(key)
+    
+    cached = _builders.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    with _builders_lock:
+        cached = _builders.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        if cached:
+            log.info(f"🔄 {config_path} changed, reloading Vlocity config")
+        builder = VlocityQueryBuilder(config_path)
+        _builders[key] = (signature, builder)
+        return builder
+
 
 class VlocityQueryBuilder:
     """Build SOQL queries for Vlocity components with configuration-driven name cleaning"""
@@ -18,6 +62,9 @@ class VlocityQueryBuilder:
     def __init__(self, config_path: str = "vlocity_config.yaml"):
         """Load configuration from YAML file"""
         self.config = self._load_config(config_path)
+        self._cleaners: Dict[str, Callable[[str], str]] = {}
+        self._cleaners_lock = threading.Lock()
+        self._clean_cached = lru_cache(maxsize=CLEAN_NAME_CACHE_SIZE)(self._clean_uncached)
         
     def _load_config(self, config_path: str) -> Dict:
         """Load config from file or use defaults"""
@@ -168,50 +215,56 @@ class VlocityQueryBuilder:
     def _clean_component_name(self, api_name: str, component_type: str) -> str:
         """
         Clean component name using configuration-driven rules
-        """
-        name = api_name
-        log.debug(f"🧹 Cleaning {component_type}: {name}")
         
+        Rules per type are compiled once (see _compile_cleaner) and results are
+        memoized per (api_name, component_type) for the life of this builder.
+        """
+        return self._clean_cached(api_name, component_type)
+    
+    def _clean_uncached(self, api_name: str, component_type: str) -> str:
+        cleaner = self._cleaners.get(component_type)
+        if cleaner is None:
+            with self._cleaners_lock:
+                cleaner = self._cleaners.get(component_type)
+                if cleaner is None:
+                    cleaner = self._compile_cleaner(component_type)
+                    self._cleaners[component_type] = cleaner
+        
+        name = cleaner(api_name)
+        log.debug(f"🧹 Cleaned {component_type}: {api_name} -> {name}")
+        return name
+    
+    def _compile_cleaner(self, component_type: str) -> Callable[[str], str]:
+        """Turn a component type's cleaning config into a single callable"""
         comp_config = self.config.get('components', {}).get(component_type, {})
         
-        # Step 1: Strip type prefix
-        if comp_config.get('strip_type_prefix', True):
-            if '.' in name:
-                name = name.split('.')[-1]
-                log.debug(f"   Stripped type prefix: -> {name}")
-        
-        # Step 2: URL decode if configured
-        if comp_config.get('url_decode', False):
-            try:
-                decoded_name = urllib.parse.unquote(name)
-                if decoded_name != name:
-                    log.debug(f"   URL decoded: {name} -> {decoded_name}")
-                name = decoded_name
-            except Exception as e:
-                log.warning(f"   URL decode failed: {e}")
-        
-        # Step 3: Extract pattern if configured - FIXED: use re.search() instead of re.match()
+        strip_type_prefix = comp_config.get('strip_type_prefix', True)
+        url_decode = comp_config.get('url_decode', False)
         extract_pattern = comp_config.get('extract_pattern')
-        if extract_pattern:
-            log.debug(f"   🎯 Applying extract_pattern: '{extract_pattern}'")
-            # ✅ FIX: Change from re.match() to re.search()
-            match = re.search(extract_pattern, name.strip())
-            if match:
-                # Check if we have capturing groups
-                if match.lastindex and match.lastindex >= 1:
-                    extracted = match.group(1).strip()
-                    log.debug(f"   Extracted: '{name}' -> '{extracted}'")
-                    name = extracted
-                else:
-                    log.debug(f"   ⚠️  Pattern matched but no capturing groups found")
-            else:
-                log.debug(f"   ⚠️  Pattern '{extract_pattern}' didn't match '{name}'")
+        extract_regex = re.compile(extract_pattern) if extract_pattern else None
         
-        # Step 4: Final cleanup
-        name = name.strip()
+        def clean(name: str) -> str:
+            # Step 1: Strip type prefix
+            if strip_type_prefix and '.' in name:
+                name = name.split('.')[-1]
+            
+            # Step 2: URL decode if configured
+            if url_decode:
+                try:
+                    name = urllib.parse.unquote(name)
+                except Exception as e:
+                    log.warning(f"   URL decode failed: {e}")
+            
+            # Step 3: Extract pattern if configured (search, not match)
+            if extract_regex is not None:
+                match = extract_regex.search(name.strip())
+                if match and match.lastindex and match.lastindex >= 1:
+                    name = match.group(1).strip()
+            
+            # Step 4: Final cleanup
+            return name.strip()
         
-        log.debug(f"   ✅ Final cleaned name: {name}")
-        return name
+        return clean
         
     def build_query_for_component(self, component_name: str, component_type: str) -> Optional[str]:
         """